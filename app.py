@@ -1,7 +1,19 @@
-from flask import Flask, session, redirect, url_for, request, render_template, flash, jsonify, abort
+from flask import Flask, session, redirect, url_for, request, render_template, stream_template, flash, get_flashed_messages, jsonify, abort, g
 import sqlite3
 import os
+import base64
+import bisect
+import hashlib
+import heapq
+import json
+import math
+import queue
+import string
+import threading
+import time
+from collections import OrderedDict
 from dotenv import load_dotenv
+from markupsafe import Markup, escape
 from functools import lru_cache, wraps
 import re
 
@@ -24,12 +36,159 @@ def disable_admin_in_production():
     if request.path.startswith("/admin") and not ENABLE_ADMIN:
         abort(404)
 
-def get_db_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+# Max number of idle connections each worker process keeps around (per profile)
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "8"))
+
+# Connection tuning, see DB_PROFILES below
+DB_MMAP_SIZE = int(os.environ.get("DB_MMAP_SIZE", str(256 * 1024 * 1024)))  # bytes
+DB_CACHE_SIZE_KB = int(os.environ.get("DB_CACHE_SIZE_KB", "32000"))
+DB_BUSY_TIMEOUT_MS = int(os.environ.get("DB_BUSY_TIMEOUT_MS", "5000"))
+
+# PRAGMAs applied (in this order) to every new connection of a profile.
+# - busy_timeout comes first, so switching to WAL waits for other writers
+# - journal_mode=WAL lets admin writes proceed without blocking public readers
+#   (it is persistent in the DB file, setting it again is a no-op)
+# - mmap_size / cache_size keep hot pages in memory
+# - "read" connections are query_only, so public routes can't write by accident
+DB_PROFILES = {
+    "read": [
+        ("busy_timeout", DB_BUSY_TIMEOUT_MS),
+        ("journal_mode", "WAL"),
+        ("synchronous", "NORMAL"),
+        ("mmap_size", DB_MMAP_SIZE),
+        ("cache_size", -DB_CACHE_SIZE_KB),
+        ("temp_store", "MEMORY"),
+        ("query_only", 1),
+    ],
+    "write": [
+        ("busy_timeout", DB_BUSY_TIMEOUT_MS),
+        ("journal_mode", "WAL"),
+        ("synchronous", "NORMAL"),
+        ("mmap_size", DB_MMAP_SIZE),
+        ("cache_size", -DB_CACHE_SIZE_KB),
+        ("temp_store", "MEMORY"),
+    ],
+}
+
+# PRAGMAs a connection may run without: memory-mapped I/O can be unavailable
+# on some platforms and builds. Failing to apply any other PRAGMA is an error.
+DB_OPTIONAL_PRAGMAS = {"mmap_size"}
+
+
+class ConnectionPool:
+    """
+    Bounded pool of warm SQLite connections for one worker process.
+
+    Connections are created lazily, configured once (row_factory + the
+    profile PRAGMAs) and reused across requests, so we don't pay connect +
+    schema parsing on every hit. If more connections are checked out than
+    `max_size`, the extra ones are simply closed when they come back.
+    """
+
+    def __init__(self, db_path, max_size, pragmas=()):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.pragmas = list(pragmas)
+        self._idle = queue.LifoQueue(maxsize=max_size)
+        self._pid = os.getpid()
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,  # a connection may serve requests on different threads
+            cached_statements=256,
+        )
+        conn.row_factory = sqlite3.Row
+        try:
+            for name, value in self.pragmas:
+                self._apply_pragma(conn, name, value)
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def _apply_pragma(self, conn, name, value):
+        try:
+            row = conn.execute(f"PRAGMA {name} = {value}").fetchone()
+        except sqlite3.OperationalError as e:
+            if name not in DB_OPTIONAL_PRAGMAS:
+                raise
+            app.logger.warning("PRAGMA %s = %s not applied: %s", name, value, e)
+            return
+        # journal_mode reports the mode it ended up in instead of failing
+        # (e.g. WAL is not possible for in-memory or some network databases)
+        if name == "journal_mode" and (row is None or row[0].lower() != str(value).lower()):
+            app.logger.warning(
+                "PRAGMA journal_mode = %s not applied, mode is %s", value, row[0] if row else None
+            )
+
+    def _reset_after_fork(self):
+        # Never share SQLite connections between processes (forking servers)
+        if os.getpid() != self._pid:
+            self._idle = queue.LifoQueue(maxsize=self.max_size)
+            self._pid = os.getpid()
+
+    def acquire(self):
+        self._reset_after_fork()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def release(self, conn):
+        # Don't hand out a connection with a half-finished transaction
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close_all(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+read_pool = ConnectionPool(DB_PATH, DB_POOL_SIZE, DB_PROFILES["read"])
+write_pool = ConnectionPool(DB_PATH, DB_POOL_SIZE, DB_PROFILES["write"])
+
+
+def get_db_connection(readonly=None):
+    """
+    Return the connection for the current request.
+
+    Admin routes get a read-write connection, everything else a read-only
+    one (pass `readonly` to override). The first call in a request checks
+    a connection out of the matching pool and stores it on flask.g; later
+    calls in the same request reuse it. It goes back to the pool in
+    release_db_connection() on teardown, so routes should not close it
+    themselves.
+    """
+    if readonly is None:
+        readonly = not request.path.startswith("/admin")
+
+    key = "db_read_conn" if readonly else "db_write_conn"
+    conn = g.get(key)
+    if conn is None:
+        pool = read_pool if readonly else write_pool
+        conn = pool.acquire()
+        setattr(g, key, conn)
     return conn
 
 
+@app.teardown_appcontext
+def release_db_connection(exc):
+    conn = g.pop("db_read_conn", None)
+    if conn is not None:
+        read_pool.release(conn)
+    conn = g.pop("db_write_conn", None)
+    if conn is not None:
+        write_pool.release(conn)
+
+
 PUNCT_FIX_RE = re.compile(r"\s+([,.;:!?])")
 def fix_punctuation(text: str | None) -> str | None:
     if not text:
@@ -77,40 +236,415 @@ def levels():
     conn = get_db_connection()
     cur = conn.cursor()
 
-    # Load levels dynamically
-    cur.execute("SELECT id, name FROM levels ORDER BY id")
-    levels = cur.fetchall()
-
     # If user submitted form
     if request.method == "POST":
-        selected = request.form.getlist("levels")  # list of strings
-        selected = [int(x) for x in selected]      # convert to ints
-
-        # save to session
-        session["selected_levels"] = selected
+        set_selected_levels(cur, request.form.getlist("levels"))
 
         flash("Level preferences updated!", "success")
         return redirect(url_for("levels"))
 
     # Pre-fill form with selected levels
-    selected_levels = session.get("selected_levels", [])
+    levels, selected_levels = resolve_selected_levels(cur)
 
-    conn.close()
 
     return render_template("levels.html", levels=levels, selected_levels=selected_levels)
 
 @app.route('/set_levels', methods=['POST'])
 def set_levels():
     data = request.get_json()
-    # convert to ints, default empty list if none
-    selected = [int(lvl) for lvl in data.get("levels", [])]
-    session["selected_levels"] = selected
+    set_selected_levels(get_db_connection().cursor(), data.get("levels", []))
     return jsonify(success=True)
 
 @app.route('/about')
 def about():
     return render_template('about.html', title="About")
 
+# ============================================================
+# FULL-TEXT SEARCH (search_index, see database_updates/modify_db_16.py)
+# ============================================================
+
+FULLTEXT_SOURCE_LABELS = {
+    "word": "Word",
+    "translation": "Translation",
+    "definition": "Definition",
+    "example": "Example",
+    "collocation": "Collocation",
+}
+
+
+def build_fulltext_query(text):
+    """
+    Turn free user input into a safe FTS5 MATCH expression: every word is
+    quoted (so FTS operators typed by the user are ignored) and the last one
+    is a prefix query, since it may still be half-typed.
+    """
+    tokens = re.findall(r"\w+", text)
+    if not tokens:
+        return None
+    terms = [f'"{t}"' for t in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def highlight_snippet(snippet):
+    # snippet() marks hits with \x02 ... \x03; escape everything else
+    html = str(escape(snippet)).replace("\x02", "<mark>").replace("\x03", "</mark>")
+    return Markup(html.replace("\n", " — "))
+
+
+def fulltext_search(cur, text, limit=20):
+    """
+    bm25-ranked search over words, translations, definitions, examples and
+    collocation surface forms. Returns one result per word (its best hit).
+    """
+    match = build_fulltext_query(text)
+    if not match:
+        return []
+
+    try:
+        cur.execute("""
+            SELECT hit.word_id, hit.source, hit.snippet, w.word
+            FROM (
+                SELECT word_id, source,
+                       snippet(search_index, 0, char(2), char(3), '…', 12) AS snippet,
+                       rank
+                FROM search_index
+                WHERE search_index MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            ) AS hit
+            JOIN words w ON w.id = hit.word_id
+            ORDER BY hit.rank
+        """, (match, limit * 5))
+    except sqlite3.OperationalError:
+        # search_index not built yet
+        return []
+
+    results = []
+    seen = set()
+    for row in cur.fetchall():
+        if row["word_id"] in seen:
+            continue
+        seen.add(row["word_id"])
+        results.append({
+            "word": row["word"],
+            "source": FULLTEXT_SOURCE_LABELS.get(row["source"], row["source"]),
+            "snippet": highlight_snippet(row["snippet"]),
+        })
+        if len(results) >= limit:
+            break
+    return results
+
+
+# ============================================================
+# AUTOCOMPLETE INDEX
+# ============================================================
+# Words, translations and category names are kept in memory as sorted arrays so
+# /autocomplete and /api/search_suggest answer prefix queries with a bisect
+# instead of a LIKE scan. Freshness: data_versions 'vocabulary' (bumped by the
+# triggers in database_updates/modify_db_17.py) is re-read at most every
+# AUTOCOMPLETE_RECHECK_SECONDS; admin routes drop this process's copy right away
+# via invalidate_autocomplete_index().
+
+AUTOCOMPLETE_RECHECK_SECONDS = float(os.getenv("AUTOCOMPLETE_RECHECK_SECONDS", "2"))
+
+# SQLite's LIKE only folds ASCII letters, so do the same here
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# ...and for search keys also ä/ö/å, so "aiti" finds "äiti". Must stay in line
+# with the search_key columns in database_updates/modify_db_18.py.
+_SEARCH_KEY_FOLD = str.maketrans({
+    **{u: l for u, l in zip(string.ascii_uppercase, string.ascii_lowercase)},
+    "ä": "a", "Ä": "a",
+    "ö": "o", "Ö": "o",
+    "å": "a", "Å": "a",
+})
+
+
+def ascii_lower(text):
+    return text.translate(_ASCII_LOWER)
+
+
+def fold_search_key(text):
+    return text.translate(_SEARCH_KEY_FOLD)
+
+
+def has_search_keys(cur):
+    # words/translations.search_key from database_updates/modify_db_18.py
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_words_search_key'")
+    return cur.fetchone() is not None
+
+
+class PrefixIndex:
+    """
+    Sorted array of (text, sort_key, value) for prefix lookups.
+
+    search(query) matches fold(text) against fold(query) and returns the `limit`
+    best values: entries whose text starts with the query as typed (ASCII case
+    ignored, like LIKE) come first, the rest only matched after folding; within
+    each group by smallest sort_key. Results for queries with many matches
+    (short ones, typically) are memoised, so every lookup stays sub-millisecond.
+    """
+
+    MEMO_MIN_MATCHES = 64
+
+    def __init__(self, entries, fold=ascii_lower):
+        self._fold = fold
+        entries = sorted(
+            ((fold(text), ascii_lower(text), sort_key, value) for text, sort_key, value in entries),
+            key=lambda e: (e[0], e[2]),
+        )
+        self._keys = [e[0] for e in entries]
+        self._entries = entries
+        self._memo = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def search(self, query, limit=10):
+        exact = ascii_lower(query)
+        memo_key = (exact, limit)
+        hit = self._memo.get(memo_key)
+        if hit is not None:
+            return hit
+
+        prefix = self._fold(query)
+        lo = bisect.bisect_left(self._keys, prefix)
+        hi = bisect.bisect_left(self._keys, prefix + "\U0010ffff", lo)
+
+        def rank(e):
+            return (not e[1].startswith(exact), e[2])
+
+        if hi - lo <= limit:
+            matches = sorted(self._entries[lo:hi], key=rank)
+        else:
+            matches = heapq.nsmallest(limit, self._entries[lo:hi], key=rank)
+        result = [e[3] for e in matches]
+
+        if hi - lo >= self.MEMO_MIN_MATCHES:
+            self._memo[memo_key] = result
+        return result
+
+
+_autocomplete_cache = {"version": None, "checked_at": 0.0, "index": None}
+_autocomplete_lock = threading.Lock()
+
+
+def invalidate_autocomplete_index():
+    with _autocomplete_lock:
+        _autocomplete_cache["index"] = None
+
+
+def load_autocomplete_index(cur):
+    cur.execute("SELECT id, word FROM words")
+    words = cur.fetchall()
+
+    cur.execute("""
+        SELECT DISTINCT w.word, t.translation_text
+        FROM words w
+        JOIN meanings m ON m.word_id = w.id
+        JOIN translations t ON t.meaning_id = m.id
+        WHERE t.translation_text IS NOT NULL
+    """)
+    translations = cur.fetchall()
+
+    cur.execute("SELECT id, name FROM categories")
+    categories = cur.fetchall()
+
+    return {
+        # ORDER BY word / name (binary), as in autocomplete()
+        "words": PrefixIndex(
+            ((r["word"], r["word"], r["word"]) for r in words),
+            fold=fold_search_key,
+        ),
+        "translations": PrefixIndex(
+            (
+                (
+                    r["translation_text"],
+                    (r["translation_text"], r["word"]),
+                    {"word": r["word"], "translation": r["translation_text"]},
+                )
+                for r in translations
+            ),
+            fold=fold_search_key,
+        ),
+        "categories": PrefixIndex(
+            (r["name"], r["name"], r["name"]) for r in categories
+        ),
+        # ORDER BY ... COLLATE NOCASE, as in search_suggest()
+        "words_nocase": PrefixIndex(
+            ((r["word"], (ascii_lower(r["word"]), r["word"]), r["word"]) for r in words),
+            fold=fold_search_key,
+        ),
+        "categories_nocase": PrefixIndex(
+            (r["name"], (ascii_lower(r["name"]), r["name"]), r["name"]) for r in categories
+        ),
+    }
+
+
+def get_autocomplete_index():
+    """
+    The in-process autocomplete index, loaded on first use. Only touches the
+    database when the index is missing or its version is due for a recheck.
+    Without the data_versions table the index is kept until
+    invalidate_autocomplete_index() is called.
+    """
+    now = time.monotonic()
+    index = _autocomplete_cache["index"]
+    if index is not None and now - _autocomplete_cache["checked_at"] < AUTOCOMPLETE_RECHECK_SECONDS:
+        return index
+
+    cur = get_db_connection().cursor()
+    version = get_data_version(cur, "vocabulary")
+    with _autocomplete_lock:
+        index = _autocomplete_cache["index"]
+        if index is None or version != _autocomplete_cache["version"]:
+            index = load_autocomplete_index(cur)
+            _autocomplete_cache["index"] = index
+            _autocomplete_cache["version"] = version
+        _autocomplete_cache["checked_at"] = now
+    return index
+
+
+# ============================================================
+# FUZZY SEARCH (trigram index)
+# ============================================================
+# Every word and translation (folded like the search keys) is split into
+# character trigrams, and each trigram maps to the entries that contain it.
+# A lookup only reads the rarest posting lists of the query's own trigrams,
+# keeps the best-overlapping candidates and reranks those by edit distance,
+# so it never compares against the whole dictionary. The index is
+# built on first use into the autocomplete index, so it is refreshed with it.
+
+FUZZY_MIN_OVERLAP = 0.3      # share of the query's trigrams a candidate must have
+FUZZY_MAX_CANDIDATES = 200   # candidates reranked by edit distance
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, max_dist):
+    """
+    Optimal string alignment distance (insert/delete/substitute/swap adjacent
+    letters), or max_dist + 1 as soon as it is known to exceed max_dist.
+    """
+    if abs(len(a) - len(b)) > max_dist:
+        return max_dist + 1
+
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            best = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                best = min(best, prev2[j - 2] + 1)
+            cur[j] = best
+        if min(cur) > max_dist:
+            return max_dist + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def fuzzy_max_distance(text):
+    if len(text) <= 4:
+        return 1
+    if len(text) <= 8:
+        return 2
+    return 3
+
+
+class TrigramIndex:
+    """Trigram inverted index over (text, value) entries; see search()."""
+
+    def __init__(self, entries):
+        self._keys = []
+        self._values = []
+        postings = {}
+        for i, (text, value) in enumerate(entries):
+            key = fold_search_key(text)
+            self._keys.append(key)
+            self._values.append(value)
+            for gram in trigrams(key):
+                postings.setdefault(gram, []).append(i)
+        self._postings = postings
+
+    def __len__(self):
+        return len(self._keys)
+
+    def search(self, query, limit=20):
+        """[(value, distance)] for the closest entries, best first."""
+        key = fold_search_key(query)
+        if not key:
+            return []
+        grams = trigrams(key)
+        max_dist = fuzzy_max_distance(key)
+        min_overlap = max(1, math.ceil(len(grams) * FUZZY_MIN_OVERLAP))
+
+        # Any entry sharing >= min_overlap trigrams must appear in one of the
+        # (len(grams) - min_overlap + 1) rarest posting lists, so only those are
+        # read; the real overlap is then counted per candidate.
+        postings = sorted((self._postings.get(gram, ()) for gram in grams), key=len)
+        keys = self._keys
+        seen = set()
+        for posting in postings[:len(grams) - min_overlap + 1]:
+            seen.update(posting)
+
+        candidates = heapq.nlargest(
+            FUZZY_MAX_CANDIDATES,
+            (
+                (len(grams & trigrams(keys[i])), -abs(len(keys[i]) - len(key)), i)
+                for i in seen
+                if abs(len(keys[i]) - len(key)) <= max_dist
+            ),
+        )
+        candidates = [c for c in candidates if c[0] >= min_overlap]
+
+        scored = []
+        for shared, _, i in candidates:
+            dist = edit_distance(key, keys[i], max_dist)
+            if dist <= max_dist:
+                scored.append((dist, -shared, keys[i], i))
+        scored.sort()
+        return [(self._values[i], dist) for dist, _, _, i in scored[:limit]]
+
+
+def load_fuzzy_index(cur):
+    cur.execute("SELECT word FROM words")
+    entries = [(r["word"], {"word": r["word"], "translation": None}) for r in cur.fetchall()]
+
+    cur.execute("""
+        SELECT DISTINCT w.word, t.translation_text
+        FROM words w
+        JOIN meanings m ON m.word_id = w.id
+        JOIN translations t ON t.meaning_id = m.id
+        WHERE t.translation_text IS NOT NULL
+    """)
+    entries += [
+        (r["translation_text"], {"word": r["word"], "translation": r["translation_text"]})
+        for r in cur.fetchall()
+    ]
+    return TrigramIndex(entries)
+
+
+def get_fuzzy_index():
+    index = get_autocomplete_index()
+    fuzzy = index.get("fuzzy")
+    if fuzzy is None:
+        with _autocomplete_lock:
+            fuzzy = index.get("fuzzy")
+            if fuzzy is None:
+                fuzzy = load_fuzzy_index(get_db_connection().cursor())
+                index["fuzzy"] = fuzzy
+    return fuzzy
+
+
+def fuzzy_search(query, limit=20):
+    return [value for value, _ in get_fuzzy_index().search(query, limit)]
+
+
 @app.route('/search', methods=['GET'])
 def search():
 
@@ -120,32 +654,60 @@ def search():
     results = []
 
     if query:
-        conn = sqlite3.connect("finnish.db")
-        conn.row_factory = sqlite3.Row
+        conn = get_db_connection()
         cur = conn.cursor()
 
         # ---------- FINNISH MODE ----------
         if mode == 'finnish':
-            cur.execute("""
-                SELECT word
-                FROM words
-                WHERE word LIKE ?
-                ORDER BY word
-                LIMIT 20
-            """, (f"{query}%",))
+            if has_search_keys(cur):
+                # folded-key range scan; matches as typed first
+                key = fold_search_key(query)
+                cur.execute("""
+                    SELECT word
+                    FROM words
+                    WHERE search_key >= ? AND search_key < ?
+                    ORDER BY word LIKE ? DESC, word
+                    LIMIT 20
+                """, (key, key + "\U0010ffff", f"{query}%"))
+            else:
+                cur.execute("""
+                    SELECT word
+                    FROM words
+                    WHERE word LIKE ?
+                    ORDER BY word
+                    LIMIT 20
+                """, (f"{query}%",))
             results = cur.fetchall()
 
+            # Inflected form ('talossa'): put its lemma first
+            if not any(r["word"] == query for r in results):
+                lemma = resolve_word_form(cur, query)
+                if lemma:
+                    results = [{"word": lemma}] + [r for r in results if r["word"] != lemma][:19]
+
         # ---------- TRANSLATION MODE ----------
         elif mode == 'translation':
-            cur.execute("""
-                SELECT DISTINCT w.word, t.translation_text
-                FROM words w
-                JOIN meanings m ON m.word_id = w.id
-                JOIN translations t ON t.meaning_id = m.id
-                WHERE t.translation_text LIKE ?
-                ORDER BY t.translation_text   -- order by translation
-                LIMIT 20
-            """, (f"{query}%",))
+            if has_search_keys(cur):
+                key = fold_search_key(query)
+                cur.execute("""
+                    SELECT DISTINCT w.word, t.translation_text
+                    FROM translations t
+                    JOIN meanings m ON m.id = t.meaning_id
+                    JOIN words w ON w.id = m.word_id
+                    WHERE t.search_key >= ? AND t.search_key < ?
+                    ORDER BY t.translation_text LIKE ? DESC, t.translation_text
+                    LIMIT 20
+                """, (key, key + "\U0010ffff", f"{query}%"))
+            else:
+                cur.execute("""
+                    SELECT DISTINCT w.word, t.translation_text
+                    FROM words w
+                    JOIN meanings m ON m.word_id = w.id
+                    JOIN translations t ON t.meaning_id = m.id
+                    WHERE t.translation_text LIKE ?
+                    ORDER BY t.translation_text   -- order by translation
+                    LIMIT 20
+                """, (f"{query}%",))
             results = cur.fetchall()
 
         # ---------- CATEGORY MODE ----------
@@ -159,7 +721,14 @@ def search():
             """, (f"{query}%",))
             results = cur.fetchall()
 
-        conn.close()
+        # ---------- FULL-TEXT MODE ----------
+        elif mode == 'fulltext':
+            results = fulltext_search(cur, query)
+
+        # ---------- FUZZY MODE ----------
+        elif mode == 'fuzzy':
+            results = fuzzy_search(query)
+
 
     return render_template(
         'search.html',
@@ -174,47 +743,29 @@ def search_suggest():
     if not q:
         return jsonify({"results": []})
 
-    conn = get_db_connection()
-    cur = conn.cursor()
-
-    like = q + "%"
+    index = get_autocomplete_index()
 
-    # 1) Words: search Finnish word and (optionally) translations
-    cur.execute("""
-        SELECT id, word
-        FROM words
-        WHERE word LIKE ?
-        ORDER BY word COLLATE NOCASE
-        LIMIT 10
-    """, (like,))
-    word_rows = cur.fetchall()
+    # 1) Words: search Finnish word
+    word_rows = index["words_nocase"].search(q, 10)
 
     # 2) Categories: search category names
-    cur.execute("""
-        SELECT id, name
-        FROM categories
-        WHERE name LIKE ?
-        ORDER BY name COLLATE NOCASE
-        LIMIT 10
-    """, (like,))
-    cat_rows = cur.fetchall()
+    cat_rows = index["categories_nocase"].search(q, 10)
 
-    conn.close()
 
     results = []
 
     for w in word_rows:
         results.append({
             "type": "word",
-            "label": w["word"],
-            "url": url_for("show_word", word_name=w["word"])
+            "label": w,
+            "url": url_for("show_word", word_name=w)
         })
 
     for c in cat_rows:
         results.append({
             "type": "category",
-            "label": c["name"],
-            "url": url_for("show_category", category_name=c["name"])
+            "label": c,
+            "url": url_for("show_category", category_name=c)
         })
 
     return jsonify({"results": results})
@@ -227,53 +778,373 @@ def autocomplete():
     if not query:
         return jsonify([])
 
-    conn = get_db_connection()
-    cur = conn.cursor()
-
-    if mode == 'finnish':
-        cur.execute("""
-            SELECT word
-            FROM words
-            WHERE word LIKE ?
-            ORDER BY word
-            LIMIT 10
-        """, (f"{query}%",))
+    if mode in ('finnish', 'fuzzy'):
         # plain strings
-        suggestions = [row['word'] for row in cur.fetchall()]
+        suggestions = get_autocomplete_index()["words"].search(query, 10)
 
     elif mode == 'translation':
-        cur.execute("""
-            SELECT DISTINCT w.word, t.translation_text
-            FROM words w
-            JOIN meanings m ON m.word_id = w.id
-            JOIN translations t ON t.meaning_id = m.id
-            WHERE t.translation_text LIKE ?
-            ORDER BY t.translation_text     -- order by translation here too
-            LIMIT 10
-        """, (f"{query}%",))
         # objects with both word + translation
-        suggestions = [
-            {
-                "word": row["word"],
-                "translation": row["translation_text"]
-            }
-            for row in cur.fetchall()
-        ]
+        suggestions = get_autocomplete_index()["translations"].search(query, 10)
 
     elif mode == 'category':
-        cur.execute("""
-            SELECT name
-            FROM categories
-            WHERE name LIKE ?
-            ORDER BY name
-            LIMIT 10
-        """, (f"{query}%",))
         # plain strings
-        suggestions = [row['name'] for row in cur.fetchall()]
+        suggestions = get_autocomplete_index()["categories"].search(query, 10)
+
+    elif mode == 'fulltext':
+        # plain strings: the words with the best full-text hits
+        cur = get_db_connection().cursor()
+        suggestions = [r["word"] for r in fulltext_search(cur, query, limit=10)]
+
+    else:
+        suggestions = []
 
-    conn.close()
     return jsonify(suggestions)
 
+# ============================================================
+# CONDITIONAL GET
+# ============================================================
+# Public pages carry an ETag derived from DB change counters (word_versions for
+# /word/<name>, data_versions 'word_lists' for /words/* and /categories*,
+# database_updates/modify_db_21.py) plus whatever else the page depends on
+# (URL, selected levels). A request whose If-None-Match already has the tag is
+# answered with 304 right after those cheap lookups, before the page queries.
+# Pages with pending flash messages get no ETag. Word pages don't depend on
+# the session, so they are cacheable by shared caches for PAGE_MAX_AGE seconds;
+# level-filtered pages are private and revalidated on every use.
+
+PAGE_MAX_AGE = int(os.environ.get("PAGE_MAX_AGE", "60"))
+
+PUBLIC_CACHE_CONTROL = f"public, max-age={PAGE_MAX_AGE}"
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def _code_stamp():
+    # Different code or templates render different HTML from the same data
+    digest = hashlib.sha1()
+    paths = [os.path.join(BASE_DIR, "app.py")]
+    for dirpath, dirnames, filenames in os.walk(os.path.join(BASE_DIR, "templates")):
+        dirnames.sort()
+        paths += [os.path.join(dirpath, name) for name in sorted(filenames)]
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+CODE_STAMP = _code_stamp()
+
+
+def page_etag(*parts):
+    """ETag for the current URL rendered from `parts` (versions, levels...)."""
+    key = repr((CODE_STAMP, request.full_path, parts))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def not_modified(etag, cache_control):
+    """304 response if the client already has `etag`, else None."""
+    if etag is None or not request.if_none_match.contains_weak(etag):
+        return None
+    response = app.response_class(status=304)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+
+def conditional_page(html, etag, cache_control):
+    """Response for a freshly rendered page, tagged with `etag` if there is one."""
+    response = app.make_response(html)
+    if etag is not None:
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = cache_control
+    return response
+
+
+def word_lists_etag(cur):
+    """
+    ETag for a level-filtered word list page (/words/*, /categories*),
+    or None if it shouldn't get one.
+    """
+    if session.get("_flashes"):
+        return None
+    version = get_data_version(cur, "word_lists")
+    if version is None:
+        return None
+    resolve_selected_levels(cur)
+    return page_etag("word_lists", version, g.level_mask)
+
+
+# ============================================================
+# STREAMED PAGES
+# ============================================================
+# For pages with an unbounded number of rows: the template is rendered while
+# the response is being sent, iterating a live cursor, so neither the rows nor
+# the HTML are ever held in full. stream_template() keeps the request context
+# (and with it the pooled connection on flask.g) until the last chunk is out.
+
+STREAM_CHUNK_CHARS = int(os.environ.get("STREAM_CHUNK_CHARS", str(16 * 1024)))
+
+
+def stream_page(template_name, **context):
+    """Streamed response for `template_name`, sent in ~STREAM_CHUNK_CHARS pieces."""
+    # The session cookie goes out with the headers, before base.html reads the
+    # flash messages: take them out of the session now
+    get_flashed_messages()
+    pieces = stream_template(template_name, **context)
+
+    def chunks():
+        buffer = []
+        size = 0
+        # Jinja yields one small string per template node; batch them
+        for piece in pieces:
+            buffer.append(piece)
+            size += len(piece)
+            if size >= STREAM_CHUNK_CHARS:
+                yield "".join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield "".join(buffer)
+
+    return app.response_class(chunks(), mimetype="text/html")
+
+
+# ============================================================
+# WORD PAGE CACHE
+# ============================================================
+# Fully rendered /word/<name> pages, keyed by word id and tagged with that
+# word's word_versions.version, which triggers bump on every edit of what the
+# page shows: meanings, translations, examples, categories, relations,
+# collocations (database_updates/modify_db_20.py). A hit costs two indexed
+# lookups instead of the full page build. Pages are only served from the cache
+# when there are no pending flash messages (base.html renders those).
+
+WORD_PAGE_CACHE_BYTES = int(os.environ.get("WORD_PAGE_CACHE_BYTES", str(32 * 1024 * 1024)))
+
+
+class PageCache:
+    """LRU of rendered pages (key -> (version, html)) within a byte budget."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._pages = OrderedDict()  # key -> (version, html, size)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            page = self._pages.get(key)
+            if page is None or page[0] != version:
+                return None
+            self._pages.move_to_end(key)
+            return page[1]
+
+    def put(self, key, version, html):
+        size = len(html.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._pages.pop(key, None)
+            if old is not None:
+                self._size -= old[2]
+            self._pages[key] = (version, html, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._pages.popitem(last=False)
+                self._size -= evicted[2]
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+            self._size = 0
+
+
+word_page_cache = PageCache(WORD_PAGE_CACHE_BYTES)
+
+
+def get_word_version(cur, word_id):
+    """Change counter of a word's page, or None if word_versions doesn't exist yet."""
+    try:
+        cur.execute("SELECT version FROM word_versions WHERE word_id = ?", (word_id,))
+    except sqlite3.OperationalError:
+        return None
+    row = cur.fetchone()
+    return row["version"] if row else 0
+
+
+def resolve_word_form(cur, text):
+    """
+    Lemma for an inflected form ('talossa' -> 'talo') from word_forms
+    (database_updates/modify_db_19.py, filled by build_word_forms.py),
+    or None. Forms are stored lowercased.
+    """
+    form = text.strip().lower()
+
+    # Capitalised lemma, e.g. pasted from the start of a sentence; works
+    # before word_forms exists
+    if form != text:
+        cur.execute("SELECT word FROM words WHERE word = ?", (form,))
+        row = cur.fetchone()
+        if row:
+            return row["word"]
+
+    try:
+        cur.execute("""
+            SELECT w.word
+            FROM word_forms f
+            JOIN words w ON w.id = f.word_id
+            WHERE f.form = ?
+        """, (form,))
+    except sqlite3.OperationalError:
+        # word_forms not created yet
+        return None
+    row = cur.fetchone()
+    return row["word"] if row else None
+
+
+def get_word_meanings(cur, word_id):
+    """
+    Meanings of a word grouped by part of speech, each with its translations
+    and examples and a through display_number: pos -> [meaning dicts].
+    Translations and examples are separate queries keyed by meaning id, so
+    they don't multiply each other. Empty if the word has no meanings.
+    """
+    # ---- Fetch meanings + POS ----
+    cur.execute("""
+        SELECT
+            m.id   AS meaning_id,
+            m.meaning_number,
+            m.definition,
+            m.notes,
+            p.name AS pos_name
+        FROM meanings m
+        LEFT JOIN parts_of_speech p ON m.pos_id = p.id
+        WHERE m.word_id = ?
+        ORDER BY p.name ASC, m.meaning_number ASC
+    """, (word_id,))
+    rows = cur.fetchall()
+
+    # ---- Organize meanings ----
+    meanings_by_pos = {}
+    meanings_by_id = {}
+    for r in rows:
+        meaning = {
+            "id": r["meaning_id"],
+            "meaning_number": r["meaning_number"],
+            "definition": r["definition"],
+            "notes": r["notes"],
+            "translations": {},  # ordered set, turned into a list below
+            "examples": [],
+        }
+        meanings_by_pos.setdefault(r["pos_name"] or "other", []).append(meaning)
+        meanings_by_id[r["meaning_id"]] = meaning
+
+    # ---- Translations and examples (separate queries, no join fan-out) ----
+    cur.execute("""
+        SELECT t.meaning_id, t.translation_text
+        FROM translations t
+        JOIN meanings m ON m.id = t.meaning_id
+        WHERE m.word_id = ?
+        ORDER BY t.translation_number ASC
+    """, (word_id,))
+    for r in cur.fetchall():
+        if r["translation_text"]:
+            meanings_by_id[r["meaning_id"]]["translations"][r["translation_text"]] = None
+
+    cur.execute("""
+        SELECT e.meaning_id, e.example_text, e.example_translation_text
+        FROM examples e
+        JOIN meanings m ON m.id = e.meaning_id
+        WHERE m.word_id = ?
+        ORDER BY e.id
+    """, (word_id,))
+    for r in cur.fetchall():
+        if r["example_text"]:
+            meanings_by_id[r["meaning_id"]]["examples"].append({
+                "text": r["example_text"],
+                "translation": r["example_translation_text"]
+            })
+
+    for meaning in meanings_by_id.values():
+        meaning["translations"] = list(meaning["translations"])
+
+    # ---- Through-numbering ----
+    counter = 1
+    for pos_block in meanings_by_pos.values():
+        for m in pos_block:
+            m["display_number"] = counter
+            counter += 1
+
+    return meanings_by_pos
+
+
+def get_meaning_relations(cur, meaning_ids):
+    """
+    Outgoing relations of the given meanings:
+    meaning1_id -> relation type -> [{target_word, target_number, translations}].
+    """
+    if meaning_ids:
+        cur.execute("""
+            SELECT
+                mr.id,
+                mr.meaning1_id,
+                mr.meaning2_id,
+                rt.name AS relation_type,
+                w2.word AS target_word,
+                m2.meaning_number AS target_meaning_number
+            FROM meaning_relations mr
+            JOIN relation_types rt ON mr.relation_type_id = rt.id
+            JOIN meanings m2       ON mr.meaning2_id = m2.id
+            JOIN words   w2        ON m2.word_id = w2.id
+            WHERE mr.meaning1_id IN ({})
+            ORDER BY rt.name, w2.word, m2.meaning_number
+        """.format(",".join("?" * len(meaning_ids))), meaning_ids)
+
+        meaning_rel_rows = cur.fetchall()
+    else:
+        meaning_rel_rows = []
+
+    # Translations of the target meanings, in one query
+    target_translations = {}
+    target_ids = list({r["meaning2_id"] for r in meaning_rel_rows})
+    if target_ids:
+        cur.execute("""
+            SELECT meaning_id, translation_text
+            FROM translations
+            WHERE meaning_id IN ({})
+            ORDER BY translation_number
+        """.format(",".join("?" * len(target_ids))), target_ids)
+        for r in cur.fetchall():
+            if r["translation_text"]:
+                target_translations.setdefault(r["meaning_id"], []).append(r["translation_text"])
+
+    meaning_relations = {}
+    relation_entries = {}  # (meaning1_id, relation_type, target_word, target_number) -> entry
+    for r in meaning_rel_rows:
+        m1 = r["meaning1_id"]
+        rt = r["relation_type"]
+        target_word = r["target_word"]
+        target_num  = r["target_meaning_number"]
+
+        key = (m1, rt, target_word, target_num)
+        entry = relation_entries.get(key)
+        if entry is None:
+            entry = {
+                "target_word": target_word,
+                "target_number": target_num,
+                "translations": {}  # ordered set, turned into a list below
+            }
+            relation_entries[key] = entry
+            meaning_relations.setdefault(m1, {}).setdefault(rt, []).append(entry)
+
+        for target_tr in target_translations.get(r["meaning2_id"], ()):
+            entry["translations"][target_tr] = None
+
+    for entry in relation_entries.values():
+        entry["translations"] = list(entry["translations"])
+
+    return meaning_relations
+
+
 @app.route('/word/<word_name>')
 def show_word(word_name):
     conn = get_db_connection()
@@ -289,7 +1160,10 @@ def show_word(word_name):
     row_word = cur.fetchone()
 
     if not row_word:
-        conn.close()
+        # Inflected form? Go to its lemma's page
+        lemma = resolve_word_form(cur, word_name)
+        if lemma and lemma != word_name:
+            return redirect(url_for("show_word", word_name=lemma))
         return render_template("word.html", meanings_by_pos=None, word_name=None)
 
     word_id = row_word['id']
@@ -297,26 +1171,16 @@ def show_word(word_name):
     word_level_id = row_word['level']
     word_level_name = row_word["level_name"]
 
-    # ---- Fetch meanings + POS + translations + examples ----
-    cur.execute("""
-        SELECT 
-            m.id   AS meaning_id,
-            m.meaning_number,
-            m.definition,
-            m.notes,
-            p.name AS pos_name,
-            t.translation_text,
-            e.id   AS example_id,
-            e.example_text,
-            e.example_translation_text
-        FROM meanings m
-        LEFT JOIN parts_of_speech p ON m.pos_id = p.id
-        LEFT JOIN translations t    ON t.meaning_id = m.id
-        LEFT JOIN examples e        ON e.meaning_id = m.id
-        WHERE m.word_id = ?
-        ORDER BY p.name ASC, m.meaning_number ASC, t.translation_number ASC
-    """, (word_id,))
-    rows = cur.fetchall()
+    version = get_word_version(cur, word_id)
+    use_cache = version is not None and not session.get("_flashes")
+    etag = page_etag("word", word_id, version) if use_cache else None
+    response = not_modified(etag, PUBLIC_CACHE_CONTROL)
+    if response is not None:
+        return response
+    if use_cache:
+        html = word_page_cache.get(word_id, version)
+        if html is not None:
+            return conditional_page(html, etag, PUBLIC_CACHE_CONTROL)
 
     # ---- Fetch categories ----
     cur.execute("""
@@ -328,63 +1192,17 @@ def show_word(word_name):
     """, (word_id,))
     categories = [r["name"] for r in cur.fetchall()]
 
+    meanings_by_pos = get_word_meanings(cur, word_id)
+
     # If no meanings at all
-    if not rows:
-        conn.close()
-        return render_template(
+    if not meanings_by_pos:
+        html = render_template(
             "word.html",
             meanings_by_pos=None,
             word_name=word_name,
             categories=categories
         )
-
-    # ---- Organize meanings ----
-    meanings_by_pos = {}
-    for r in rows:
-        pos = r["pos_name"] or "other"
-        meanings_by_pos.setdefault(pos, [])
-
-        meaning = next(
-            (m for m in meanings_by_pos[pos] if m["id"] == r["meaning_id"]),
-            None
-        )
-        if meaning is None:
-            meaning = {
-                "id": r["meaning_id"],
-                "meaning_number": r["meaning_number"],
-                "definition": r["definition"],
-                "notes": r["notes"],
-                "translations": [],
-                "examples": [],
-                "seen_example_ids": set(),  # for de-duplication
-            }
-            meanings_by_pos[pos].append(meaning)
-
-        # translations
-        if r["translation_text"] and r["translation_text"] not in meaning["translations"]:
-            meaning["translations"].append(r["translation_text"])
-
-        # examples (avoid duplicates caused by JOIN)
-        if r["example_text"]:
-            ex_id = r["example_id"]
-            if ex_id not in meaning["seen_example_ids"]:
-                meaning["examples"].append({
-                    "text": r["example_text"],
-                    "translation": r["example_translation_text"]
-                })
-                meaning["seen_example_ids"].add(ex_id)
-
-    # remove helper set before passing to template
-    for pos_block in meanings_by_pos.values():
-        for m in pos_block:
-            m.pop("seen_example_ids", None)
-
-    # ---- Through-numbering ----
-    counter = 1
-    for pos_block in meanings_by_pos.values():
-        for m in pos_block:
-            m["display_number"] = counter
-            counter += 1
+        return conditional_page(html, etag, PUBLIC_CACHE_CONTROL)
 
     # ============================================================
     # WORD RELATIONS (only outgoing)
@@ -412,58 +1230,8 @@ def show_word(word_name):
     # ============================================================
     # MEANING RELATIONS (only outgoing)
     # ============================================================
-    meaning_ids = [m["id"] for plist in meanings_by_pos.values() for m in plist]
-
-    if meaning_ids:
-        cur.execute("""
-            SELECT 
-                mr.id,
-                mr.meaning1_id,
-                mr.meaning2_id,
-                rt.name AS relation_type,
-                w2.word AS target_word,
-                m2.meaning_number AS target_meaning_number,
-                t2.translation_text AS target_translation
-            FROM meaning_relations mr
-            JOIN relation_types rt ON mr.relation_type_id = rt.id
-            JOIN meanings m2       ON mr.meaning2_id = m2.id
-            JOIN words   w2        ON m2.word_id = w2.id
-            LEFT JOIN translations t2 ON t2.meaning_id = m2.id
-            WHERE mr.meaning1_id IN ({})
-            ORDER BY rt.name, w2.word, m2.meaning_number, t2.translation_number
-        """.format(",".join("?" * len(meaning_ids))), meaning_ids)
-
-        meaning_rel_rows = cur.fetchall()
-    else:
-        meaning_rel_rows = []
-
-    meaning_relations = {}
-    for r in meaning_rel_rows:
-        m1 = r["meaning1_id"]
-        rt = r["relation_type"]
-        target_word = r["target_word"]
-        target_num  = r["target_meaning_number"]
-        target_tr   = r["target_translation"]
-
-        meaning_relations.setdefault(m1, {})
-        group = meaning_relations[m1].setdefault(rt, [])
-
-        entry = None
-        for e in group:
-            if e["target_word"] == target_word and e["target_number"] == target_num:
-                entry = e
-                break
-
-        if entry is None:
-            entry = {
-                "target_word": target_word,
-                "target_number": target_num,
-                "translations": []
-            }
-            group.append(entry)
-
-        if target_tr and target_tr not in entry["translations"]:
-            entry["translations"].append(target_tr)
+    meaning_ids = [m["id"] for pos_block in meanings_by_pos.values() for m in pos_block]
+    meaning_relations = get_meaning_relations(cur, meaning_ids)
 
     # ============================================================
     # COLLOCATIONS FOR THIS WORD (respect show_in_app / show_examples)
@@ -529,9 +1297,8 @@ def show_word(word_name):
             "example_translation": example_translation_clean,
         })
 
-    conn.close()
 
-    return render_template(
+    html = render_template(
         "word.html",
         word_name=word_name,
         meanings_by_pos=meanings_by_pos,
@@ -542,12 +1309,13 @@ def show_word(word_name):
         word_level_name=word_level_name,
         collocations=collocations,
     )
+    if use_cache:
+        word_page_cache.put(word_id, version, html)
+    return conditional_page(html, etag, PUBLIC_CACHE_CONTROL)
 
 def handle_level_post(default_redirect):
     if request.method == "POST":
-        selected = request.form.getlist("levels")
-        selected_levels = [int(x) for x in selected] if selected else []
-        session["selected_levels"] = selected_levels
+        set_selected_levels(get_db_connection().cursor(), request.form.getlist("levels"))
         return redirect(default_redirect)
     return None
 
@@ -556,292 +1324,550 @@ def words_table():
     redirect_response = handle_level_post(url_for('words_table'))
     if redirect_response:
         return redirect_response
-    words, levels, selected_levels = get_words_from_db()
+    etag = word_lists_etag(get_db_connection().cursor())
+    response = not_modified(etag, PRIVATE_CACHE_CONTROL)
+    if response is not None:
+        return response
+    words, levels, selected_levels, next_cursor = get_words_from_db()
     levels_dict = {lvl["id"]: lvl["name"] for lvl in levels}
-    return render_template(
+    html = render_template(
         "words_table.html",
         words=words,
         levels=levels,
         selected_levels=selected_levels,
         levels_dict=levels_dict,
+        next_cursor=next_cursor,
     )
+    return conditional_page(html, etag, PRIVATE_CACHE_CONTROL)
 
 @app.route('/words/cards', methods=['GET', 'POST'])
 def words_cards():
     redirect_response = handle_level_post(url_for('words_cards'))
     if redirect_response:
         return redirect_response
-    words, levels, selected_levels = get_words_from_db()
+    etag = word_lists_etag(get_db_connection().cursor())
+    response = not_modified(etag, PRIVATE_CACHE_CONTROL)
+    if response is not None:
+        return response
+    words, levels, selected_levels, next_cursor = get_words_from_db()
     levels_dict = {lvl["id"]: lvl["name"] for lvl in levels}
-    return render_template(
+    html = render_template(
         "words_cards.html",
         words=words,
         levels=levels,
         selected_levels=selected_levels,
         levels_dict=levels_dict,
+        next_cursor=next_cursor,
     )
+    return conditional_page(html, etag, PRIVATE_CACHE_CONTROL)
 
 @app.route('/words/flashcards', methods=['GET', 'POST'])
 def words_flashcards():
     redirect_response = handle_level_post(url_for('words_flashcards'))
     if redirect_response:
         return redirect_response
-    words, levels, selected_levels = get_words_from_db()
+    etag = word_lists_etag(get_db_connection().cursor())
+    response = not_modified(etag, PRIVATE_CACHE_CONTROL)
+    if response is not None:
+        return response
+    words, levels, selected_levels, next_cursor = get_words_from_db()
     levels_dict = {lvl["id"]: lvl["name"] for lvl in levels}
-    return render_template(
+    html = render_template(
         "words_flashcards.html",
         words=words,
         levels=levels,
         selected_levels=selected_levels,
         levels_dict=levels_dict,
+        next_cursor=next_cursor,
     )
+    return conditional_page(html, etag, PRIVATE_CACHE_CONTROL)
 
 @app.route('/words/flashcards/ajax', methods=['POST'])
 def words_flashcards_ajax():
     data = request.get_json() or {}
-    raw_levels = data.get("levels", [])
-
-    selected_levels = []
-    for x in raw_levels:
-        try:
-            selected_levels.append(int(x))
-        except (TypeError, ValueError):
-            continue
+    selected_levels = parse_level_ids(data.get("levels", []))
 
-    words, levels, _ = get_words_from_db(selected_levels=selected_levels)
+    words, levels, _, next_cursor = get_words_from_db(selected_levels=selected_levels)
     levels_dict = {lvl["id"]: lvl["name"] for lvl in levels}
 
     html = render_template("partials/words_flashcards.html",
                            words=words,
-                           levels_dict=levels_dict)
+                           levels_dict=levels_dict,
+                           next_cursor=next_cursor)
     return jsonify({"html": html, "selected_levels": selected_levels})
 
+# /words/* pages list words in (LOWER(word), id) order, WORDS_PAGE_SIZE at a
+# time; the rest is fetched from /api/words as the user scrolls. A cursor is
+# the (LOWER(word), id) of the last word shown, so every page is an index range
+# scan on idx_words_lower_word (database_updates/modify_db_23.py) no matter how
+# deep it is.
+
+WORDS_PAGE_SIZE = int(os.environ.get("WORDS_PAGE_SIZE", "100"))
+
+WORDS_VIEW_TEMPLATES = {
+    "table": "partials/words_table.html",
+    "cards": "partials/words_cards.html",
+    "flashcards": "partials/words_flashcards.html",
+}
+
+
+def encode_words_cursor(sort_key, word_id):
+    raw = json.dumps([sort_key, word_id], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_words_cursor(cursor):
+    """(sort_key, word_id) from encode_words_cursor(), or None if invalid."""
+    try:
+        sort_key, word_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(sort_key, str) or not isinstance(word_id, int):
+        return None
+    return sort_key, word_id
+
+
+def get_words_page(cur, level_ids, after=None, limit=None):
+    """
+    One page of words on the given levels, each with up to 3 translations.
+    `after` is a decoded cursor. Returns (words, next_cursor); next_cursor is
+    None on the last page.
+    """
+    limit = limit or WORDS_PAGE_SIZE
+    if not level_ids:
+        return [], None
+
+    placeholders = ",".join("?" for _ in level_ids)
+    params = list(level_ids)
+    after_sql = ""
+    if after is not None:
+        # Same as (LOWER(w.word), w.id) > (?, ?), spelled so that SQLite
+        # seeks the index to the cursor instead of scanning up to it
+        after_sql = "AND LOWER(w.word) >= ? AND (LOWER(w.word) > ? OR w.id > ?)"
+        sort_key, word_id = after
+        params += [sort_key, sort_key, word_id]
+
+    # One extra row tells whether there is a next page
+    cur.execute(f"""
+        SELECT w.id, w.word, w.level, w.created_at, LOWER(w.word) AS sort_key
+        FROM words w
+        WHERE w.level IN ({placeholders})
+          {after_sql}
+        ORDER BY LOWER(w.word), w.id
+        LIMIT ?
+    """, params + [limit + 1])
+    words_raw = cur.fetchall()
+
+    next_cursor = None
+    if len(words_raw) > limit:
+        words_raw = words_raw[:limit]
+        last = words_raw[-1]
+        next_cursor = encode_words_cursor(last["sort_key"], last["id"])
+
+    if not words_raw:
+        return [], None
+
+    # Translations for the page's words in one go (instead of one query per
+    # word), already in meaning/translation order
+    word_ids = [w["id"] for w in words_raw]
+    cur.execute(f"""
+        SELECT m.word_id, t.translation_text
+        FROM meanings m
+        JOIN translations t ON t.meaning_id = m.id
+        WHERE m.word_id IN ({",".join("?" for _ in word_ids)})
+        ORDER BY m.word_id, m.meaning_number, t.translation_number
+    """, word_ids)
+
+    translations_by_word = {}
+    for row in cur.fetchall():
+        word_translations = translations_by_word.setdefault(row["word_id"], [])
+        # same word can repeat a translation across meanings: keep the first
+        if row["translation_text"] not in word_translations:
+            word_translations.append(row["translation_text"])
+
+    max_display = 3
+
+    words = []
+    for w in words_raw:
+        all_translations = translations_by_word.get(w["id"], [])
+
+        words.append({
+            "id": w["id"],
+            "word": w["word"],
+            "level": w["level"],
+            "translations": all_translations[:max_display],
+            "total_translations": len(all_translations),
+        })
+
+    return words, next_cursor
+
+
 def get_words_from_db(selected_levels=None):
+    """First page of words on the selected levels: (words, levels, selected_levels, next_cursor)."""
     conn = get_db_connection()
     cur = conn.cursor()
 
-    # 1) Load all levels
-    cur.execute("SELECT id, name FROM levels ORDER BY id")
-    levels = cur.fetchall()
-    all_level_ids = [row["id"] for row in levels]
-
-    # 2) Decide selected_levels
+    # Decide selected_levels: an explicit empty selection means all levels here
     if selected_levels is not None:
-        normalized = []
-        for x in selected_levels:
-            try:
-                val = int(x)
-            except (TypeError, ValueError):
-                continue
-            if val in all_level_ids:
-                normalized.append(val)
-        if not normalized:
-            normalized = all_level_ids
-        selected_levels = normalized
-        session["selected_levels"] = selected_levels
-    else:
-        stored = session.get("selected_levels")
-        normalized = []
-        if stored is None:
-            normalized = all_level_ids
-        else:
-            for x in stored:
-                try:
-                    val = int(x)
-                except (TypeError, ValueError):
-                    continue
-                if val in all_level_ids:
-                    normalized.append(val)
-        selected_levels = normalized
-        session["selected_levels"] = selected_levels
+        selected_levels = set_selected_levels(cur, selected_levels)
+        if not selected_levels:
+            selected_levels = set_selected_levels(cur, [row["id"] for row in get_reference_data()["levels"]])
+    levels, selected_levels = resolve_selected_levels(cur)
 
-    words = []
+    words, next_cursor = get_words_page(cur, selected_levels)
+    return words, levels, selected_levels, next_cursor
 
-    if selected_levels:
-        placeholders = ",".join("?" for _ in selected_levels)
-        cur.execute(f"""
-            SELECT w.id, w.word, w.level, w.created_at
-            FROM words w
-            WHERE w.level IN ({placeholders})
-            ORDER BY LOWER(w.word)
-        """, selected_levels)
+@app.route("/api/words")
+def api_words():
+    """
+    Next page of the /words/* list for the session's levels:
+    ?cursor=<next_cursor of the previous page>&view=table|cards|flashcards
+    """
+    cur = get_db_connection().cursor()
+    levels, selected_levels = resolve_selected_levels(cur)
 
-        words_raw = cur.fetchall()
+    after = None
+    cursor = request.args.get("cursor")
+    if cursor:
+        after = decode_words_cursor(cursor)
+        if after is None:
+            return jsonify({"error": "invalid cursor"}), 400
 
-        for w in words_raw:
-            cur.execute("""
-                SELECT DISTINCT t.translation_text
-                FROM translations t
-                JOIN meanings m ON m.id = t.meaning_id
-                WHERE m.word_id = ?
-                ORDER BY m.meaning_number, t.translation_number
-            """, (w["id"],))
-
-            all_translations = [row["translation_text"] for row in cur.fetchall()]
-            total_count = len(all_translations)
-
-            max_display = 3
-            # max_total_len = 40
-
-            display_translations = []
-            # current_len = 0
-
-            for t in all_translations:
-                if not display_translations:
-                    display_translations.append(t)
-                    # current_len += len(t)
-                else:
-                    if len(display_translations) >= max_display:
-                        break
-                    # projected_len = current_len + 2 + len(t)  # ", "
-                    # if projected_len > max_total_len:
-                        # break
-                    display_translations.append(t)
-                    # current_len = projected_len
-
-            words.append({
-                "id": w["id"],
-                "word": w["word"],
-                "level": w["level"],
-                "translations": display_translations,
-                "total_translations": total_count,
-            })
+    words, next_cursor = get_words_page(cur, selected_levels, after)
 
-    conn.close()
-    return words, levels, selected_levels
+    view = request.args.get("view", "table")
+    template = WORDS_VIEW_TEMPLATES.get(view, WORDS_VIEW_TEMPLATES["table"])
+    html = render_template(
+        template,
+        words=words,
+        levels_dict={lvl["id"]: lvl["name"] for lvl in levels},
+        next_cursor=next_cursor,
+    )
+    return jsonify({"words": words, "html": html, "next_cursor": next_cursor})
 
 @app.route('/levels/ajax', methods=['POST'])
 def handle_levels_ajax():
     data = request.get_json()
-    selected = data.get("levels", [])
-    # Store selected levels in session as integers
-    try:
-        session["selected_levels"] = [int(x) for x in selected]
-    except ValueError:
-        session["selected_levels"] = []
-    return jsonify({"success": True, "selected_levels": session["selected_levels"]})
+    selected_levels = set_selected_levels(get_db_connection().cursor(), data.get("levels", []))
+    return jsonify({"success": True, "selected_levels": selected_levels})
 
 @app.route('/levels/update_view', methods=['POST'])
 def update_view():
     data = request.get_json() or {}
-    raw_levels = data.get("levels", [])
-
-    selected_levels = []
-    for x in raw_levels:
-        try:
-            val = int(x)
-        except (TypeError, ValueError):
-            continue
-        selected_levels.append(val)
-
-    session["selected_levels"] = selected_levels
+    selected_levels = set_selected_levels(get_db_connection().cursor(), data.get("levels", []))
 
     view = data.get("view", "cards")
-    words, levels, _ = get_words_from_db()
+    words, levels, _, next_cursor = get_words_from_db()
     levels_dict = {lvl["id"]: lvl["name"] for lvl in levels}
 
     if view == "cards":
         html = render_template("partials/words_cards.html",
                                words=words,
-                               levels_dict=levels_dict)
+                               levels_dict=levels_dict,
+                               next_cursor=next_cursor)
     elif view == "table":
         html = render_template("partials/words_table.html",
                                words=words,
-                               levels_dict=levels_dict)
+                               levels_dict=levels_dict,
+                               next_cursor=next_cursor)
     else:
         html = render_template("partials/words_flashcards.html",
                                words=words,
-                               levels_dict=levels_dict)
+                               levels_dict=levels_dict,
+                               next_cursor=next_cursor)
 
     return jsonify({"html": html, "current_view": view, "selected_levels": selected_levels})
 
-def get_all_levels(cur):
+# ============================================================
+# REFERENCE DATA
+# ============================================================
+# levels, parts_of_speech and relation_types: a handful of rows that change
+# only through the relation type admin pages or a migration. Loaded once per
+# process and shared by routes (get_reference_data()) and templates (the
+# `reference_data()` global). The relation type admin routes drop this
+# process's copy via invalidate_reference_data(); other processes notice
+# through data_versions 'reference' (database_updates/modify_db_22.py),
+# rechecked at most every REFERENCE_RECHECK_SECONDS.
+
+REFERENCE_RECHECK_SECONDS = float(os.getenv("REFERENCE_RECHECK_SECONDS", "30"))
+
+_reference_cache = {"version": None, "checked_at": 0.0, "data": None}
+_reference_lock = threading.Lock()
+
+
+def invalidate_reference_data():
+    with _reference_lock:
+        _reference_cache["data"] = None
+
+
+def load_reference_data(cur):
     cur.execute("SELECT id, name FROM levels ORDER BY id")
-    return cur.fetchall()
+    levels = tuple(cur.fetchall())
+
+    cur.execute("SELECT id, name FROM parts_of_speech ORDER BY name")
+    parts_of_speech = tuple(cur.fetchall())
+
+    cur.execute("SELECT * FROM relation_types ORDER BY name")
+    relation_types = tuple(cur.fetchall())
+
+    return {
+        "levels": levels,
+        "level_ids": frozenset(row["id"] for row in levels),
+        "all_levels_mask": ids_to_bitmap([row["id"] for row in levels]),
+        "parts_of_speech": parts_of_speech,
+        "relation_types": relation_types,
+    }
+
 
-def get_selected_levels(cur):
+def get_reference_data():
     """
-    Returns (selected_level_ids, levels_rows).
-    - Reads from session["selected_levels"] if present/valid
-    - Otherwise uses all levels.
+    The cached reference tables (rows are shared: don't modify them).
+    Without the data_versions table they are kept until
+    invalidate_reference_data() is called.
     """
-    levels = get_all_levels(cur)
-    all_ids = [row["id"] for row in levels]
-
-    stored = session.get("selected_levels")
-    if stored:
-        # Keep only valid IDs that actually exist
+    now = time.monotonic()
+    data = _reference_cache["data"]
+    if data is not None and now - _reference_cache["checked_at"] < REFERENCE_RECHECK_SECONDS:
+        return data
+
+    cur = get_db_connection().cursor()
+    version = get_data_version(cur, "reference")
+    with _reference_lock:
+        data = _reference_cache["data"]
+        if data is None or version != _reference_cache["version"]:
+            data = load_reference_data(cur)
+            _reference_cache["data"] = data
+            _reference_cache["version"] = version
+        _reference_cache["checked_at"] = now
+    return data
+
+
+app.jinja_env.globals["reference_data"] = get_reference_data
+
+
+# ============================================================
+# LEVEL SELECTION
+# ============================================================
+# The user's selection lives in the session as a bitmask over level ids
+# (session["level_mask"], bit N set = level N selected, see ids_to_bitmap);
+# no mask means all levels, 0 means none. resolve_selected_levels() decodes it
+# once per request onto flask.g, and everything later in the request (SQL,
+# cache keys, ETags) reuses that.
+
+
+def parse_level_ids(values):
+    """Ints from a submitted list of level ids, skipping anything unparsable."""
+    level_ids = []
+    for x in values or []:
         try:
-            selected = [int(x) for x in stored if int(x) in all_ids]
+            level_ids.append(int(x))
         except (TypeError, ValueError):
-            selected = []
-        if selected:
-            return selected, levels
+            continue
+    return level_ids
 
-    # Default: all levels selected
-    return all_ids, levels
 
-def resolve_selected_levels(cur):
+def levels_from_mask(levels, mask):
+    return [row["id"] for row in levels if mask >> row["id"] & 1]
+
+
+def set_selected_levels(cur, values):
     """
-    Load levels from DB and return (levels_rows, selected_level_ids),
-    using session["selected_levels"] if present/valid,
-    else all levels. IMPORTANT: if the user has explicitly
-    selected NONE, we allow [].
+    Store a new selection (unknown ids are dropped; an empty selection is
+    allowed) and return it as a list of level ids.
     """
-    cur.execute("SELECT id, name FROM levels ORDER BY id")
-    levels = cur.fetchall()
-    all_level_ids = [row["id"] for row in levels]
+    reference = get_reference_data()
+    levels = reference["levels"]
+    valid_ids = reference["level_ids"]
+    mask = ids_to_bitmap([i for i in parse_level_ids(values) if i in valid_ids])
+    if session.get("level_mask") != mask:
+        session["level_mask"] = mask
+    session.pop("selected_levels", None)  # pre-bitmask sessions
 
-    stored = session.get("selected_levels")  # may be None or list
-    if stored is None:
-        # first time: default to all levels
-        normalized = all_level_ids
-    else:
-        normalized = []
-        for x in stored:
-            try:
-                val = int(x)
-            except (TypeError, ValueError):
-                continue
-            if val in all_level_ids:
-                normalized.append(val)
-        # IMPORTANT: do NOT force fallback here.
-        # If user cleared all levels, normalized can be [].
+    g.level_mask = mask
+    g.selected_levels = levels_from_mask(levels, mask)
+    return g.selected_levels
 
-    session["selected_levels"] = normalized
-    return levels, normalized
 
-def get_descendant_category_ids(all_rows, root_id):
+def resolve_selected_levels(cur):
     """
-    Given all category rows and a root category_id,
-    return a list of all descendant category ids (children, grandchildren, ...).
+    Return (levels_rows, selected_level_ids) for this request. Defaults to all
+    levels the first time; if the user has explicitly selected NONE, we allow [].
     """
-    children_by_parent = {}
-    for row in all_rows:
-        parent = row["parent_id"]
-        cid = row["id"]
-        children_by_parent.setdefault(parent, []).append(cid)
+    reference = get_reference_data()
+    levels = reference["levels"]
+    if "selected_levels" in g:
+        return levels, g.selected_levels
+
+    if "selected_levels" in session:
+        # Session from before the bitmask: convert once
+        return levels, set_selected_levels(cur, session["selected_levels"])
+
+    mask = session.get("level_mask")
+    if not isinstance(mask, int) or mask < 0:
+        mask = reference["all_levels_mask"]
+
+    g.level_mask = mask
+    g.selected_levels = levels_from_mask(levels, mask)
+    return levels, g.selected_levels
+
+# ============================================================
+# CATEGORY CLOSURE TABLE
+# ============================================================
+# category_closure(ancestor_id, descendant_id, depth) holds one row per
+# (category, ancestor-or-self) pair, so "everything under X" is a single
+# indexed lookup instead of walking parent_id in Python. It is built by
+# database_updates/modify_db_15.py and kept in sync by the admin category
+# routes through the helpers below.
+
+def has_category_closure(cur):
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'category_closure'")
+    return cur.fetchone() is not None
+
+
+def get_descendant_category_ids(cur, root_id):
+    """
+    Return a list of all descendant category ids (children, grandchildren, ...)
+    of root_id, nearest first.
+    """
+    if has_category_closure(cur):
+        cur.execute("""
+            SELECT descendant_id
+            FROM category_closure
+            WHERE ancestor_id = ? AND depth > 0
+            ORDER BY depth, descendant_id
+        """, (root_id,))
+    else:
+        cur.execute("""
+            WITH RECURSIVE sub(id, depth) AS (
+                SELECT id, 1 FROM categories WHERE parent_id = ?
+                UNION
+                SELECT c.id, sub.depth + 1
+                FROM categories c
+                JOIN sub ON c.parent_id = sub.id
+            )
+            SELECT id AS descendant_id FROM sub ORDER BY depth, id
+        """, (root_id,))
+    return [row["descendant_id"] for row in cur.fetchall()]
+
 
-    descendants = []
+def is_in_category_subtree(cur, root_id, category_id):
+    """True if category_id is root_id itself or one of its descendants."""
+    return int(category_id) == int(root_id) or int(category_id) in get_descendant_category_ids(cur, root_id)
 
-    def dfs(cat_id):
-        for child_id in children_by_parent.get(cat_id, []):
-            descendants.append(child_id)
-            dfs(child_id)
 
-    dfs(root_id)
-    return descendants
+def closure_add_category(cur, category_id, parent_id):
+    """Register a new (leaf) category: a self row + one row per ancestor of its parent."""
+    if not has_category_closure(cur):
+        return
+    cur.execute("""
+        INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+        VALUES (?, ?, 0)
+    """, (category_id, category_id))
+    if parent_id:
+        cur.execute("""
+            INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+            SELECT ancestor_id, ?, depth + 1
+            FROM category_closure
+            WHERE descendant_id = ?
+        """, (category_id, parent_id))
 
-def get_categories_with_counts(cur, level_ids):
+
+def closure_move_category(cur, category_id, new_parent_id):
     """
-    Returns parent_id -> [category dicts], each dict has:
-        id, name, parent_id, sort_order, count
+    Re-attach category_id (with its whole subtree) under new_parent_id
+    (None = top level). Callers must make sure new_parent_id is not inside
+    the subtree (see is_in_category_subtree).
+    """
+    if not has_category_closure(cur):
+        return
 
-    `count` = number of *distinct* words in this topic AND all its descendants,
-    filtered by the given level_ids. No double-counting if the same word appears
-    in multiple subtopics.
+    # Detach: drop links from the old ancestors to every node of the subtree
+    cur.execute("""
+        DELETE FROM category_closure
+        WHERE descendant_id IN (
+                SELECT descendant_id FROM category_closure WHERE ancestor_id = ?
+              )
+          AND ancestor_id IN (
+                SELECT ancestor_id FROM category_closure
+                WHERE descendant_id = ? AND ancestor_id != ?
+              )
+    """, (category_id, category_id, category_id))
+
+    # Attach: every ancestor of the new parent x every node of the subtree
+    if new_parent_id:
+        cur.execute("""
+            INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+            SELECT up.ancestor_id, down.descendant_id, up.depth + down.depth + 1
+            FROM category_closure up
+            CROSS JOIN category_closure down
+            WHERE up.descendant_id = ?
+              AND down.ancestor_id = ?
+        """, (new_parent_id, category_id))
+
+
+def closure_delete_category(cur, category_id):
     """
+    Forget category_id. Its subcategories keep their (now dangling) parent_id,
+    same as before, so they also lose the links to the deleted category's ancestors.
+    """
+    if not has_category_closure(cur):
+        return
+    closure_move_category(cur, category_id, None)
+    cur.execute("""
+        DELETE FROM category_closure
+        WHERE ancestor_id = ? OR descendant_id = ?
+    """, (category_id, category_id))
+
+# ============================================================
+# CATEGORY TREE CACHE
+# ============================================================
+# The category tree and per-category word bitmaps are loaded once per process and
+# reused until something changes. Freshness is checked against
+# data_versions.version for 'categories', which triggers bump on every change
+# to categories / word_categories / words.level (database_updates/modify_db_14.py),
+# so all worker processes notice admin edits. Admin routes also drop this
+# process's copy right away via invalidate_category_cache().
+
+_category_tree_cache = {"version": None, "tree": None}
+_category_tree_lock = threading.Lock()
+
+
+def get_data_version(cur, name):
+    """
+    Current change counter for `name` from the data_versions table,
+    or None if the table hasn't been created yet.
+    """
+    try:
+        cur.execute("SELECT version FROM data_versions WHERE name = ?", (name,))
+    except sqlite3.OperationalError:
+        return None
+    row = cur.fetchone()
+    return row["version"] if row else None
+
+
+def invalidate_category_cache():
+    with _category_tree_lock:
+        _category_tree_cache["version"] = None
+        _category_tree_cache["tree"] = None
 
+
+def ids_to_bitmap(ids):
+    """Pack integer ids into a Python int used as a bitset (bit N set = id N present)."""
+    if not ids:
+        return 0
+    buf = bytearray(max(ids) // 8 + 1)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+def load_category_tree(cur):
+    """
+    Load all categories plus word bitmaps (see ids_to_bitmap):
+      - word_bits[cat_id]: distinct words in the category AND all its descendants
+      - level_bits[level]: all words on that level
+    so the count for any level selection is one AND + popcount per category.
+    """
     # 1) Load all categories
     cur.execute("""
         SELECT
@@ -852,59 +1878,134 @@ def get_categories_with_counts(cur, level_ids):
         FROM categories
         ORDER BY parent_id, sort_order, name
     """)
-    rows = cur.fetchall()
+    rows = [dict(row) for row in cur.fetchall()]
 
-    by_id = {}
     children_by_parent = {}
+    for cat in rows:
+        children_by_parent.setdefault(cat["parent_id"], []).append(cat["id"])
 
-    for row in rows:
-        cat = dict(row)
-        cat["count"] = 0    # we'll compute this below
-        cid = cat["id"]
-        by_id[cid] = cat
-
-        parent_id = cat["parent_id"]
-        children_by_parent.setdefault(parent_id, []).append(cid)
+    cur.execute("SELECT id, level FROM words")
+    words_by_level = {}
+    for row in cur.fetchall():
+        words_by_level.setdefault(row["level"], []).append(row["id"])
 
-    # 2) Direct word sets per category: cat_id -> set(word_id)
-    words_by_cat = {}
+    if has_category_closure(cur):
+        # 2) Words of each category AND its descendants straight from the
+        #    closure table: cat_id -> [word_id] (duplicates are harmless)
+        cur.execute("""
+            SELECT
+                cc.ancestor_id AS category_id,
+                wc.word_id     AS word_id
+            FROM category_closure cc
+            JOIN word_categories wc ON wc.category_id = cc.descendant_id
+            JOIN words w ON w.id = wc.word_id
+        """)
+        subtree_words = {}
+        for row in cur.fetchall():
+            subtree_words.setdefault(row["category_id"], []).append(row["word_id"])
 
-    if level_ids:
-        placeholders = ",".join("?" * len(level_ids))
-        cur.execute(f"""
+        word_bits = {cat["id"]: ids_to_bitmap(subtree_words.get(cat["id"])) for cat in rows}
+    else:
+        # 2) Direct words per category: cat_id -> [word_id], all levels
+        cur.execute("""
             SELECT
                 wc.category_id AS category_id,
-                w.id           AS word_id
+                wc.word_id     AS word_id
             FROM word_categories wc
             JOIN words w ON w.id = wc.word_id
-            WHERE w.level IN ({placeholders})
-        """, level_ids)
-
+        """)
+        words_by_cat = {}
         for row in cur.fetchall():
-            cid = row["category_id"]
-            wid = row["word_id"]
-            words_by_cat.setdefault(cid, set()).add(wid)
-
-    # 3) Recursively gather word sets up the tree (with caching)
-    @lru_cache(maxsize=None)
-    def gather_words(cat_id):
-        merged = set(words_by_cat.get(cat_id, set()))
-        for child_id in children_by_parent.get(cat_id, []):
-            merged |= gather_words(child_id)
-        return merged
-
-    # 4) Fill in counts
-    for cid, cat in by_id.items():
-        word_set = gather_words(cid)
-        cat["count"] = len(word_set)
-
-    # 5) Build parent -> children mapping for template
+            words_by_cat.setdefault(row["category_id"], []).append(row["word_id"])
+
+        direct_bits = {cid: ids_to_bitmap(wids) for cid, wids in words_by_cat.items()}
+
+        # 3) Recursively merge bitmaps up the tree (with caching)
+        @lru_cache(maxsize=None)
+        def gather_words(cat_id):
+            merged = direct_bits.get(cat_id, 0)
+            for child_id in children_by_parent.get(cat_id, []):
+                merged |= gather_words(child_id)
+            return merged
+
+        word_bits = {cat["id"]: gather_words(cat["id"]) for cat in rows}
+
+    return {
+        "rows": rows,
+        "by_id": {cat["id"]: cat for cat in rows},
+        "children_by_parent": children_by_parent,
+        "word_bits": word_bits,
+        "level_bits": {level: ids_to_bitmap(wids) for level, wids in words_by_level.items()},
+        # level mask (g.level_mask) -> {cat_id: count}, filled lazily
+        "counts_by_levels": {},
+    }
+
+
+def get_category_counts(tree, level_mask):
+    """
+    cat_id -> number of distinct words (incl. descendants) on the levels in
+    level_mask (a level selection bitmask, see resolve_selected_levels).
+    """
+    counts = tree["counts_by_levels"].get(level_mask)
+    if counts is None:
+        words_mask = 0
+        for level, bits in tree["level_bits"].items():
+            if level_mask >> level & 1:
+                words_mask |= bits
+        counts = {
+            cid: (bits & words_mask).bit_count()
+            for cid, bits in tree["word_bits"].items()
+        }
+        tree["counts_by_levels"][level_mask] = counts
+    return counts
+
+
+def get_category_tree(cur):
+    """
+    Cached load_category_tree(); reloaded when data_versions says the
+    categories changed or after invalidate_category_cache().
+    Callers must not modify the returned structure.
+    """
+    version = get_data_version(cur, "categories")
+    if version is None:
+        # No change counter (modify_db_14.py not applied): we couldn't tell
+        # when other processes edit the DB, so don't cache at all
+        return load_category_tree(cur)
+
+    with _category_tree_lock:
+        tree = _category_tree_cache["tree"]
+        if tree is not None and _category_tree_cache["version"] == version:
+            return tree
+
+    tree = load_category_tree(cur)
+
+    with _category_tree_lock:
+        _category_tree_cache["version"] = version
+        _category_tree_cache["tree"] = tree
+    return tree
+
+
+def get_categories_with_counts(cur, level_mask):
+    """
+    Returns parent_id -> [category dicts], each dict has:
+        id, name, parent_id, sort_order, count
+
+    `count` = number of *distinct* words in this topic AND all its descendants,
+    filtered by the levels in level_mask. No double-counting if the same word appears
+    in multiple subtopics.
+    """
+    tree = get_category_tree(cur)
+    counts = get_category_counts(tree, level_mask)
+
+    # Build parent -> children mapping for template (fresh dicts, the
+    # cached tree is shared between requests)
     categories_dict = {}
-    for cid, cat in by_id.items():
-        parent = cat["parent_id"]
-        categories_dict.setdefault(parent, []).append(cat)
+    for row in tree["rows"]:
+        cat = dict(row)
+        cat["count"] = counts[row["id"]]
+        categories_dict.setdefault(cat["parent_id"], []).append(cat)
 
-    # 6) Sort children: non-empty first, then sort_order, then name
+    # Sort children: non-empty first, then sort_order, then name
     for parent_id, children in categories_dict.items():
         children.sort(
             key=lambda c: (
@@ -916,49 +2017,175 @@ def get_categories_with_counts(cur, level_ids):
 
     return categories_dict
 
+def build_ordered_category_ids(root_id, categories_dict, include_subs):
+    """
+    Return [root, child1, child1_sub1, ..., child2, ...] in a stable order
+    using preorder (parent before its children), relying on categories_dict
+    ordering.
+    """
+    ordered = [root_id]
+    if not include_subs:
+        return ordered
+
+    def add_children(parent_id):
+        for child in categories_dict.get(parent_id, []):
+            child_id = child["id"]
+            ordered.append(child_id)
+            # recursively include that child's children in order
+            add_children(child_id)
+
+    add_children(root_id)
+    return ordered
+
+def get_subtree_words(cur, ordered_category_ids, level_ids, max_translations=3):
+    """
+    Words of the given categories, filtered by level_ids, as a list of
+    {id, word, level, translations} dicts.
+
+    Words come category by category in `ordered_category_ids` order (each
+    category sorted by sort_order, then word), and a word that appears in
+    several categories is only listed the first time. `translations` are
+    the first few translations of the representative meaning chosen for
+    that category (word_categories.meaning_id), or of the word as a whole
+    if none was chosen.
+
+    Uses two queries no matter how many categories/words are involved.
+    """
+    if not ordered_category_ids or not level_ids:
+        return []
+
+    cat_placeholders = ",".join("?" for _ in ordered_category_ids)
+    level_placeholders = ",".join("?" for _ in level_ids)
+    params = list(ordered_category_ids) + list(level_ids)
+
+    subtree_sql = f"""
+        SELECT
+            wc.category_id AS category_id,
+            w.id           AS word_id,
+            w.word         AS word,
+            w.level        AS level,
+            wc.meaning_id  AS meaning_id,
+            wc.sort_order  AS sort_order
+        FROM word_categories wc
+        JOIN words w ON w.id = wc.word_id
+        WHERE wc.category_id IN ({cat_placeholders})
+          AND w.level IN ({level_placeholders})
+    """
+
+    # 1) Words of all categories at once. Each category is sorted here
+    #    (sort_order, NULLs first, then LOWER(word)): an ORDER BY on the
+    #    word would make SQLite sort every row of the subtree in a temp B-tree
+    cur.execute(subtree_sql, params)
+
+    rows_by_cat = {}
+    for row in cur.fetchall():
+        rows_by_cat.setdefault(row["category_id"], []).append(row)
+    for rows in rows_by_cat.values():
+        rows.sort(key=lambda r: (r["sort_order"] is not None, r["sort_order"] or 0,
+                                 ascii_lower(r["word"])))
+
+    # Preorder + dedupe: first category that contains a word wins
+    seen_word_ids = set()
+    picked = []
+    for cat_id in ordered_category_ids:
+        for row in rows_by_cat.get(cat_id, []):
+            if row["word_id"] in seen_word_ids:
+                continue
+            seen_word_ids.add(row["word_id"])
+            picked.append(row)
+
+    if not picked:
+        return []
+
+    # 2) Top translations for every word and every representative meaning
+    #    in the subtree, numbered per meaning and per word
+    cur.execute(f"""
+        WITH subtree AS ({subtree_sql})
+        SELECT word_id, meaning_id, translation_text, rn_meaning, rn_word
+        FROM (
+            SELECT
+                m.word_id          AS word_id,
+                t.meaning_id       AS meaning_id,
+                t.translation_text AS translation_text,
+                ROW_NUMBER() OVER (
+                    PARTITION BY t.meaning_id
+                    ORDER BY t.translation_number
+                ) AS rn_meaning,
+                ROW_NUMBER() OVER (
+                    PARTITION BY m.word_id
+                    ORDER BY m.meaning_number, t.translation_number
+                ) AS rn_word
+            FROM meanings m
+            JOIN translations t ON t.meaning_id = m.id
+            WHERE m.word_id IN (SELECT word_id FROM subtree)
+               OR m.id IN (SELECT meaning_id FROM subtree)
+        )
+        WHERE rn_meaning <= ? OR rn_word <= ?
+        ORDER BY word_id, rn_word
+    """, params + [max_translations, max_translations])
+
+    by_meaning = {}
+    by_word = {}
+    for row in cur.fetchall():
+        if row["rn_meaning"] <= max_translations:
+            by_meaning.setdefault(row["meaning_id"], []).append(
+                (row["rn_meaning"], row["translation_text"])
+            )
+        if row["rn_word"] <= max_translations:
+            by_word.setdefault(row["word_id"], []).append(row["translation_text"])
+
+    words = []
+    for row in picked:
+        meaning_id = row["meaning_id"]
+        if meaning_id:
+            translations = [text for _, text in sorted(by_meaning.get(meaning_id, []))]
+        else:
+            translations = by_word.get(row["word_id"], [])
+
+        words.append({
+            "id": row["word_id"],
+            "word": row["word"],
+            "level": row["level"],
+            "translations": translations,
+        })
+
+    return words
+
 @app.route('/categories')
 def categories():
     conn = get_db_connection()
     cur = conn.cursor()
 
+    etag = word_lists_etag(cur)
+    response = not_modified(etag, PRIVATE_CACHE_CONTROL)
+    if response is not None:
+        return response
+
     levels, selected_levels = resolve_selected_levels(cur)
 
-    categories_dict = get_categories_with_counts(cur, selected_levels)
+    categories_dict = get_categories_with_counts(cur, g.level_mask)
 
-    conn.close()
 
-    return render_template(
+    html = render_template(
         "categories.html",
         categories=categories_dict,
         levels=levels,
         selected_levels=selected_levels,
     )
+    return conditional_page(html, etag, PRIVATE_CACHE_CONTROL)
 
 @app.route('/categories/filter', methods=['POST'])
 def filter_categories():
     data = request.get_json() or {}
-    raw_levels = data.get("levels", [])
-
-    selected_levels = []
-    for x in raw_levels:
-        try:
-            selected_levels.append(int(x))
-        except (TypeError, ValueError):
-            continue
 
     conn = get_db_connection()
     cur = conn.cursor()
 
-    cur.execute("SELECT id FROM levels ORDER BY id")
-    all_level_ids = [row["id"] for row in cur.fetchall()]
-    # keep only valid IDs
-    selected_levels = [lvl for lvl in selected_levels if lvl in all_level_ids]
-    # DO NOT fallback to all_level_ids here – empty is allowed
-    session["selected_levels"] = selected_levels
+    # DO NOT fallback to all levels here – empty is allowed
+    set_selected_levels(cur, data.get("levels", []))
 
-    categories_dict = get_categories_with_counts(cur, selected_levels)
+    categories_dict = get_categories_with_counts(cur, g.level_mask)
 
-    conn.close()
 
     html = render_template("partials/categories_grid.html", categories=categories_dict)
     return jsonify({"html": html})
@@ -975,158 +2202,39 @@ def show_category(category_name):
     conn = get_db_connection()
     cur = conn.cursor()
 
-    # --- Load all categories (with sort_order) ---
-    #   sort top-level and children by sort_order, then name
-    cur.execute("""
-        SELECT
-            id,
-            name,
-            parent_id,
-            COALESCE(sort_order, 0) AS sort_order
-        FROM categories
-        ORDER BY parent_id,
-                 sort_order,
-                 name
-    """)
-    all_rows = cur.fetchall()
-
     # Find current topic
     cur.execute("SELECT id, name, parent_id FROM categories WHERE name = ?", (category_name,))
     category = cur.fetchone()
     if not category:
-        conn.close()
         return f"Topic '{category_name}' not found."
     category_id = category["id"]
 
-    # --- Fetch all levels (once) ---
-    cur.execute("SELECT id, name FROM levels ORDER BY id")
-    levels = cur.fetchall()
-    all_level_ids = [lvl["id"] for lvl in levels]
-    levels_dict = {lvl["id"]: lvl["name"] for lvl in levels}
-
-    # --- Normalize selected levels from session ---
-    stored = session.get("selected_levels")
-    selected_levels = []
-    if stored is None:
-        selected_levels = all_level_ids.copy()
-    else:
-        for x in stored:
-            try:
-                val = int(x)
-            except (TypeError, ValueError):
-                continue
-            if val in all_level_ids:
-                selected_levels.append(val)
+    etag = word_lists_etag(cur)
+    response = not_modified(etag, PRIVATE_CACHE_CONTROL)
+    if response is not None:
+        return response
 
-    session["selected_levels"] = selected_levels
+    levels, selected_levels = resolve_selected_levels(cur)
+    levels_dict = {lvl["id"]: lvl["name"] for lvl in levels}
 
     # ---- Build topic tree WITH counts (per selected levels) ----
-    effective_levels = selected_levels if selected_levels else all_level_ids
-    categories_dict = get_categories_with_counts(cur, effective_levels)
+    effective_mask = g.level_mask or get_reference_data()["all_levels_mask"]
+    categories_dict = get_categories_with_counts(cur, effective_mask)
     # Direct subtopics of this topic (each has 'count' and should already be ordered
     # by sort_order inside get_categories_with_counts)
     subcategories = categories_dict.get(category_id, [])
 
-    # ----- Build ordered list of category_ids for words -----
-
-    def build_ordered_category_ids(root_id, categories_dict, include_subs):
-        """
-        Return [root, child1, child1_sub1, ..., child2, ...] in a stable order
-        using preorder (parent before its children), relying on categories_dict
-        ordering.
-        """
-        ordered = [root_id]
-        if not include_subs:
-            return ordered
-
-        def add_children(parent_id):
-            for child in categories_dict.get(parent_id, []):
-                child_id = child["id"]
-                ordered.append(child_id)
-                # recursively include that child's children in order
-                add_children(child_id)
-
-        add_children(root_id)
-        return ordered
-    
-    ordered_category_ids = build_ordered_category_ids(category_id, categories_dict, include_subs)
-
     # ----- Words for this category (+ optional subcategories) -----
-    words_with_translations = []
-
-    if selected_levels and ordered_category_ids:
-        # placeholders for levels (same for every query)
-        level_placeholders = ",".join("?" for _ in selected_levels)
-        seen_word_ids = set()
-
-        for cat_id in ordered_category_ids:
-            # fetch words for THIS category only
-            sql = f"""
-                SELECT
-                    w.id        AS word_id,
-                    w.word      AS word,
-                    w.level     AS level,
-                    wc.meaning_id AS meaning_id
-                FROM words w
-                JOIN word_categories wc ON w.id = wc.word_id
-                WHERE wc.category_id = ?
-                  AND w.level IN ({level_placeholders})
-                ORDER BY
-                    wc.sort_order,
-                    LOWER(w.word)
-            """
-            params = [cat_id] + selected_levels
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-
-            for w in rows:
-                word_id = w["word_id"]
-                if word_id in seen_word_ids:
-                    continue
-                seen_word_ids.add(word_id)
-
-                meaning_id = w["meaning_id"]
-
-                if meaning_id:
-                    cur.execute("""
-                        SELECT translation_text
-                        FROM translations
-                        WHERE meaning_id = ?
-                        ORDER BY translation_number
-                        LIMIT 3
-                    """, (meaning_id,))
-                else:
-                    cur.execute("""
-                        SELECT t.translation_text
-                        FROM meanings m
-                        JOIN translations t ON t.meaning_id = m.id
-                        WHERE m.word_id = ?
-                        ORDER BY m.meaning_number, t.translation_number
-                        LIMIT 3
-                    """, (word_id,))
-
-                translations = [row["translation_text"] for row in cur.fetchall()]
-
-                words_with_translations.append({
-                    "id": word_id,
-                    "word": w["word"],
-                    "level": w["level"],
-                    "translations": translations
-                })
-    else:
-        words_with_translations = []
+    ordered_category_ids = build_ordered_category_ids(category_id, categories_dict, include_subs)
+    words_with_translations = get_subtree_words(cur, ordered_category_ids, selected_levels)
 
-    # Parent breadcrumb
+    # Parent breadcrumb (from the cached category tree)
     parent = None
     if category["parent_id"]:
-        for r in all_rows:
-            if r["id"] == category["parent_id"]:
-                parent = r
-                break
+        parent = get_category_tree(cur)["by_id"].get(category["parent_id"])
 
-    conn.close()
 
-    return render_template(
+    html = render_template(
         "category.html",
         category=category,
         subcategories=subcategories,
@@ -1139,6 +2247,7 @@ def show_category(category_name):
         view=view,
         include_subs=include_subs,
     )
+    return conditional_page(html, etag, PRIVATE_CACHE_CONTROL)
 
 @app.route('/categories/<int:category_id>/update_view', methods=['POST'])
 def category_update_view(category_id):
@@ -1157,105 +2266,22 @@ def category_update_view(category_id):
     cur.execute("SELECT id, name, parent_id FROM categories WHERE id = ?", (category_id,))
     category = cur.fetchone()
     if not category:
-        conn.close()
         return jsonify({"words_html": "", "subtopics_html": ""})
 
     # 2) Resolve levels from session
     levels, selected_levels = resolve_selected_levels(cur)
-    all_level_ids = [lvl["id"] for lvl in levels]
-    if selected_levels is None:
-        selected_levels = all_level_ids
-    else:
-        selected_levels = [
-            int(x) for x in selected_levels
-            if isinstance(x, (int, str)) and str(x).isdigit() and int(x) in all_level_ids
-        ]
 
     # 3) Get categories with counts
-    categories_dict = get_categories_with_counts(cur, selected_levels or [])
+    categories_dict = get_categories_with_counts(cur, g.level_mask)
 
     # Subtopics for this category
     subcategories = categories_dict.get(category_id, [])
 
-    # 4) Build ordered list of category_ids (parent + subtree)
-    def build_ordered_category_ids(root_id, categories_dict, include_subs_flag):
-        ordered = [root_id]
-        if not include_subs_flag:
-            return ordered
-
-        def add_children(parent_id):
-            for child in categories_dict.get(parent_id, []):
-                cid = child["id"]
-                ordered.append(cid)
-                add_children(cid)
-
-        add_children(root_id)
-        return ordered
-
+    # 4) Words of the category (+ subtree), in preorder
     ordered_category_ids = build_ordered_category_ids(category_id, categories_dict, include_subs)
+    words_with_translations = get_subtree_words(cur, ordered_category_ids, selected_levels)
 
-    # 5) Fetch words in that order
-    words_with_translations = []
-
-    if selected_levels and ordered_category_ids:
-        level_placeholders = ",".join("?" for _ in selected_levels)
-        seen_word_ids = set()
-
-        for cat_id in ordered_category_ids:
-            sql = f"""
-                SELECT
-                    w.id         AS word_id,
-                    w.word       AS word,
-                    w.level      AS level,
-                    wc.meaning_id AS meaning_id
-                FROM words w
-                JOIN word_categories wc ON w.id = wc.word_id
-                WHERE wc.category_id = ?
-                  AND w.level IN ({level_placeholders})
-                ORDER BY
-                    wc.sort_order,
-                    LOWER(w.word)
-            """
-            params = [cat_id] + selected_levels
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-
-            for w in rows:
-                wid = w["word_id"]
-                if wid in seen_word_ids:
-                    continue
-                seen_word_ids.add(wid)
-
-                meaning_id = w["meaning_id"]
-                if meaning_id:
-                    cur.execute("""
-                        SELECT translation_text
-                        FROM translations
-                        WHERE meaning_id = ?
-                        ORDER BY translation_number
-                        LIMIT 3
-                    """, (meaning_id,))
-                else:
-                    cur.execute("""
-                        SELECT t.translation_text
-                        FROM meanings m
-                        JOIN translations t ON t.meaning_id = m.id
-                        WHERE m.word_id = ?
-                        ORDER BY m.meaning_number, t.translation_number
-                        LIMIT 3
-                    """, (wid,))
-                translations = [row["translation_text"] for row in cur.fetchall()]
-
-                words_with_translations.append({
-                    "id": wid,
-                    "word": w["word"],
-                    "level": w["level"],
-                    "translations": translations,
-                })
-
-    conn.close()
-
-    # 6) Render partials
+    # 5) Render partials
     if view == "table":
         words_html = render_template("partials/words_table.html", words=words_with_translations)
     elif view == "cards":
@@ -1312,7 +2338,6 @@ def admin_dashboard():
     cur.execute("SELECT id, name FROM categories ORDER BY name COLLATE NOCASE")
     all_categories_full = cur.fetchall()     # [{id, name}, ...]
 
-    conn.close()
 
     return render_template(
         "admin_dashboard.html",
@@ -1336,9 +2361,10 @@ def admin_add_word():
     conn = get_db_connection()
     cur = conn.cursor()
 
+    reference = get_reference_data()
+
     # Levels
-    cur.execute("SELECT id, name FROM levels ORDER BY id")
-    levels = cur.fetchall()
+    levels = reference["levels"]
 
     # Categories (for checkboxes)
     # Categories (for autocomplete)
@@ -1347,8 +2373,7 @@ def admin_add_word():
 
 
     # Parts of speech for the form
-    cur.execute("SELECT id, name FROM parts_of_speech ORDER BY name")
-    pos_list = [dict(pos) for pos in cur.fetchall()]
+    pos_list = [dict(pos) for pos in reference["parts_of_speech"]]
 
     if request.method == 'POST':
         word_text = request.form.get('word', '').strip()
@@ -1361,7 +2386,6 @@ def admin_add_word():
             if cur.fetchone():
                 flash(f"Word '{word_text}' already exists.", "warning")
                 # Just re-render form with all needed data
-                conn.close()
                 return render_template(
                     'admin_add_word.html',
                     pos_list=pos_list,
@@ -1434,11 +2458,11 @@ def admin_add_word():
                         )
 
             conn.commit()
-            conn.close()
+            invalidate_category_cache()
+            invalidate_autocomplete_index()
             flash(f"Word '{word_text}' added successfully!", "success")
             return redirect(url_for('admin_dashboard'))
 
-    conn.close()
     return render_template(
         'admin_add_word.html',
         pos_list=pos_list,
@@ -1457,17 +2481,16 @@ def admin_edit_word(word_id):
     word_row = cur.fetchone()
     if not word_row:
         flash("Word not found.", "error")
-        conn.close()
         return redirect(url_for('admin_dashboard'))
     word = dict(word_row)
 
+    reference = get_reference_data()
+
     # Fetch levels
-    cur.execute("SELECT id, name FROM levels ORDER BY id")
-    levels = cur.fetchall()
+    levels = reference["levels"]
 
     # Fetch POS list (you don't actually use it in this template but fine to keep)
-    cur.execute("SELECT id, name FROM parts_of_speech ORDER BY name")
-    pos_list = [dict(p) for p in cur.fetchall()]
+    pos_list = [dict(p) for p in reference["parts_of_speech"]]
 
     # Fetch all categories
     cur.execute("SELECT id, name FROM categories ORDER BY name")
@@ -1529,7 +2552,6 @@ def admin_edit_word(word_id):
         cur.execute("SELECT id FROM words WHERE word = ? AND id != ?", (new_word, word_id))
         if cur.fetchone():
             flash(f"The word '{new_word}' already exists.", "error")
-            conn.close()
             return redirect(url_for('admin_edit_word', word_id=word_id))
 
         # Update word + level
@@ -1551,11 +2573,11 @@ def admin_edit_word(word_id):
                 )
 
         conn.commit()
-        conn.close()
+        invalidate_category_cache()
+        invalidate_autocomplete_index()
         flash(f"Word '{new_word}' updated successfully!", "success")
         return redirect(url_for('admin_edit_word', word_id=word_id))
 
-    conn.close()
     return render_template(
         'admin_edit_word.html',
         word=word,
@@ -1577,7 +2599,6 @@ def admin_edit_meaning(meaning_id):
     meaning = cur.fetchone()
     if not meaning:
         flash("Meaning not found.", "error")
-        conn.close()
         return redirect(url_for('admin_dashboard'))
     meaning = dict(meaning)
     word_id = meaning['word_id']
@@ -1587,8 +2608,7 @@ def admin_edit_meaning(meaning_id):
     meanings_count = cur.fetchone()['cnt']
 
     # Fetch POS list
-    cur.execute("SELECT id, name FROM parts_of_speech ORDER BY name")
-    pos_list = cur.fetchall()
+    pos_list = get_reference_data()["parts_of_speech"]
 
     # Fetch translations
     cur.execute("SELECT translation_text, translation_number FROM translations WHERE meaning_id=? ORDER BY translation_number", (meaning_id,))
@@ -1626,11 +2646,10 @@ def admin_edit_meaning(meaning_id):
 
         cur.execute("UPDATE words SET updated_at = datetime('now') WHERE id=?", (word_id,))
         conn.commit()
-        conn.close()
+        invalidate_autocomplete_index()
         flash("Meaning updated successfully!", "success")
         return redirect(url_for('admin_edit_word', word_id=word_id))
 
-    conn.close()
     return render_template(
         'admin_edit_meaning.html',
         meaning=meaning,
@@ -1651,12 +2670,10 @@ def admin_add_meaning(word_id):
     word = cur.fetchone()
     if not word:
         flash("Word not found.", "error")
-        conn.close()
         return redirect(url_for('admin_dashboard'))
 
     # Fetch POS list
-    cur.execute("SELECT id, name FROM parts_of_speech ORDER BY name")
-    pos_list = cur.fetchall()
+    pos_list = get_reference_data()["parts_of_speech"]
 
     if request.method == 'POST':
         # Determine next meaning_number
@@ -1698,11 +2715,10 @@ def admin_add_meaning(word_id):
                 )
         cur.execute("UPDATE words SET updated_at = datetime('now') WHERE id=?", (word_id,))
         conn.commit()
-        conn.close()
+        invalidate_autocomplete_index()
         flash("Meaning added successfully!", "success")
         return redirect(url_for('admin_edit_word', word_id=word_id))
 
-    conn.close()
     return render_template('admin_add_meaning.html', word=word, pos_list=pos_list)
 
 @app.route('/admin/edit_word_search', methods=['GET'])
@@ -1718,7 +2734,6 @@ def admin_edit_word_search():
     # Prefix search using LIKE
     cur.execute("SELECT id, word FROM words WHERE word LIKE ? ORDER BY word LIMIT 10", (f"{query}%",))
     results = cur.fetchall()
-    conn.close()
 
 
     return render_template("admin_edit_word_search.html", results=results, query=query)
@@ -1733,7 +2748,6 @@ def admin_delete_word(word_id):
     cur.execute("SELECT word FROM words WHERE id = ?", (word_id,))
     row = cur.fetchone()
     if not row:
-        conn.close()
         flash("Word not found.", "error")
         return redirect(url_for('admin_dashboard'))
 
@@ -1750,7 +2764,8 @@ def admin_delete_word(word_id):
     cur.execute("DELETE FROM words WHERE id=?", (word_id,))
 
     conn.commit()
-    conn.close()
+    invalidate_category_cache()
+    invalidate_autocomplete_index()
 
     flash(f"Word '{word_text}' deleted successfully!", "success")
     return redirect(url_for('admin_dashboard'))
@@ -1758,13 +2773,12 @@ def admin_delete_word(word_id):
 @app.route("/admin/delete_meaning/<int:meaning_id>", methods=["POST"])
 @admin_required
 def admin_delete_meaning(meaning_id):
-    conn = sqlite3.connect("finnish.db")
+    conn = get_db_connection()
     cur = conn.cursor()
     # Find word_id for redirect
     cur.execute("SELECT word_id FROM meanings WHERE id=?", (meaning_id,))
     row = cur.fetchone()
     if not row:
-        conn.close()
         flash("Meaning not found.", "error")
         return redirect(url_for("admin_dashboard"))
 
@@ -1775,7 +2789,7 @@ def admin_delete_meaning(meaning_id):
     cur.execute("DELETE FROM meanings WHERE id=?", (meaning_id,))
     cur.execute("UPDATE words SET updated_at = datetime('now') WHERE id=?", (word_id,))
     conn.commit()
-    conn.close()
+    invalidate_autocomplete_index()
     flash("Meaning deleted successfully.", "success")
     return redirect(url_for("admin_edit_word", word_id=word_id))
 
@@ -1787,8 +2801,7 @@ def admin_add_category():
 
         parent_id = request.form.get("parent_id") or None
 
-        conn = sqlite3.connect("finnish.db", timeout=5)
-        conn.row_factory = sqlite3.Row
+        conn = get_db_connection()
         cur = conn.cursor()
 
         
@@ -1796,7 +2809,6 @@ def admin_add_category():
         cur.execute("SELECT id FROM categories WHERE name = ?", (name,))
         if cur.fetchone():
             flash(f"Category '{name}' already exists.", "danger")
-            conn.close()
             return redirect(url_for("admin_add_category"))
 
         # Insert if not exists
@@ -1804,21 +2816,21 @@ def admin_add_category():
 
         
         category_id = cur.lastrowid
+        closure_add_category(cur, category_id, parent_id)
 
         conn.commit()
-        conn.close()
+        invalidate_category_cache()
+        invalidate_autocomplete_index()
 
         # Now redirect to edit page (which also handles adding words)
         flash(f"Category '{name}' created successfully. You can now add words.", "success")
         return redirect(url_for("admin_edit_category", category_id=category_id))
 
     # GET → show creation form with possible parent categories
-    conn = sqlite3.connect("finnish.db", timeout=5)
-    conn.row_factory = sqlite3.Row
+    conn = get_db_connection()
     cur = conn.cursor()
     cur.execute("SELECT id, name FROM categories ORDER BY name")
     categories = cur.fetchall()
-    conn.close()
 
     return render_template("admin_add_category.html", categories=categories)
 
@@ -1829,8 +2841,7 @@ def admin_search_category():
 
     results = []
     if query:
-        conn = sqlite3.connect("finnish.db")
-        conn.row_factory = sqlite3.Row
+        conn = get_db_connection()
         cur = conn.cursor()
         cur.execute("""
             SELECT id, name
@@ -1839,7 +2850,6 @@ def admin_search_category():
             ORDER BY name
         """, (f"{query}%",))
         results = cur.fetchall()
-        conn.close()
 
     return render_template(
         "admin_search_category.html",
@@ -1850,15 +2860,13 @@ def admin_search_category():
 @app.route("/admin/categories/<int:category_id>/edit", methods=["GET", "POST"])
 @admin_required
 def admin_edit_category(category_id):
-    conn = sqlite3.connect("finnish.db", timeout=10)
-    conn.row_factory = sqlite3.Row
+    conn = get_db_connection()
     cur = conn.cursor()
 
     # Fetch category info
     cur.execute("SELECT * FROM categories WHERE id = ?", (category_id,))
     category = cur.fetchone()
     if not category:
-        conn.close()
         flash("Category not found.", "danger")
         return redirect(url_for("admin_dashboard"))
 
@@ -1872,13 +2880,13 @@ def admin_edit_category(category_id):
     cur.execute("SELECT id, name FROM categories WHERE id != ? ORDER BY name", (category_id,))
     all_categories = cur.fetchall()
 
+    reference = get_reference_data()
+
     # Parts of speech
-    cur.execute("SELECT id, name FROM parts_of_speech ORDER BY name")
-    pos_list = cur.fetchall()
+    pos_list = reference["parts_of_speech"]
 
     # Levels
-    cur.execute("SELECT id, name FROM levels ORDER BY id")
-    levels = cur.fetchall()
+    levels = reference["levels"]
 
     action = request.form.get("action")
 
@@ -1898,7 +2906,11 @@ def admin_edit_category(category_id):
             cur.execute("SELECT id FROM categories WHERE name = ? AND id != ?", (name, category_id))
             if cur.fetchone():
                 flash(f"Another category with the name '{name}' already exists.", "danger")
-                conn.close()
+                return redirect(url_for("admin_edit_category", category_id=category_id))
+
+            # A category can't be moved under itself or one of its own subtopics
+            if parent_id and is_in_category_subtree(cur, category_id, parent_id):
+                flash("A category cannot be placed under itself or one of its subcategories.", "danger")
                 return redirect(url_for("admin_edit_category", category_id=category_id))
 
             # Proceed with update
@@ -1906,8 +2918,11 @@ def admin_edit_category(category_id):
                 "UPDATE categories SET name = ?, parent_id = ?, updated_at = datetime('now') WHERE id = ?",
                 (name, parent_id, category_id),
             )
+            if str(parent_id or "") != str(category["parent_id"] or ""):
+                closure_move_category(cur, category_id, parent_id)
             conn.commit()
-            conn.close()
+            invalidate_category_cache()
+            invalidate_autocomplete_index()
             flash("Category updated successfully.", "success")
             return redirect(url_for("admin_edit_category", category_id=category_id))
 
@@ -1918,14 +2933,12 @@ def admin_edit_category(category_id):
             word_text = request.form.get("new_word", "").strip()
             if not word_text:
                 flash("Word cannot be empty.", "danger")
-                conn.close()
                 return redirect(url_for("admin_edit_category", category_id=category_id))
 
             # Check if word already exists in database
             cur.execute("SELECT id FROM words WHERE word = ?", (word_text,))
             if cur.fetchone():
                 flash(f"The word '{word_text}' already exists in the database.", "warning")
-                conn.close()
                 return redirect(url_for("admin_edit_category", category_id=category_id))
 
             level_id = int(request.form.get("level", 0))
@@ -1997,7 +3010,8 @@ def admin_edit_category(category_id):
             )
 
             conn.commit()
-            conn.close()
+            invalidate_category_cache()
+            invalidate_autocomplete_index()
             flash(f"New word '{word_text}' added and assigned to category.", "success")
             return redirect(url_for("admin_edit_category", category_id=category_id))
 
@@ -2014,7 +3028,6 @@ def admin_edit_category(category_id):
             )
             if cur.fetchone():
                 flash("This word is already in the category.", "warning")
-                conn.close()
                 return redirect(url_for("admin_edit_category", category_id=category_id))
 
            # Assign existing word with sort_order = last + 1
@@ -2035,7 +3048,7 @@ def admin_edit_category(category_id):
             )
 
             conn.commit()
-            conn.close()
+            invalidate_category_cache()
             flash("Word added to category.", "success")
             return redirect(url_for("admin_edit_category", category_id=category_id))
 
@@ -2080,7 +3093,6 @@ def admin_edit_category(category_id):
     cur.execute("SELECT id, word FROM words ORDER BY word")
     all_words = cur.fetchall()
 
-    conn.close()
     return render_template(
         "admin_edit_category.html",
         category=category,
@@ -2098,14 +3110,14 @@ def admin_edit_category(category_id):
 @app.route("/admin/categories/<int:category_id>/remove_word/<int:word_id>", methods=["POST"])
 @admin_required
 def admin_remove_word_from_category(category_id, word_id):
-    conn = sqlite3.connect("finnish.db")
+    conn = get_db_connection()
     cur = conn.cursor()
     
     # Remove word from category
     cur.execute("DELETE FROM word_categories WHERE word_id=? AND category_id=?", (word_id, category_id))
     cur.execute("UPDATE categories SET updated_at = datetime('now') WHERE id = ?", (category_id,))
     conn.commit()
-    conn.close()
+    invalidate_category_cache()
     
     flash("Word removed from category.", "success")
     return redirect(url_for("admin_edit_category", category_id=category_id) + "#words-section")
@@ -2113,23 +3125,23 @@ def admin_remove_word_from_category(category_id, word_id):
 @app.route("/admin/categories/<int:category_id>/delete", methods=["POST"])
 @admin_required
 def admin_delete_category(category_id):
-    conn = sqlite3.connect("finnish.db", timeout=5)
-    conn.row_factory = sqlite3.Row
+    conn = get_db_connection()
     cur = conn.cursor()
 
     # Check if category exists
     cur.execute("SELECT name FROM categories WHERE id = ?", (category_id,))
     category = cur.fetchone()
     if not category:
-        conn.close()
         flash("Category not found.", "danger")
         return redirect(url_for("admin_dashboard"))
 
     # Delete relationships first to avoid foreign key errors
     cur.execute("DELETE FROM word_categories WHERE category_id = ?", (category_id,))
+    closure_delete_category(cur, category_id)
     cur.execute("DELETE FROM categories WHERE id = ?", (category_id,))
     conn.commit()
-    conn.close()
+    invalidate_category_cache()
+    invalidate_autocomplete_index()
 
     flash(f"Category '{category['name']}' deleted successfully.", "success")
     return redirect(url_for("admin_dashboard"))
@@ -2144,7 +3156,6 @@ def admin_category_meanings(category_id):
     cur.execute("SELECT * FROM categories WHERE id = ?", (category_id,))
     category = cur.fetchone()
     if not category:
-        conn.close()
         flash("Category not found.", "danger")
         return redirect(url_for("admin_dashboard"))
 
@@ -2176,7 +3187,6 @@ def admin_category_meanings(category_id):
 
         conn.commit()
         flash("Meaning choices and order saved.", "success")
-        conn.close()
         return redirect(url_for("admin_category_meanings", category_id=category_id))
 
     # ------- GET MODE -------
@@ -2236,7 +3246,6 @@ def admin_category_meanings(category_id):
         else:
             w['rep_translations'] = None
 
-    conn.close()
 
     return render_template(
         "admin_category_meanings.html",
@@ -2276,7 +3285,7 @@ def admin_order_categories():
             )
 
         conn.commit()
-        conn.close()
+        invalidate_category_cache()
         flash("Category order updated.", "success")
         return redirect(url_for("admin_order_categories"))
 
@@ -2327,7 +3336,6 @@ def admin_order_categories():
                 "block_id": str(parent["id"]),
             })
 
-    conn.close()
     return render_template(
         "admin_order_categories.html",
         category_blocks=category_blocks,
@@ -2343,7 +3351,7 @@ def admin_set_main_meaning():
     if not word_id or not meaning_id:
         return jsonify({"status": "error", "message": "Missing data"}), 400
 
-    conn = sqlite3.connect("finnish.db")
+    conn = get_db_connection()
     cur = conn.cursor()
 
     # upsert word_category_meaning table
@@ -2354,7 +3362,6 @@ def admin_set_main_meaning():
     """, (word_id, meaning_id))
 
     conn.commit()
-    conn.close()
     return jsonify({"status": "ok"})
 
 @app.route("/admin/words")
@@ -2375,7 +3382,6 @@ def admin_list_words():
         (per_page, offset)
     )
     words = cur.fetchall()
-    conn.close()
 
     total_pages = (total + per_page - 1) // per_page
 
@@ -2404,7 +3410,6 @@ def admin_list_categories():
         (per_page, offset)
     )
     categories = cur.fetchall()
-    conn.close()
 
     total_pages = (total + per_page - 1) // per_page
 
@@ -2418,11 +3423,7 @@ def admin_list_categories():
 @app.route("/admin/relation-types")
 @admin_required
 def admin_relation_types():
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM relation_types ORDER BY name")
-    relation_types = cur.fetchall()
-    conn.close()
+    relation_types = get_reference_data()["relation_types"]
     return render_template("admin_relation_types.html", relation_types=relation_types)
 
 @app.post("/admin/relation-types/add")
@@ -2431,7 +3432,7 @@ def admin_add_relation_type():
     name = request.form["name"].strip()
     applies_to = request.form["applies_to"]
     bidirectional = 1 if "bidirectional" in request.form else 0
-    conn = sqlite3.connect("finnish.db")
+    conn = get_db_connection()
     cur = conn.cursor()
     try:
         cur.execute(
@@ -2439,16 +3440,16 @@ def admin_add_relation_type():
             (name, applies_to, bidirectional)
         )
         conn.commit()
+        invalidate_reference_data()
         flash("Relation type added.", "success")
     except sqlite3.IntegrityError:
         flash("Relation type already exists.", "danger")
-    conn.close()
     return redirect(url_for("admin_relation_types"))
 
 @app.post("/admin/relation-types/<int:type_id>/delete")
 @admin_required
 def admin_delete_relation_type(type_id):
-    conn = sqlite3.connect("finnish.db")
+    conn = get_db_connection()
     cur = conn.cursor()
     # Check if type is used
     cur.execute("SELECT COUNT(*) FROM word_relations WHERE relation_type_id = ?", (type_id,))
@@ -2461,7 +3462,7 @@ def admin_delete_relation_type(type_id):
         return redirect(url_for("admin_relation_types"))
     cur.execute("DELETE FROM relation_types WHERE id = ?", (type_id,))
     conn.commit()
-    conn.close()
+    invalidate_reference_data()
     flash("Relation type deleted.", "success")
     return redirect(url_for("admin_relation_types"))
 
@@ -2475,7 +3476,6 @@ def admin_word_relations(word_name):
     cur.execute("SELECT * FROM words WHERE word = ?", (word_name,))
     word = cur.fetchone()
     if not word:
-        conn.close()
         flash(f"Word '{word_name}' not found.", "danger")
         return redirect(url_for("admin_dashboard"))
 
@@ -2510,7 +3510,6 @@ def admin_word_relations(word_name):
     """, (word_id, word_id))
     meaning_relations = cur.fetchall()
 
-    conn.close()
     return render_template(
         "admin_word_relations.html",
         word=word,
@@ -2545,7 +3544,6 @@ def admin_add_word_relation():
     """, (w1["id"], w2["id"], reltype))
     if cur.fetchone():
         flash("This word relation already exists.", "warning")
-        conn.close()
         return redirect(url_for("admin_relations_search"))
 
     # Insert relation
@@ -2569,18 +3567,16 @@ def admin_add_word_relation():
             """, (w2["id"], w1["id"], reltype))
 
     conn.commit()
-    conn.close()
     flash("Word relation added.", "success")
     return redirect(url_for("admin_relations_search"))
 
 @app.post("/admin/word-relations/<int:rel_id>/delete")
 @admin_required
 def admin_delete_word_relation(rel_id):
-    conn = sqlite3.connect("finnish.db")
+    conn = get_db_connection()
     cur = conn.cursor()
     cur.execute("DELETE FROM word_relations WHERE id = ?", (rel_id,))
     conn.commit()
-    conn.close()
     flash("Word relation deleted.", "success")
     return redirect(url_for("admin_relations_search"))
 
@@ -2595,20 +3591,18 @@ def admin_add_meaning_relation():
         flash("Please select both meanings.", "danger")
         return redirect(url_for("admin_relations_search"))
 
-    conn = sqlite3.connect("finnish.db")
+    conn = get_db_connection()
     cur = conn.cursor()
 
     # Verify these meaning IDs exist
     cur.execute("SELECT id FROM meanings WHERE id = ?", (m1_id,))
     if not cur.fetchone():
         flash("Invalid meaning 1.", "danger")
-        conn.close()
         return redirect(url_for("admin_relations_search"))
 
     cur.execute("SELECT id FROM meanings WHERE id = ?", (m2_id,))
     if not cur.fetchone():
         flash("Invalid meaning 2.", "danger")
-        conn.close()
         return redirect(url_for("admin_relations_search"))
 
     # Check if the relation already exists
@@ -2618,7 +3612,6 @@ def admin_add_meaning_relation():
     """, (m1_id, m2_id, reltype))
     if cur.fetchone():
         flash("This meaning relation already exists.", "warning")
-        conn.close()
         return redirect(url_for("admin_relations_search"))
 
     # Insert the meaning relation
@@ -2643,18 +3636,16 @@ def admin_add_meaning_relation():
             """, (m2_id, m1_id, reltype))
 
     conn.commit()
-    conn.close()
     flash("Meaning relation added.", "success")
     return redirect(url_for("admin_relations_search"))
 
 @app.post("/admin/meaning-relations/<int:rel_id>/delete")
 @admin_required
 def admin_delete_meaning_relation(rel_id):
-    conn = sqlite3.connect("finnish.db")
+    conn = get_db_connection()
     cur = conn.cursor()
     cur.execute("DELETE FROM meaning_relations WHERE id = ?", (rel_id,))
     conn.commit()
-    conn.close()
     flash("Meaning relation deleted.", "success")
     return redirect(url_for("admin_relations_search"))
 
@@ -2668,8 +3659,7 @@ def admin_relations_search():
     # Fetch relation types for the selects
     conn = get_db_connection()
     cur = conn.cursor()
-    cur.execute("SELECT * FROM relation_types ORDER BY name")
-    relation_types = cur.fetchall()
+    relation_types = get_reference_data()["relation_types"]
 
     if request.method == "POST":
         query = request.form.get("query", "").strip()
@@ -2708,7 +3698,6 @@ def admin_relations_search():
         """, (f"{query}%", f"{query}%"))
         meaning_relations = cur.fetchall()
 
-    conn.close()
 
     return render_template(
         "admin_relations_search.html",
@@ -2733,7 +3722,6 @@ def word_meanings():
     w = cur.fetchone()
 
     if not w:
-        conn.close()
         return jsonify([])
 
     # Get meanings for this word
@@ -2764,7 +3752,6 @@ def word_meanings():
             "translations": translations
         })
 
-    conn.close()
     return jsonify(results)
 
 @app.route("/admin/relations/words")
@@ -2781,10 +3768,9 @@ def admin_word_relations_list():
         JOIN relation_types rt ON wr.relation_type_id = rt.id
         ORDER BY rt.name, w1.word, w2.word
     """)
-    word_relations = cur.fetchall()
-    conn.close()
 
-    return render_template("admin_word_relations_list.html", word_relations=word_relations)
+    # Rows are fetched from the cursor as the page is rendered
+    return stream_page("admin_word_relations_list.html", word_relations=cur)
 
 @app.route("/admin/relations/meanings")
 @admin_required
@@ -2805,10 +3791,9 @@ def admin_meaning_relations_list():
         JOIN relation_types rt ON mr.relation_type_id = rt.id
         ORDER BY rt.name, w1.word, mnum1
     """)
-    meaning_relations = cur.fetchall()
-    conn.close()
 
-    return render_template("admin_meaning_relations_list.html", meaning_relations=meaning_relations)
+    # Rows are fetched from the cursor as the page is rendered
+    return stream_page("admin_meaning_relations_list.html", meaning_relations=cur)
 
 
 
@@ -2928,7 +3913,6 @@ def admin_collocation(colloc_id):
     row = cur.fetchone()
 
     if not row:
-        conn.close()
         abort(404)
 
     # Apply punctuation fix for display
@@ -2977,7 +3961,6 @@ def admin_collocation(colloc_id):
             "is_primary": bool(r["is_primary"]),
         })
 
-    conn.close()
 
     return render_template(
         "admin_collocation.html",
@@ -3042,7 +4025,6 @@ def admin_collocation_list():
         LIMIT 1000
     """)
     rows = cur.fetchall()
-    conn.close()
 
     collocations = []
     for r in rows:
@@ -3076,7 +4058,6 @@ def admin_word_collocations(word_name):
     cur.execute("SELECT id, word FROM words WHERE word = ?", (word_name,))
     row_word = cur.fetchone()
     if not row_word:
-        conn.close()
         abort(404)
 
     word_id = row_word["id"]
@@ -3126,7 +4107,6 @@ def admin_word_collocations(word_name):
             """, (show_in_app, show_examples, colloc_id, word_id))
 
         conn.commit()
-        conn.close()
         return redirect(url_for("admin_word_collocations", word_name=word_name))
 
     # --- GET: load collocations for this word ---
@@ -3160,7 +4140,6 @@ def admin_word_collocations(word_name):
             wc.id ASC
     """, (word_id,))
     rows = cur.fetchall()
-    conn.close()
 
     collocations = []
     for r in rows:
@@ -0,0 +1,167 @@
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+from functools import lru_cache
+
+
+# ----------------------------
+# PATHS
+# ----------------------------
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+DB_PATH = os.path.join(ROOT_DIR, "finnish.db")
+
+sys.path.insert(0, ROOT_DIR)
+from app import load_category_tree, get_category_counts, ids_to_bitmap  # noqa: E402
+
+# --synthetic: a category tree much larger than the real one
+SYNTHETIC_CATEGORIES = 3000
+SYNTHETIC_WORDS = 50_000
+SYNTHETIC_MEMBERSHIPS = 200_000
+SYNTHETIC_LEVELS = 6
+
+REPEAT = 5
+MEMO_REPEAT = 10_000
+
+
+def synthetic_db():
+    """In-memory DB with just the tables load_category_tree() reads."""
+    random.seed(0)
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.executescript("""
+        CREATE TABLE levels (id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+        CREATE TABLE categories (id INTEGER PRIMARY KEY, name TEXT NOT NULL, parent_id INTEGER,
+                                 sort_order INTEGER DEFAULT 0);
+        CREATE TABLE words (id INTEGER PRIMARY KEY, word TEXT NOT NULL, level INTEGER NOT NULL);
+        CREATE TABLE word_categories (id INTEGER PRIMARY KEY, word_id INTEGER NOT NULL,
+                                      category_id INTEGER NOT NULL);
+    """)
+    conn.executemany("INSERT INTO levels VALUES (?, ?)",
+                     [(i, str(i)) for i in range(SYNTHETIC_LEVELS)])
+    # 30 top-level topics, every other category under a random earlier one
+    conn.executemany("INSERT INTO categories VALUES (?, ?, ?, 0)", [
+        (i, f"c{i}", None if i <= 30 else random.randint(1, i - 1))
+        for i in range(1, SYNTHETIC_CATEGORIES + 1)
+    ])
+    conn.executemany("INSERT INTO words VALUES (?, ?, ?)", [
+        (i, f"w{i}", random.randrange(SYNTHETIC_LEVELS))
+        for i in range(1, SYNTHETIC_WORDS + 1)
+    ])
+    conn.executemany("INSERT INTO word_categories (word_id, category_id) VALUES (?, ?)", [
+        (random.randint(1, SYNTHETIC_WORDS), random.randint(1, SYNTHETIC_CATEGORIES))
+        for _ in range(SYNTHETIC_MEMBERSHIPS)
+    ])
+    return conn
+
+
+def previous_category_counts(cur, level_ids):
+    """Counts as get_categories_with_counts() computed them before: set unions on every request."""
+    cur.execute("SELECT id, parent_id FROM categories")
+    rows = cur.fetchall()
+    children_by_parent = {}
+    for row in rows:
+        children_by_parent.setdefault(row["parent_id"], []).append(row["id"])
+
+    words_by_cat = {}
+    if level_ids:
+        placeholders = ",".join("?" * len(level_ids))
+        cur.execute(f"""
+            SELECT wc.category_id AS category_id, w.id AS word_id
+            FROM word_categories wc
+            JOIN words w ON w.id = wc.word_id
+            WHERE w.level IN ({placeholders})
+        """, level_ids)
+        for row in cur.fetchall():
+            words_by_cat.setdefault(row["category_id"], set()).add(row["word_id"])
+
+    @lru_cache(maxsize=None)
+    def gather_words(cat_id):
+        merged = set(words_by_cat.get(cat_id, set()))
+        for child_id in children_by_parent.get(cat_id, []):
+            merged |= gather_words(child_id)
+        return merged
+
+    return {row["id"]: len(gather_words(row["id"])) for row in rows}
+
+
+def best_ms(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best * 1000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Level-filtered category counts: set unions per request (before) vs word bitmaps (now)."
+    )
+    parser.add_argument("--db", default=DB_PATH, help="database to read (default: finnish.db)")
+    parser.add_argument("--synthetic", action="store_true",
+                        help=f"use a generated tree instead ({SYNTHETIC_CATEGORIES} categories, "
+                             f"{SYNTHETIC_WORDS} words, {SYNTHETIC_MEMBERSHIPS} memberships)")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="runs per measurement; the best is shown")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.synthetic:
+        conn = synthetic_db()
+        label = "synthetic tree"
+    else:
+        if not os.path.exists(args.db):
+            print(f"DB not found: {args.db}")
+            sys.exit(1)
+        conn = sqlite3.connect(args.db)
+        conn.row_factory = sqlite3.Row
+        label = args.db
+    cur = conn.cursor()
+
+    cur.execute("SELECT id FROM levels ORDER BY id")
+    level_ids = [row["id"] for row in cur.fetchall()]
+    cur.execute("SELECT COUNT(*) FROM categories")
+    num_categories = cur.fetchone()[0]
+    print(f"{label}: {num_categories} categories, {len(level_ids)} levels")
+
+    tree, build_ms = best_ms(lambda: load_category_tree(cur), args.repeat)
+    print(f"  bitmap tree build (once per category change): {build_ms:.1f} ms")
+
+    selections = [
+        ("all levels", level_ids),
+        ("one level", level_ids[:1]),
+        ("half the levels", level_ids[:max(1, len(level_ids) // 2)]),
+    ]
+    for description, selection in selections:
+        mask = ids_to_bitmap(selection)
+        before, before_ms = best_ms(lambda: previous_category_counts(cur, selection), args.repeat)
+
+        # First request for a selection fills the memo, later ones reuse it
+        tree["counts_by_levels"].clear()
+        start = time.perf_counter()
+        counts = get_category_counts(tree, mask)
+        first_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        for _ in range(MEMO_REPEAT):
+            get_category_counts(tree, mask)
+        repeated_us = (time.perf_counter() - start) / MEMO_REPEAT * 1e6
+
+        if before != counts:
+            print(f"Counts differ for {description}.")
+            sys.exit(1)
+        print(f"  {description + ':':<17} set unions {before_ms:8.1f} ms | "
+              f"bitmaps, new selection {first_ms:6.1f} ms, repeated {repeated_us:5.2f} us")
+
+    conn.close()
+    print("Done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import os
+import sys
+import time
+import sqlite3
+import argparse
+
+
+# ----------------------------
+# PATHS
+# ----------------------------
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+DB_PATH = os.path.join(ROOT_DIR, "finnish.db")
+
+sys.path.insert(0, ROOT_DIR)
+from app import get_words_page  # noqa: E402
+
+# Words per list; "all" = every word on the selected levels, like the
+# /words/* pages loaded before they were paged
+SIZES = ["100", "1000", "all"]
+REPEAT = 3
+
+
+def previous_words_page(cur, level_ids, limit):
+    """The word list as get_words_from_db() built it before: one translations query per word."""
+    placeholders = ",".join("?" for _ in level_ids)
+    cur.execute(f"""
+        SELECT w.id, w.word, w.level, w.created_at
+        FROM words w
+        WHERE w.level IN ({placeholders})
+        ORDER BY LOWER(w.word), w.id
+        LIMIT ?
+    """, list(level_ids) + [limit])
+    words = []
+    for w in cur.fetchall():
+        cur.execute("""
+            SELECT DISTINCT t.translation_text
+            FROM translations t
+            JOIN meanings m ON m.id = t.meaning_id
+            WHERE m.word_id = ?
+            ORDER BY m.meaning_number, t.translation_number
+        """, (w["id"],))
+        all_translations = [row["translation_text"] for row in cur.fetchall()]
+        words.append({
+            "id": w["id"],
+            "word": w["word"],
+            "level": w["level"],
+            "translations": all_translations[:3],
+            "total_translations": len(all_translations),
+        })
+    return words
+
+
+def run(conn, fn, repeat):
+    """(result, statements executed, best time in ms) of fn(cursor)."""
+    statements = [0]
+
+    def count(_sql):
+        statements[0] += 1
+
+    best = None
+    for _ in range(repeat):
+        statements[0] = 0
+        conn.set_trace_callback(count)
+        start = time.perf_counter()
+        result = fn(conn.cursor())
+        elapsed = time.perf_counter() - start
+        conn.set_trace_callback(None)
+        best = elapsed if best is None else min(best, elapsed)
+    return result, statements[0], best * 1000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Word list translations: one query per word (before) vs one query per list (now)."
+    )
+    parser.add_argument("--db", default=DB_PATH, help="database to read (default: finnish.db)")
+    parser.add_argument("--sizes", nargs="+", default=SIZES, help="list sizes to measure, or 'all'")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="runs per measurement; the best is shown")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not os.path.exists(args.db):
+        print(f"DB not found: {args.db}")
+        sys.exit(1)
+
+    conn = sqlite3.connect(args.db)
+    conn.row_factory = sqlite3.Row
+    cur = conn.cursor()
+
+    cur.execute("SELECT id FROM levels ORDER BY id")
+    level_ids = [row["id"] for row in cur.fetchall()]
+    cur.execute(f"SELECT COUNT(*) FROM words WHERE level IN ({','.join('?' for _ in level_ids)})", level_ids)
+    total_words = cur.fetchone()[0]
+
+    print(f"{args.db}: {total_words} words on {len(level_ids)} levels")
+    print(f"{'words':>8}  {'statements before':>17}  {'statements now':>14}  {'ms before':>10}  {'ms now':>8}")
+    for size in args.sizes:
+        limit = total_words if size == "all" else int(size)
+
+        before, before_statements, before_ms = run(
+            conn, lambda c: previous_words_page(c, level_ids, limit), args.repeat)
+        (words, _), now_statements, now_ms = run(
+            conn, lambda c: get_words_page(c, level_ids, limit=limit), args.repeat)
+
+        if before != words:
+            print(f"Output differs for {size} words.")
+            sys.exit(1)
+        print(f"{len(words):>8}  {before_statements:>17}  {now_statements:>14}  "
+              f"{before_ms:>10.1f}  {now_ms:>8.1f}")
+
+    conn.close()
+    print("Done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+import os
+import sys
+import time
+import shutil
+import sqlite3
+import argparse
+import tempfile
+
+
+# ----------------------------
+# PATHS
+# ----------------------------
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+DB_PATH = os.path.join(ROOT_DIR, "finnish.db")
+
+sys.path.insert(0, ROOT_DIR)
+from app import get_word_meanings, get_meaning_relations  # noqa: E402
+
+# Words measured when none are given: the ones with the largest
+# translations x examples fan-out
+TOP_WORDS = 5
+
+# --rich: a word added to a temporary copy of the DB
+RICH_WORD = "rikas_bench"
+RICH_MEANINGS = 40
+RICH_TRANSLATIONS = 12
+RICH_EXAMPLES = 12
+RICH_RELATIONS = 3  # meaning relations per meaning, to meanings of other words
+
+REPEAT = 5
+
+
+def previous_word_meanings(cur, word_id):
+    """Meanings as show_word() built them before: one joined query, grouped by scanning lists."""
+    cur.execute("""
+        SELECT
+            m.id   AS meaning_id,
+            m.meaning_number,
+            m.definition,
+            m.notes,
+            p.name AS pos_name,
+            t.translation_text,
+            e.id   AS example_id,
+            e.example_text,
+            e.example_translation_text
+        FROM meanings m
+        LEFT JOIN parts_of_speech p ON m.pos_id = p.id
+        LEFT JOIN translations t    ON t.meaning_id = m.id
+        LEFT JOIN examples e        ON e.meaning_id = m.id
+        WHERE m.word_id = ?
+        ORDER BY p.name ASC, m.meaning_number ASC, t.translation_number ASC
+    """, (word_id,))
+
+    meanings_by_pos = {}
+    for r in cur.fetchall():
+        pos = r["pos_name"] or "other"
+        meanings_by_pos.setdefault(pos, [])
+        meaning = next((m for m in meanings_by_pos[pos] if m["id"] == r["meaning_id"]), None)
+        if meaning is None:
+            meaning = {
+                "id": r["meaning_id"],
+                "meaning_number": r["meaning_number"],
+                "definition": r["definition"],
+                "notes": r["notes"],
+                "translations": [],
+                "examples": [],
+                "seen_example_ids": set(),
+            }
+            meanings_by_pos[pos].append(meaning)
+        if r["translation_text"] and r["translation_text"] not in meaning["translations"]:
+            meaning["translations"].append(r["translation_text"])
+        if r["example_text"] and r["example_id"] not in meaning["seen_example_ids"]:
+            meaning["examples"].append({
+                "text": r["example_text"],
+                "translation": r["example_translation_text"]
+            })
+            meaning["seen_example_ids"].add(r["example_id"])
+
+    counter = 1
+    for pos_block in meanings_by_pos.values():
+        for m in pos_block:
+            m.pop("seen_example_ids")
+            m["display_number"] = counter
+            counter += 1
+    return meanings_by_pos
+
+
+def previous_meaning_relations(cur, meaning_ids):
+    """Meaning relations as show_word() built them before: joined with target translations."""
+    if not meaning_ids:
+        return {}
+    cur.execute("""
+        SELECT
+            mr.meaning1_id,
+            rt.name AS relation_type,
+            w2.word AS target_word,
+            m2.meaning_number AS target_meaning_number,
+            t2.translation_text AS target_translation
+        FROM meaning_relations mr
+        JOIN relation_types rt ON mr.relation_type_id = rt.id
+        JOIN meanings m2       ON mr.meaning2_id = m2.id
+        JOIN words   w2        ON m2.word_id = w2.id
+        LEFT JOIN translations t2 ON t2.meaning_id = m2.id
+        WHERE mr.meaning1_id IN ({})
+        ORDER BY rt.name, w2.word, m2.meaning_number, t2.translation_number
+    """.format(",".join("?" * len(meaning_ids))), meaning_ids)
+
+    meaning_relations = {}
+    for r in cur.fetchall():
+        group = meaning_relations.setdefault(r["meaning1_id"], {}).setdefault(r["relation_type"], [])
+        entry = None
+        for e in group:
+            if e["target_word"] == r["target_word"] and e["target_number"] == r["target_meaning_number"]:
+                entry = e
+                break
+        if entry is None:
+            entry = {
+                "target_word": r["target_word"],
+                "target_number": r["target_meaning_number"],
+                "translations": []
+            }
+            group.append(entry)
+        if r["target_translation"] and r["target_translation"] not in entry["translations"]:
+            entry["translations"].append(r["target_translation"])
+    return meaning_relations
+
+
+def previous_page_data(cur, word_id):
+    meanings_by_pos = previous_word_meanings(cur, word_id)
+    meaning_ids = [m["id"] for pos_block in meanings_by_pos.values() for m in pos_block]
+    return meanings_by_pos, previous_meaning_relations(cur, meaning_ids)
+
+
+def page_data(cur, word_id):
+    meanings_by_pos = get_word_meanings(cur, word_id)
+    meaning_ids = [m["id"] for pos_block in meanings_by_pos.values() for m in pos_block]
+    return meanings_by_pos, get_meaning_relations(cur, meaning_ids)
+
+
+def add_rich_word(conn):
+    """Add RICH_WORD with many meanings, translations, examples and relations."""
+    cur = conn.cursor()
+    cur.execute("SELECT id FROM levels ORDER BY id LIMIT 1")
+    level = cur.fetchone()[0]
+    cur.execute("SELECT id FROM parts_of_speech ORDER BY id LIMIT 1")
+    pos = cur.fetchone()[0]
+    cur.execute("SELECT id FROM relation_types WHERE applies_to = 'meaning' ORDER BY id LIMIT 1")
+    relation_type = cur.fetchone()
+    cur.execute("SELECT id FROM meanings ORDER BY id LIMIT ?", (RICH_MEANINGS * RICH_RELATIONS,))
+    targets = [row[0] for row in cur.fetchall()]
+
+    cur.execute("INSERT INTO words (word, level) VALUES (?, ?)", (RICH_WORD, level))
+    word_id = cur.lastrowid
+    for n in range(1, RICH_MEANINGS + 1):
+        cur.execute(
+            "INSERT INTO meanings (word_id, meaning_number, definition, pos_id) VALUES (?, ?, ?, ?)",
+            (word_id, n, f"meaning {n}", pos),
+        )
+        meaning_id = cur.lastrowid
+        cur.executemany(
+            "INSERT INTO translations (meaning_id, translation_text, translation_number) VALUES (?, ?, ?)",
+            [(meaning_id, f"translation {n}.{t}", t) for t in range(1, RICH_TRANSLATIONS + 1)],
+        )
+        cur.executemany(
+            "INSERT INTO examples (meaning_id, example_text, example_translation_text) VALUES (?, ?, ?)",
+            [(meaning_id, f"esimerkki {n}.{e}", f"example {n}.{e}") for e in range(1, RICH_EXAMPLES + 1)],
+        )
+        if relation_type is not None:
+            start = (n - 1) * RICH_RELATIONS
+            cur.executemany(
+                "INSERT OR IGNORE INTO meaning_relations (meaning1_id, meaning2_id, relation_type_id) "
+                "VALUES (?, ?, ?)",
+                [(meaning_id, target, relation_type[0]) for target in targets[start:start + RICH_RELATIONS]],
+            )
+    conn.commit()
+    return RICH_WORD
+
+
+def busiest_words(cur, limit):
+    """Words with the most translations x examples rows per meaning."""
+    cur.execute("""
+        SELECT w.word
+        FROM words w
+        JOIN meanings m ON m.word_id = w.id
+        LEFT JOIN (SELECT meaning_id, COUNT(*) AS n FROM translations GROUP BY meaning_id) t
+               ON t.meaning_id = m.id
+        LEFT JOIN (SELECT meaning_id, COUNT(*) AS n FROM examples GROUP BY meaning_id) e
+               ON e.meaning_id = m.id
+        GROUP BY w.id
+        ORDER BY SUM(MAX(1, COALESCE(t.n, 0)) * MAX(1, COALESCE(e.n, 0))) DESC
+        LIMIT ?
+    """, (limit,))
+    return [row["word"] for row in cur.fetchall()]
+
+
+def same_page_data(before, now):
+    """
+    Whether both give the same page. The old query had no ORDER BY for
+    examples (they came out in whatever order the join produced), so
+    examples are compared without regard to order.
+    """
+    def normalized(data):
+        meanings_by_pos, meaning_relations = data
+        meanings = {
+            pos: [dict(m, examples=sorted(m["examples"], key=lambda e: (e["text"], e["translation"] or "")))
+                  for m in pos_block]
+            for pos, pos_block in meanings_by_pos.items()
+        }
+        return meanings, meaning_relations
+
+    return normalized(before) == normalized(now)
+
+
+def best_ms(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best * 1000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Word page meanings and relations: joined fan-out rows (before) vs "
+                    "separate queries and dict indexes (now)."
+    )
+    parser.add_argument("--db", default=DB_PATH, help="database to read (default: finnish.db)")
+    parser.add_argument("words", nargs="*",
+                        help=f"words to measure (default: the {TOP_WORDS} with the largest fan-out)")
+    parser.add_argument("--rich", action="store_true",
+                        help=f"also measure a word with {RICH_MEANINGS} meanings x {RICH_TRANSLATIONS} "
+                             f"translations x {RICH_EXAMPLES} examples, added to a temporary copy of the DB")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="runs per measurement; the best is shown")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not os.path.exists(args.db):
+        print(f"DB not found: {args.db}")
+        sys.exit(1)
+
+    work_dir = None
+    db_path = args.db
+    if args.rich:
+        work_dir = tempfile.mkdtemp(prefix="bench_word_page_")
+        db_path = os.path.join(work_dir, "finnish.db")
+        source = sqlite3.connect(args.db)
+        with sqlite3.connect(db_path) as copy:
+            source.backup(copy)
+        source.close()
+
+    try:
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        cur = conn.cursor()
+
+        words = args.words or busiest_words(cur, TOP_WORDS)
+        if args.rich:
+            words.append(add_rich_word(conn))
+
+        print(f"{'word':<20} {'fan-out rows':>12}  {'ms before':>9}  {'ms now':>7}")
+        for word in words:
+            cur.execute("SELECT id FROM words WHERE word = ?", (word,))
+            row = cur.fetchone()
+            if row is None:
+                print(f"{word:<20} not found")
+                continue
+            word_id = row["id"]
+            cur.execute("""
+                SELECT COUNT(*)
+                FROM meanings m
+                LEFT JOIN translations t ON t.meaning_id = m.id
+                LEFT JOIN examples e     ON e.meaning_id = m.id
+                WHERE m.word_id = ?
+            """, (word_id,))
+            fan_out = cur.fetchone()[0]
+
+            before, before_ms = best_ms(lambda: previous_page_data(cur, word_id), args.repeat)
+            now, now_ms = best_ms(lambda: page_data(cur, word_id), args.repeat)
+            if not same_page_data(before, now):
+                print(f"Output differs for {word}.")
+                sys.exit(1)
+            print(f"{word:<20} {fan_out:>12}  {before_ms:>9.2f}  {now_ms:>7.2f}")
+
+        conn.close()
+    finally:
+        if work_dir is not None:
+            shutil.rmtree(work_dir)
+
+    print("Done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import os
+import re
+import sqlite3
+import csv
+
+
+# ----------------------------
+# PATHS
+# ----------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = BASE_DIR
+
+DB_PATH = os.path.join(ROOT_DIR, "finnish.db")
+
+# Optional offline form list: TSV with columns `form` and `lemma`
+FORMS_TSV = os.path.join(ROOT_DIR, "word_forms.tsv")
+
+BATCH_SIZE = 5000
+
+TOKEN_RE = re.compile(r"[^\W\d_]+")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or "").lower())
+
+
+def common_prefix_len(a, b):
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+# Shorter lemmas are the start of too many unrelated words (ja, on)
+MIN_LEMMA_LEN = 3
+# Letters at the end of the lemma that may change in a form (katu -> kadulla),
+# as long as the form still shares MIN_SHARED_PREFIX letters with it
+MAX_STEM_CHANGE = 2
+MIN_SHARED_PREFIX = 2
+# Letters the form may have after the shared prefix (talo -> taloissammekin)
+MAX_ENDING_LETTERS = 10
+
+# What a form may add after the shared prefix: up to two changed stem or
+# plural letters, a case or number ending, a possessive suffix and a clitic
+ENDING_RE = re.compile(r"""
+    [a-zåäö]{0,2}?
+    (?:n|t|a|ä|ta|tä|na|nä|ne|in|en|seen|ksi|ssa|ssä|sta|stä|lla|llä|lta|ltä|lle|tta|ttä)
+    (?:ni|si|mme|nne|nsa|nsä)?
+    (?:kin|kaan|kään|ko|kö|pa|pä)?
+""", re.VERBOSE)
+
+
+def looks_like_form_of(form, lemma):
+    """
+    Cheap guess whether `form` is an inflection of `lemma`: Finnish endings
+    keep the start of the stem (talo -> talossa, katu -> kadulla), so require
+    a shared prefix that covers all but the last MAX_STEM_CHANGE letters of
+    the lemma, followed by something that reads as an ending (talous and
+    kirjasto are not forms of talo and kirja).
+    """
+    if len(lemma) < MIN_LEMMA_LEN or form == lemma:
+        return False
+    lcp = common_prefix_len(form, lemma)
+    if lcp < max(MIN_SHARED_PREFIX, len(lemma) - MAX_STEM_CHANGE):
+        return False
+    if len(form) - lcp > MAX_ENDING_LETTERS:
+        return False
+    return ENDING_RE.fullmatch(form[lcp:]) is not None
+
+
+class LemmaIndex:
+    """
+    Finds the dictionary lemma a token is a form of: the one with the longest
+    common prefix among all words, not only the ones the token was seen with
+    (kirjastossa is a form of kirjasto, not of kirja).
+    """
+
+    def __init__(self, lemma_by_id):
+        # A lemma can only match a token whose prefix is the lemma minus at
+        # most MAX_STEM_CHANGE letters, so index it under those prefixes
+        self.by_prefix = {}
+        for word_id in sorted(lemma_by_id):
+            lemma = lemma_by_id[word_id].lower()
+            if len(lemma) < MIN_LEMMA_LEN or " " in lemma:
+                continue
+            for k in range(max(MIN_SHARED_PREFIX, len(lemma) - MAX_STEM_CHANGE), len(lemma) + 1):
+                self.by_prefix.setdefault(lemma[:k], []).append((word_id, lemma))
+
+    def lemma_of(self, token):
+        """word_id of the lemma `token` is a form of, or None."""
+        for k in range(len(token), MIN_SHARED_PREFIX - 1, -1):
+            for word_id, lemma in self.by_prefix.get(token[:k], ()):
+                # Longest prefix first: a lemma sharing more than k letters
+                # was already tried under its longer prefix
+                if common_prefix_len(token, lemma) == k and looks_like_form_of(token, lemma):
+                    return word_id
+        return None
+
+
+def forms_from_offline_list(words_by_text):
+    if not os.path.exists(FORMS_TSV):
+        return
+    with open(FORMS_TSV, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f, delimiter="\t")
+        for row in reader:
+            form = (row.get("form") or "").strip().lower()
+            word_id = words_by_text.get((row.get("lemma") or "").strip())
+            if form and word_id is not None:
+                yield form, word_id, "list"
+
+
+def forms_from_collocations(cur, lemma_index):
+    """
+    other_form is the collocate as it appeared, surface_form the whole phrase;
+    a token is kept when its lemma is one of the collocation's two words.
+    """
+    cur.execute("""
+        SELECT word_id, other_word_id, other_form, surface_form
+        FROM word_collocations
+        ORDER BY freq DESC
+    """)
+    for row in cur:
+        word_ids = {row["word_id"], row["other_word_id"]}
+        for token in tokenize(row["surface_form"]) + tokenize(row["other_form"]):
+            word_id = lemma_index.lemma_of(token)
+            if word_id in word_ids:
+                yield token, word_id, "collocation"
+
+
+def forms_from_corpus_examples(cur, lemma_index):
+    """The tokens in each example sentence whose lemma is the example's word."""
+    cur.execute("""
+        SELECT word_id, example_text
+        FROM corpus_examples
+        WHERE hidden = 0
+    """)
+    for row in cur:
+        for token in tokenize(row["example_text"]):
+            if lemma_index.lemma_of(token) == row["word_id"]:
+                yield token, row["word_id"], "corpus"
+
+
+def main():
+    if not os.path.exists(DB_PATH):
+        print(f"DB not found: {DB_PATH}")
+        return
+
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    cur = conn.cursor()
+
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'word_forms'")
+    if cur.fetchone() is None:
+        print("word_forms table missing; run database_updates/modify_db_19.py first.")
+        return
+
+    cur.execute("SELECT id, word FROM words")
+    lemma_by_id = {row["id"]: row["word"] for row in cur.fetchall()}
+    words_by_text = {word: word_id for word_id, word in lemma_by_id.items()}
+    # A lemma is always found by itself; don't store it as a form
+    lemmas = {word.lower() for word in words_by_text}
+    lemma_index = LemmaIndex(lemma_by_id)
+
+    print("Rebuilding word_forms...")
+    cur.execute("DELETE FROM word_forms")
+
+    # Sources in order of trust: the first lemma seen for a form wins
+    sources = [
+        ("offline list", forms_from_offline_list(words_by_text)),
+        ("collocations", forms_from_collocations(conn.cursor(), lemma_index)),
+        ("corpus examples", forms_from_corpus_examples(conn.cursor(), lemma_index)),
+    ]
+
+    total = 0
+    for label, rows in sources:
+        before = total
+        batch = []
+        for form, word_id, source in rows:
+            if form in lemmas:
+                continue
+            batch.append((form, word_id, source))
+            if len(batch) >= BATCH_SIZE:
+                cur.executemany(
+                    "INSERT OR IGNORE INTO word_forms (form, word_id, source) VALUES (?, ?, ?)",
+                    batch,
+                )
+                total += cur.rowcount
+                batch = []
+        if batch:
+            cur.executemany(
+                "INSERT OR IGNORE INTO word_forms (form, word_id, source) VALUES (?, ?, ?)",
+                batch,
+            )
+            total += cur.rowcount
+        print(f"  {label + ':':<18}{total - before} forms")
+
+    conn.commit()
+    conn.close()
+
+    print("Done.")
+    print(f"  Forms in word_forms:                   {total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import os
+import sys
+import sqlite3
+import argparse
+
+
+# ----------------------------
+# PATHS
+# ----------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = BASE_DIR
+
+DB_PATH = os.path.join(ROOT_DIR, "finnish.db")
+
+sys.path.insert(0, ROOT_DIR)
+import app as webapp  # noqa: E402
+
+# Statements a check is about, by how they start in app.py (whitespace
+# collapsed). They must run and must not sort in a temp B-tree: the first
+# two would sort every word on the selected levels or in a category subtree.
+# Every other statement only sorts the rows of one word, one page or one
+# search range.
+WORDS_PAGE_SQL = "SELECT w.id, w.word, w.level, w.created_at"
+CATEGORY_WORDS_SQL = "SELECT wc.category_id AS category_id"
+LEMMA_SQL = "SELECT word FROM words WHERE word ="
+WORD_FORM_SQL = "SELECT w.word FROM word_forms f"
+
+
+def sample_values(cur):
+    """Words, a category etc. of this DB for the route URLs, or None if it has no words."""
+    cur.execute("""
+        SELECT w.word, MIN(t.translation_text) AS translation
+        FROM words w
+        JOIN meanings m ON m.word_id = w.id
+        LEFT JOIN translations t ON t.meaning_id = m.id
+        GROUP BY w.id
+        ORDER BY COUNT(*) DESC
+        LIMIT 1
+    """)
+    row = cur.fetchone()
+    if row is None:
+        return None
+    word, translation = row
+
+    cur.execute("SELECT COUNT(*) FROM words")
+    num_words = cur.fetchone()[0]
+    cur.execute("""
+        SELECT LOWER(word), id
+        FROM words
+        ORDER BY LOWER(word), id
+        LIMIT 1 OFFSET ?
+    """, (num_words // 2,))
+    middle = cur.fetchone()
+
+    # The category with the most subcategories, so the subtree query has work
+    cur.execute("""
+        SELECT c.name
+        FROM categories c
+        LEFT JOIN categories sub ON sub.parent_id = c.id
+        GROUP BY c.id
+        ORDER BY COUNT(sub.id) DESC
+        LIMIT 1
+    """)
+    category = cur.fetchone()
+
+    try:
+        cur.execute("SELECT form FROM word_forms LIMIT 1")
+        form = cur.fetchone()
+    except sqlite3.OperationalError:
+        # word_forms not created yet (database_updates/modify_db_19.py)
+        form = None
+
+    cur.execute("SELECT id FROM levels ORDER BY id LIMIT 1")
+    return {
+        "word": word,
+        "form": form[0] if form else None,
+        "translation": translation or "",
+        "cursor": webapp.encode_words_cursor(*middle),
+        "category": category[0] if category else None,
+        "level": cur.fetchone()[0],
+    }
+
+
+def route_checks(values):
+    """
+    The hot routes, as (description, url, level ids in the session or None
+    for the default, statement that must run and not sort, plan steps
+    accepted).
+    """
+    word = values["word"]
+    checks = [
+        # (description, url, levels, key statement, accepted steps)
+        ("words list, first page", "/words/table", None, WORDS_PAGE_SQL,
+         # walks the index in page order and stops after one page
+         ("SCAN w USING INDEX idx_words_lower_word",)),
+        ("words list, next page", f"/api/words?cursor={values['cursor']}", None,
+         WORDS_PAGE_SQL, ()),
+        ("words list, one level", f"/api/words?cursor={values['cursor']}",
+         [values["level"]], WORDS_PAGE_SQL, ()),
+        ("word page", f"/word/{word}", None, None, ()),
+        # resolve_word_form(): a capitalised lemma redirects to its page
+        ("word page, capitalised", f"/word/{word.upper()}", None, LEMMA_SQL, ()),
+        ("search, Finnish", f"/search?mode=finnish&query={word[:2]}", None, None, ()),
+        ("search, translation", f"/search?mode=translation&query={values['translation'][:2]}",
+         None, None, ()),
+    ]
+    if values["form"] is not None:
+        checks.append(("word page, inflected form", f"/word/{values['form']}", None,
+                       WORD_FORM_SQL, ()))
+    if values["category"] is not None:
+        checks.append(("category page", f"/categories/{values['category']}", None,
+                       CATEGORY_WORDS_SQL, ()))
+    return checks
+
+
+def trace_route(client, url, level_ids, statements):
+    """SELECTs the route runs for url, with their parameters filled in."""
+    # The first request fills the per-process caches (reference data,
+    # category tree...), the second one shows what every request runs
+    for _ in range(2):
+        webapp.word_page_cache.clear()
+        del statements[:]
+        if level_ids is not None:
+            with client.session_transaction() as session:
+                session["level_mask"] = webapp.ids_to_bitmap(level_ids)
+        client.get(url)
+    return [sql for sql in statements if sql.lstrip().upper().startswith(("SELECT", "WITH"))]
+
+
+def plan_problems(plan, sort_allowed, accepted=()):
+    """
+    Steps of a query plan that scan a table or index, or sort when not
+    allowed. Scans of sqlite_master and of the statement's own subqueries
+    are fine.
+    """
+    own = {step.split(" ", 1)[1] for step in plan
+           if step.startswith(("MATERIALIZE ", "CO-ROUTINE "))}
+    problems = []
+    for step in plan:
+        if step in accepted:
+            continue
+        if step.startswith("SCAN "):
+            name = step.split()[1]
+            if name not in own and name not in ("sqlite_master", "CONSTANT"):
+                problems.append(step)
+        elif "TEMP B-TREE" in step and not sort_allowed:
+            problems.append(step)
+    return problems
+
+
+def one_line(sql):
+    return " ".join(sql.split())
+
+
+def short_sql(sql, length=70):
+    sql = one_line(sql)
+    return sql if len(sql) <= length else sql[:length - 3] + "..."
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Check that the hot routes' queries use indexes (EXPLAIN QUERY PLAN "
+                    "of the SQL app.py runs). Exits with status 1 if any of them scans or sorts."
+    )
+    parser.add_argument("--db", default=DB_PATH, help="database to check (default: finnish.db)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not os.path.exists(args.db):
+        print(f"Database not found: {args.db}")
+        sys.exit(1)
+    conn = sqlite3.connect(args.db)
+    cur = conn.cursor()
+
+    values = sample_values(cur)
+    if values is None:
+        print(f"No words with meanings in {args.db}, nothing to check.")
+        sys.exit(1)
+
+    webapp.read_pool.db_path = args.db
+    webapp.write_pool.db_path = args.db
+    # Requests run one at a time, so they all get this connection back from
+    # the pool; it reports every statement with its parameters filled in
+    statements = []
+    traced = webapp.read_pool.acquire()
+    traced.set_trace_callback(statements.append)
+    webapp.read_pool.release(traced)
+    client = webapp.app.test_client()
+
+    failures = 0
+    for description, url, level_ids, key_sql, accepted in route_checks(values):
+        print(f"{description} ({url}):")
+        route_sql = trace_route(client, url, level_ids, statements)
+        if key_sql and not any(one_line(sql).startswith(key_sql) for sql in route_sql):
+            failures += 1
+            print(f"  ✗ never ran {key_sql}...; update check_query_plans.py")
+
+        for sql in route_sql:
+            cur.execute("EXPLAIN QUERY PLAN " + sql)
+            plan = [row[3] for row in cur.fetchall()]
+            sort_allowed = not (key_sql and one_line(sql).startswith(key_sql))
+            problems = plan_problems(plan, sort_allowed, accepted)
+            if problems:
+                failures += 1
+                print(f"  ✗ {short_sql(sql)}: {'; '.join(problems)}")
+            else:
+                print(f"  ✓ {short_sql(sql)}: {'; '.join(plan)}")
+
+    conn.close()
+
+    if failures:
+        print(f"{failures} query plan(s) scan or sort; run database_updates/modify_db_24.py "
+              f"and check the indexes.")
+        sys.exit(1)
+    print("Done. All query plans use indexes.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import sqlite3
+
+DB_PATH = "finnish.db"
+
+conn = sqlite3.connect(DB_PATH)
+cur = conn.cursor()
+
+print("Creating data_versions change counters...")
+
+# One row per cached data set; the app compares `version` with the version
+# its in-process cache was built from and reloads when they differ.
+cur.execute("""
+    CREATE TABLE IF NOT EXISTS data_versions (
+        name    TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+""")
+cur.execute("INSERT OR IGNORE INTO data_versions (name, version) VALUES ('categories', 0)")
+print("✓ data_versions table ensured.")
+
+# ------------------------------------------------------------
+# 'categories': category tree + which words are in which category (and their level)
+# ------------------------------------------------------------
+BUMP_CATEGORIES = "UPDATE data_versions SET version = version + 1 WHERE name = 'categories';"
+
+triggers = {
+    "trg_categories_version_insert":
+        "AFTER INSERT ON categories",
+    "trg_categories_version_update":
+        "AFTER UPDATE OF name, parent_id, sort_order ON categories",
+    "trg_categories_version_delete":
+        "AFTER DELETE ON categories",
+    "trg_word_categories_version_insert":
+        "AFTER INSERT ON word_categories",
+    "trg_word_categories_version_update":
+        "AFTER UPDATE OF word_id, category_id ON word_categories",
+    "trg_word_categories_version_delete":
+        "AFTER DELETE ON word_categories",
+    "trg_words_level_version_update":
+        "AFTER UPDATE OF level ON words",
+    "trg_words_version_delete":
+        "AFTER DELETE ON words",
+}
+
+for name, event in triggers.items():
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {name}
+        {event}
+        BEGIN
+            {BUMP_CATEGORIES}
+        END;
+    """)
+    print(f"✓ trigger {name}")
+
+conn.commit()
+conn.close()
+print("Migration completed successfully.")
@@ -0,0 +1,49 @@
+import sqlite3
+
+DB_PATH = "finnish.db"
+
+conn = sqlite3.connect(DB_PATH)
+cur = conn.cursor()
+
+print("Building category_closure table...")
+
+# One row per (ancestor, descendant) pair, including each category with
+# itself at depth 0. Kept in sync by the admin category routes in app.py.
+cur.execute("""
+    CREATE TABLE IF NOT EXISTS category_closure (
+        ancestor_id   INTEGER NOT NULL REFERENCES categories(id),
+        descendant_id INTEGER NOT NULL REFERENCES categories(id),
+        depth         INTEGER NOT NULL,
+        PRIMARY KEY (ancestor_id, descendant_id)
+    ) WITHOUT ROWID
+""")
+
+# "Which categories is X under?" lookups
+cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_category_closure_descendant
+    ON category_closure(descendant_id, ancestor_id, depth)
+""")
+print("✓ category_closure table ensured.")
+
+# (Re)build from categories.parent_id, so running this again is safe
+cur.execute("DELETE FROM category_closure")
+cur.execute("""
+    WITH RECURSIVE closure(ancestor_id, descendant_id, depth) AS (
+        SELECT id, id, 0 FROM categories
+        UNION
+        SELECT closure.ancestor_id, c.id, closure.depth + 1
+        FROM closure
+        JOIN categories c ON c.parent_id = closure.descendant_id
+    )
+    INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+    SELECT ancestor_id, descendant_id, MIN(depth)
+    FROM closure
+    GROUP BY ancestor_id, descendant_id
+""")
+
+cur.execute("SELECT COUNT(*) FROM category_closure")
+print(f"✓ {cur.fetchone()[0]} closure rows written.")
+
+conn.commit()
+conn.close()
+print("Migration completed successfully.")
@@ -0,0 +1,185 @@
+import sqlite3
+
+DB_PATH = "finnish.db"
+
+conn = sqlite3.connect(DB_PATH)
+cur = conn.cursor()
+
+print("Building full-text search index (FTS5)...")
+
+# ------------------------------------------------------------
+# search_index: one FTS5 document per searchable piece of text.
+#   text    - the indexed text
+#   source  - 'word' | 'translation' | 'definition' | 'example' | 'collocation'
+#   word_id - the word the result links to
+#
+# rowid = <id in the source table> * 8 + <source code>, so the triggers can
+# find/delete an entry by rowid instead of scanning the index.
+# ------------------------------------------------------------
+SOURCES = {
+    "word": 1,
+    "translation": 2,
+    "definition": 3,
+    "example": 4,
+    "collocation": 5,
+}
+
+cur.execute("DROP TABLE IF EXISTS search_index")
+cur.execute("""
+    CREATE VIRTUAL TABLE search_index USING fts5(
+        text,
+        source UNINDEXED,
+        word_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+""")
+print("✓ search_index created.")
+
+# ---------- Initial fill ----------
+cur.execute(f"""
+    INSERT INTO search_index (rowid, text, source, word_id)
+    SELECT id * 8 + {SOURCES['word']}, word, 'word', id
+    FROM words
+""")
+cur.execute(f"""
+    INSERT INTO search_index (rowid, text, source, word_id)
+    SELECT t.id * 8 + {SOURCES['translation']}, t.translation_text, 'translation', m.word_id
+    FROM translations t
+    JOIN meanings m ON m.id = t.meaning_id
+""")
+cur.execute(f"""
+    INSERT INTO search_index (rowid, text, source, word_id)
+    SELECT id * 8 + {SOURCES['definition']}, definition, 'definition', word_id
+    FROM meanings
+    WHERE definition IS NOT NULL AND definition != ''
+""")
+cur.execute(f"""
+    INSERT INTO search_index (rowid, text, source, word_id)
+    SELECT e.id * 8 + {SOURCES['example']},
+           e.example_text || char(10) || COALESCE(e.example_translation_text, ''),
+           'example', m.word_id
+    FROM examples e
+    JOIN meanings m ON m.id = e.meaning_id
+""")
+cur.execute(f"""
+    INSERT INTO search_index (rowid, text, source, word_id)
+    SELECT id * 8 + {SOURCES['collocation']}, surface_form, 'collocation', word_id
+    FROM word_collocations
+    WHERE show_in_app = 1 AND surface_form IS NOT NULL AND surface_form != ''
+""")
+
+cur.execute("SELECT COUNT(*) FROM search_index")
+print(f"✓ {cur.fetchone()[0]} documents indexed.")
+
+# ---------- Triggers keep the index in sync ----------
+triggers = {
+    # words
+    "trg_search_words_insert": f"""
+        AFTER INSERT ON words BEGIN
+            INSERT INTO search_index (rowid, text, source, word_id)
+            VALUES (NEW.id * 8 + {SOURCES['word']}, NEW.word, 'word', NEW.id);
+        END""",
+    "trg_search_words_update": f"""
+        AFTER UPDATE OF word ON words BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + {SOURCES['word']};
+            INSERT INTO search_index (rowid, text, source, word_id)
+            VALUES (NEW.id * 8 + {SOURCES['word']}, NEW.word, 'word', NEW.id);
+        END""",
+    "trg_search_words_delete": f"""
+        AFTER DELETE ON words BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + {SOURCES['word']};
+        END""",
+
+    # translations
+    "trg_search_translations_insert": f"""
+        AFTER INSERT ON translations BEGIN
+            INSERT INTO search_index (rowid, text, source, word_id)
+            SELECT NEW.id * 8 + {SOURCES['translation']}, NEW.translation_text, 'translation', word_id
+            FROM meanings WHERE id = NEW.meaning_id;
+        END""",
+    "trg_search_translations_update": f"""
+        AFTER UPDATE OF translation_text, meaning_id ON translations BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + {SOURCES['translation']};
+            INSERT INTO search_index (rowid, text, source, word_id)
+            SELECT NEW.id * 8 + {SOURCES['translation']}, NEW.translation_text, 'translation', word_id
+            FROM meanings WHERE id = NEW.meaning_id;
+        END""",
+    "trg_search_translations_delete": f"""
+        AFTER DELETE ON translations BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + {SOURCES['translation']};
+        END""",
+
+    # meanings.definition
+    "trg_search_definitions_insert": f"""
+        AFTER INSERT ON meanings
+        WHEN NEW.definition IS NOT NULL AND NEW.definition != '' BEGIN
+            INSERT INTO search_index (rowid, text, source, word_id)
+            VALUES (NEW.id * 8 + {SOURCES['definition']}, NEW.definition, 'definition', NEW.word_id);
+        END""",
+    "trg_search_definitions_update": f"""
+        AFTER UPDATE OF definition, word_id ON meanings BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + {SOURCES['definition']};
+            INSERT INTO search_index (rowid, text, source, word_id)
+            SELECT NEW.id * 8 + {SOURCES['definition']}, NEW.definition, 'definition', NEW.word_id
+            WHERE NEW.definition IS NOT NULL AND NEW.definition != '';
+        END""",
+    "trg_search_definitions_delete": f"""
+        AFTER DELETE ON meanings BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + {SOURCES['definition']};
+        END""",
+
+    # examples
+    "trg_search_examples_insert": f"""
+        AFTER INSERT ON examples BEGIN
+            INSERT INTO search_index (rowid, text, source, word_id)
+            SELECT NEW.id * 8 + {SOURCES['example']},
+                   NEW.example_text || char(10) || COALESCE(NEW.example_translation_text, ''),
+                   'example', word_id
+            FROM meanings WHERE id = NEW.meaning_id;
+        END""",
+    "trg_search_examples_update": f"""
+        AFTER UPDATE OF example_text, example_translation_text, meaning_id ON examples BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + {SOURCES['example']};
+            INSERT INTO search_index (rowid, text, source, word_id)
+            SELECT NEW.id * 8 + {SOURCES['example']},
+                   NEW.example_text || char(10) || COALESCE(NEW.example_translation_text, ''),
+                   'example', word_id
+            FROM meanings WHERE id = NEW.meaning_id;
+        END""",
+    "trg_search_examples_delete": f"""
+        AFTER DELETE ON examples BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + {SOURCES['example']};
+        END""",
+
+    # word_collocations.surface_form (only the ones shown in the app)
+    "trg_search_collocations_insert": f"""
+        AFTER INSERT ON word_collocations
+        WHEN NEW.show_in_app = 1 AND NEW.surface_form IS NOT NULL AND NEW.surface_form != '' BEGIN
+            INSERT INTO search_index (rowid, text, source, word_id)
+            VALUES (NEW.id * 8 + {SOURCES['collocation']}, NEW.surface_form, 'collocation', NEW.word_id);
+        END""",
+    "trg_search_collocations_update": f"""
+        AFTER UPDATE OF surface_form, show_in_app, word_id ON word_collocations BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + {SOURCES['collocation']};
+            INSERT INTO search_index (rowid, text, source, word_id)
+            SELECT NEW.id * 8 + {SOURCES['collocation']}, NEW.surface_form, 'collocation', NEW.word_id
+            WHERE NEW.show_in_app = 1 AND NEW.surface_form IS NOT NULL AND NEW.surface_form != '';
+        END""",
+    "trg_search_collocations_delete": f"""
+        AFTER DELETE ON word_collocations BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + {SOURCES['collocation']};
+        END""",
+}
+
+for name, body in triggers.items():
+    cur.execute(f"DROP TRIGGER IF EXISTS {name}")
+    cur.execute(f"CREATE TRIGGER {name} {body};")
+    print(f"✓ trigger {name}")
+
+# Merge index segments once after the bulk load
+cur.execute("INSERT INTO search_index (search_index) VALUES ('optimize')")
+
+conn.commit()
+conn.close()
+print("Migration completed successfully.")
@@ -0,0 +1,62 @@
+import sqlite3
+
+DB_PATH = "finnish.db"
+
+conn = sqlite3.connect(DB_PATH)
+cur = conn.cursor()
+
+print("Adding 'vocabulary' change counter...")
+
+# data_versions itself comes from modify_db_14.py; repeated here so this
+# script can run on its own.
+cur.execute("""
+    CREATE TABLE IF NOT EXISTS data_versions (
+        name    TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+""")
+cur.execute("INSERT OR IGNORE INTO data_versions (name, version) VALUES ('vocabulary', 0)")
+print("✓ data_versions 'vocabulary' row ensured.")
+
+# ------------------------------------------------------------
+# 'vocabulary': the strings offered by autocomplete
+# (words.word, translations.translation_text, categories.name)
+# ------------------------------------------------------------
+BUMP_VOCABULARY = "UPDATE data_versions SET version = version + 1 WHERE name = 'vocabulary';"
+
+triggers = {
+    "trg_words_vocabulary_insert":
+        "AFTER INSERT ON words",
+    "trg_words_vocabulary_update":
+        "AFTER UPDATE OF word ON words",
+    "trg_words_vocabulary_delete":
+        "AFTER DELETE ON words",
+    "trg_translations_vocabulary_insert":
+        "AFTER INSERT ON translations",
+    "trg_translations_vocabulary_update":
+        "AFTER UPDATE OF translation_text, meaning_id ON translations",
+    "trg_translations_vocabulary_delete":
+        "AFTER DELETE ON translations",
+    "trg_meanings_vocabulary_update":
+        "AFTER UPDATE OF word_id ON meanings",
+    "trg_categories_vocabulary_insert":
+        "AFTER INSERT ON categories",
+    "trg_categories_vocabulary_update":
+        "AFTER UPDATE OF name ON categories",
+    "trg_categories_vocabulary_delete":
+        "AFTER DELETE ON categories",
+}
+
+for name, event in triggers.items():
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {name}
+        {event}
+        BEGIN
+            {BUMP_VOCABULARY}
+        END;
+    """)
+    print(f"✓ trigger {name}")
+
+conn.commit()
+conn.close()
+print("Migration completed successfully.")
@@ -0,0 +1,45 @@
+import sqlite3
+
+DB_PATH = "finnish.db"
+
+conn = sqlite3.connect(DB_PATH)
+cur = conn.cursor()
+
+print("Adding diacritic-folded search keys...")
+
+
+def fold_sql(column):
+    # lower() only folds ASCII; ä/ö/å (either case) are folded explicitly.
+    # Must stay in line with fold_search_key() in app.py.
+    expr = f"lower({column})"
+    for src, dst in (("ä", "a"), ("Ä", "a"), ("ö", "o"), ("Ö", "o"), ("å", "a"), ("Å", "a")):
+        expr = f"replace({expr}, '{src}', '{dst}')"
+    return expr
+
+
+def has_column(table, column):
+    # table_xinfo also lists generated columns
+    cur.execute(f"PRAGMA table_xinfo({table})")
+    return any(row[1] == column for row in cur.fetchall())
+
+
+# ------------------------------------------------------------
+# search_key: VIRTUAL generated column, so it can never go stale and needs
+# no changes in the app or the import scripts; the index stores the values.
+# ------------------------------------------------------------
+for table, column in (("words", "word"), ("translations", "translation_text")):
+    if not has_column(table, "search_key"):
+        cur.execute(f"""
+            ALTER TABLE {table}
+            ADD COLUMN search_key TEXT GENERATED ALWAYS AS ({fold_sql(column)}) VIRTUAL
+        """)
+        print(f"✓ {table}.search_key added.")
+    else:
+        print(f"• {table}.search_key already exists.")
+
+    cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_search_key ON {table}(search_key)")
+    print(f"✓ idx_{table}_search_key ensured.")
+
+conn.commit()
+conn.close()
+print("Migration completed successfully.")
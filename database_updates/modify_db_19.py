@@ -0,0 +1,38 @@
+import sqlite3
+
+DB_PATH = "finnish.db"
+
+conn = sqlite3.connect(DB_PATH)
+cur = conn.cursor()
+
+print("Creating word_forms (inflected form -> lemma) table...")
+
+# One row per known surface form, e.g. 'talossa' -> talo. `form` is stored
+# lowercased and is the primary key, so a lookup is one index probe.
+# Filled in bulk by build_word_forms.py.
+cur.execute("""
+    CREATE TABLE IF NOT EXISTS word_forms (
+        form    TEXT PRIMARY KEY,
+        word_id INTEGER NOT NULL REFERENCES words(id),
+        source  TEXT NOT NULL
+    ) WITHOUT ROWID
+""")
+cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_word_forms_word
+    ON word_forms(word_id)
+""")
+print("✓ word_forms table ensured.")
+
+# Forget the forms of deleted words
+cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_word_forms_words_delete
+    AFTER DELETE ON words
+    BEGIN
+        DELETE FROM word_forms WHERE word_id = OLD.id;
+    END;
+""")
+print("✓ trigger trg_word_forms_words_delete")
+
+conn.commit()
+conn.close()
+print("Migration completed successfully.")
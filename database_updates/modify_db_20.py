@@ -0,0 +1,236 @@
+import sqlite3
+
+DB_PATH = "finnish.db"
+
+conn = sqlite3.connect(DB_PATH)
+cur = conn.cursor()
+
+print("Creating per-word change counters (word_versions)...")
+
+# One row per word whose page has changed at least once (no row = version 0).
+# The word page cache in app.py compares it with the version a cached page
+# was rendered from. Rows outlive their word: words.id is a plain INTEGER
+# PRIMARY KEY, so SQLite can hand a deleted word's id to the next new word,
+# and that word must not start at a version the old page was cached under.
+cur.execute("""
+    CREATE TABLE IF NOT EXISTS word_versions (
+        word_id INTEGER PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+""")
+print("✓ word_versions table ensured.")
+
+
+def bump(word_ids_sql):
+    """Statement bumping every word_id returned by `word_ids_sql`."""
+    return f"""
+        INSERT INTO word_versions (word_id, version)
+        SELECT word_id, 1 FROM ({word_ids_sql}) WHERE word_id IS NOT NULL
+        ON CONFLICT(word_id) DO UPDATE SET version = version + 1;
+    """
+
+
+def word_of_meaning(meaning_id):
+    return f"SELECT word_id FROM meanings WHERE id = {meaning_id}"
+
+
+def words_pointing_at_meaning(meaning_id):
+    # pages that list this meaning as a relation target
+    return f"""
+        SELECT m1.word_id AS word_id
+        FROM meaning_relations mr
+        JOIN meanings m1 ON m1.id = mr.meaning1_id
+        WHERE mr.meaning2_id = {meaning_id}
+    """
+
+
+def words_pointing_at_word(word_id):
+    # pages that show this word as a relation target or collocate
+    return f"""
+        SELECT word1_id AS word_id FROM word_relations WHERE word2_id = {word_id}
+        UNION
+        SELECT m1.word_id
+        FROM meaning_relations mr
+        JOIN meanings m1 ON m1.id = mr.meaning1_id
+        JOIN meanings m2 ON m2.id = mr.meaning2_id
+        WHERE m2.word_id = {word_id}
+        UNION
+        SELECT word_id FROM word_collocations WHERE other_word_id = {word_id}
+    """
+
+
+# ------------------------------------------------------------
+# What a word page shows (see show_word in app.py) and who changes it
+# ------------------------------------------------------------
+triggers = {
+    # the word itself (a new word may reuse a deleted word's id)
+    "trg_word_versions_words_insert": (
+        "AFTER INSERT ON words",
+        [bump("SELECT NEW.id AS word_id")],
+    ),
+    "trg_word_versions_words_update": (
+        "AFTER UPDATE OF word, level ON words",
+        [bump("SELECT NEW.id AS word_id"), bump(words_pointing_at_word("NEW.id"))],
+    ),
+    "trg_word_versions_words_delete": (
+        "AFTER DELETE ON words",
+        [bump("SELECT OLD.id AS word_id"), bump(words_pointing_at_word("OLD.id"))],
+    ),
+
+    # meanings / translations / examples
+    "trg_word_versions_meanings_insert": (
+        "AFTER INSERT ON meanings",
+        [bump("SELECT NEW.word_id AS word_id")],
+    ),
+    "trg_word_versions_meanings_update": (
+        "AFTER UPDATE ON meanings",
+        [bump("SELECT OLD.word_id AS word_id UNION SELECT NEW.word_id"),
+         bump(words_pointing_at_meaning("NEW.id"))],
+    ),
+    "trg_word_versions_meanings_delete": (
+        "AFTER DELETE ON meanings",
+        [bump("SELECT OLD.word_id AS word_id"),
+         bump(words_pointing_at_meaning("OLD.id"))],
+    ),
+    "trg_word_versions_translations_insert": (
+        "AFTER INSERT ON translations",
+        [bump(word_of_meaning("NEW.meaning_id")),
+         bump(words_pointing_at_meaning("NEW.meaning_id"))],
+    ),
+    "trg_word_versions_translations_update": (
+        "AFTER UPDATE ON translations",
+        [bump(f"{word_of_meaning('OLD.meaning_id')} UNION {word_of_meaning('NEW.meaning_id')}"),
+         bump(words_pointing_at_meaning("NEW.meaning_id"))],
+    ),
+    "trg_word_versions_translations_delete": (
+        "AFTER DELETE ON translations",
+        [bump(word_of_meaning("OLD.meaning_id")),
+         bump(words_pointing_at_meaning("OLD.meaning_id"))],
+    ),
+    "trg_word_versions_examples_insert": (
+        "AFTER INSERT ON examples",
+        [bump(word_of_meaning("NEW.meaning_id"))],
+    ),
+    "trg_word_versions_examples_update": (
+        "AFTER UPDATE ON examples",
+        [bump(f"{word_of_meaning('OLD.meaning_id')} UNION {word_of_meaning('NEW.meaning_id')}")],
+    ),
+    "trg_word_versions_examples_delete": (
+        "AFTER DELETE ON examples",
+        [bump(word_of_meaning("OLD.meaning_id"))],
+    ),
+
+    # categories
+    "trg_word_versions_word_categories_insert": (
+        "AFTER INSERT ON word_categories",
+        [bump("SELECT NEW.word_id AS word_id")],
+    ),
+    "trg_word_versions_word_categories_update": (
+        "AFTER UPDATE OF word_id, category_id ON word_categories",
+        [bump("SELECT OLD.word_id AS word_id UNION SELECT NEW.word_id")],
+    ),
+    "trg_word_versions_word_categories_delete": (
+        "AFTER DELETE ON word_categories",
+        [bump("SELECT OLD.word_id AS word_id")],
+    ),
+    "trg_word_versions_categories_update": (
+        "AFTER UPDATE OF name ON categories",
+        [bump("SELECT word_id FROM word_categories WHERE category_id = NEW.id")],
+    ),
+    "trg_word_versions_categories_delete": (
+        "AFTER DELETE ON categories",
+        [bump("SELECT word_id FROM word_categories WHERE category_id = OLD.id")],
+    ),
+
+    # relations
+    "trg_word_versions_word_relations_insert": (
+        "AFTER INSERT ON word_relations",
+        [bump("SELECT NEW.word1_id AS word_id")],
+    ),
+    "trg_word_versions_word_relations_update": (
+        "AFTER UPDATE ON word_relations",
+        [bump("SELECT OLD.word1_id AS word_id UNION SELECT NEW.word1_id")],
+    ),
+    "trg_word_versions_word_relations_delete": (
+        "AFTER DELETE ON word_relations",
+        [bump("SELECT OLD.word1_id AS word_id")],
+    ),
+    "trg_word_versions_meaning_relations_insert": (
+        "AFTER INSERT ON meaning_relations",
+        [bump(word_of_meaning("NEW.meaning1_id"))],
+    ),
+    "trg_word_versions_meaning_relations_update": (
+        "AFTER UPDATE ON meaning_relations",
+        [bump(f"{word_of_meaning('OLD.meaning1_id')} UNION {word_of_meaning('NEW.meaning1_id')}")],
+    ),
+    "trg_word_versions_meaning_relations_delete": (
+        "AFTER DELETE ON meaning_relations",
+        [bump(word_of_meaning("OLD.meaning1_id"))],
+    ),
+    "trg_word_versions_relation_types_update": (
+        "AFTER UPDATE OF name ON relation_types",
+        [bump("""
+            SELECT word1_id AS word_id FROM word_relations WHERE relation_type_id = NEW.id
+            UNION
+            SELECT m1.word_id
+            FROM meaning_relations mr
+            JOIN meanings m1 ON m1.id = mr.meaning1_id
+            WHERE mr.relation_type_id = NEW.id
+        """)],
+    ),
+
+    # collocations and their corpus examples
+    "trg_word_versions_collocations_insert": (
+        "AFTER INSERT ON word_collocations",
+        [bump("SELECT NEW.word_id AS word_id")],
+    ),
+    "trg_word_versions_collocations_update": (
+        "AFTER UPDATE ON word_collocations",
+        [bump("SELECT OLD.word_id AS word_id UNION SELECT NEW.word_id")],
+    ),
+    "trg_word_versions_collocations_delete": (
+        "AFTER DELETE ON word_collocations",
+        [bump("SELECT OLD.word_id AS word_id")],
+    ),
+    "trg_word_versions_corpus_examples_insert": (
+        "AFTER INSERT ON corpus_examples",
+        [bump("SELECT word_id FROM word_collocations WHERE id = NEW.collocation_id")],
+    ),
+    "trg_word_versions_corpus_examples_update": (
+        "AFTER UPDATE ON corpus_examples",
+        [bump("""
+            SELECT word_id FROM word_collocations WHERE id = OLD.collocation_id
+            UNION
+            SELECT word_id FROM word_collocations WHERE id = NEW.collocation_id
+        """)],
+    ),
+    "trg_word_versions_corpus_examples_delete": (
+        "AFTER DELETE ON corpus_examples",
+        [bump("SELECT word_id FROM word_collocations WHERE id = OLD.collocation_id")],
+    ),
+
+    # names shown on every page of a level / part of speech
+    "trg_word_versions_levels_update": (
+        "AFTER UPDATE OF name ON levels",
+        [bump("SELECT id AS word_id FROM words WHERE level = NEW.id")],
+    ),
+    "trg_word_versions_parts_of_speech_update": (
+        "AFTER UPDATE OF name ON parts_of_speech",
+        [bump("SELECT DISTINCT word_id FROM meanings WHERE pos_id = NEW.id")],
+    ),
+}
+
+for name, (event, statements) in triggers.items():
+    cur.execute(f"DROP TRIGGER IF EXISTS {name}")
+    cur.execute(f"""
+        CREATE TRIGGER {name}
+        {event}
+        BEGIN
+            {"".join(statements)}
+        END;
+    """)
+    print(f"✓ trigger {name}")
+
+conn.commit()
+conn.close()
+print("Migration completed successfully.")
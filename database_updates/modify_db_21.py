@@ -0,0 +1,44 @@
+import sqlite3
+
+DB_PATH = "finnish.db"
+
+conn = sqlite3.connect(DB_PATH)
+cur = conn.cursor()
+
+print("Adding 'word_lists' change counter...")
+
+# data_versions itself comes from modify_db_14.py; repeated here so this
+# script can run on its own.
+cur.execute("""
+    CREATE TABLE IF NOT EXISTS data_versions (
+        name    TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+""")
+cur.execute("INSERT OR IGNORE INTO data_versions (name, version) VALUES ('word_lists', 0)")
+print("✓ data_versions 'word_lists' row ensured.")
+
+# ------------------------------------------------------------
+# 'word_lists': everything /words/* and /categories* show (words with their
+# level and translations, the category tree, level names). The app derives
+# the ETags of those pages from it.
+# ------------------------------------------------------------
+BUMP_WORD_LISTS = "UPDATE data_versions SET version = version + 1 WHERE name = 'word_lists';"
+
+tables = ["words", "meanings", "translations", "categories", "word_categories", "levels"]
+
+for table in tables:
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        name = f"trg_{table}_word_lists_{event.lower()}"
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {name}
+            AFTER {event} ON {table}
+            BEGIN
+                {BUMP_WORD_LISTS}
+            END;
+        """)
+        print(f"✓ trigger {name}")
+
+conn.commit()
+conn.close()
+print("Migration completed successfully.")
@@ -0,0 +1,44 @@
+import sqlite3
+
+DB_PATH = "finnish.db"
+
+conn = sqlite3.connect(DB_PATH)
+cur = conn.cursor()
+
+print("Adding 'reference' change counter...")
+
+# data_versions itself comes from modify_db_14.py; repeated here so this
+# script can run on its own.
+cur.execute("""
+    CREATE TABLE IF NOT EXISTS data_versions (
+        name    TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+""")
+cur.execute("INSERT OR IGNORE INTO data_versions (name, version) VALUES ('reference', 0)")
+print("✓ data_versions 'reference' row ensured.")
+
+# ------------------------------------------------------------
+# 'reference': the small lookup tables the app caches per process
+# (see get_reference_data in app.py). Later migrations that edit them
+# bump it through these triggers.
+# ------------------------------------------------------------
+BUMP_REFERENCE = "UPDATE data_versions SET version = version + 1 WHERE name = 'reference';"
+
+tables = ["levels", "parts_of_speech", "relation_types"]
+
+for table in tables:
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        name = f"trg_{table}_reference_{event.lower()}"
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {name}
+            AFTER {event} ON {table}
+            BEGIN
+                {BUMP_REFERENCE}
+            END;
+        """)
+        print(f"✓ trigger {name}")
+
+conn.commit()
+conn.close()
+print("Migration completed successfully.")
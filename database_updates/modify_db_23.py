@@ -0,0 +1,21 @@
+import sqlite3
+
+DB_PATH = "finnish.db"
+
+conn = sqlite3.connect(DB_PATH)
+cur = conn.cursor()
+
+print("Adding index for the paged word lists...")
+
+# /words/* pages are read in (LOWER(word), id) order from a cursor (see
+# get_words_page in app.py). Index entries end with the rowid, so this index
+# is already in that order and each page is a range scan from the cursor.
+cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_words_lower_word
+    ON words(LOWER(word))
+""")
+print("✓ idx_words_lower_word ensured.")
+
+conn.commit()
+conn.close()
+print("Migration completed successfully.")
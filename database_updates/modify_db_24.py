@@ -0,0 +1,62 @@
+import sqlite3
+
+DB_PATH = "finnish.db"
+
+conn = sqlite3.connect(DB_PATH)
+cur = conn.cursor()
+
+print("Adding indexes for the hot query shapes...")
+
+# word_relations(word1_id) and meaning_relations(meaning1_id) are already the
+# leading columns of their UNIQUE constraints' indexes; the lookups in the
+# other direction (used by the word_versions triggers) were not covered.
+# meanings and word_collocations lost their word_id indexes when
+# modify_db_11.py and modify_db_collocations2.py rebuilt the tables, and
+# words lost the index of its UNIQUE(word) the same way.
+indexes = {
+    # a word by its exact spelling: /word/<name>, resolve_word_form() and
+    # the admin lookups. Not UNIQUE: duplicates may have crept in since.
+    "idx_words_word":
+        "words(word)",
+    # meanings of a word, in order (word page, word lists, relations)
+    "idx_meanings_word":
+        "meanings(word_id, meaning_number)",
+    # collocations of a word on the word page
+    "idx_word_collocations_word":
+        "word_collocations(word_id)",
+    # /words/* pages for a single level: one range, already in page order
+    # (see get_words_page in app.py; all-level pages use idx_words_lower_word)
+    "idx_words_level_lower_word":
+        "words(level, LOWER(word))",
+    # translations of a meaning, in order; covering for the word lists
+    "idx_translations_meaning":
+        "translations(meaning_id, translation_number, translation_text)",
+    "idx_examples_meaning":
+        "examples(meaning_id)",
+    # words of a category, in order; covering for get_subtree_words()
+    "idx_word_categories_category":
+        "word_categories(category_id, sort_order, word_id, meaning_id)",
+    "idx_word_relations_word2":
+        "word_relations(word2_id)",
+    "idx_meaning_relations_meaning2":
+        "meaning_relations(meaning2_id)",
+    # primary, visible example of a collocation on the word page
+    "idx_corpus_examples_collocation":
+        "corpus_examples(collocation_id, is_primary, hidden)",
+}
+
+for name, target in indexes.items():
+    cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+    print(f"✓ {name} ensured.")
+
+# Without statistics SQLite prefers the level index for any level filter and
+# then sorts every matching word; with them it walks idx_words_lower_word.
+cur.execute("ANALYZE")
+print("✓ statistics updated (ANALYZE).")
+
+
+conn.commit()
+conn.close()
+
+print("Migration completed successfully.")
+print("Check the query plans with: python check_query_plans.py")
@@ -0,0 +1,446 @@
+import os
+import re
+import sqlite3
+import csv
+import argparse
+import glob
+import shutil
+import tempfile
+import time
+from collections import defaultdict
+
+# Only this offline script needs NumPy; the site does not
+import numpy as np
+
+
+# ----------------------------
+# PATHS
+# ----------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = BASE_DIR
+
+DB_PATH = os.path.join(ROOT_DIR, "finnish.db")
+
+# Output: one <lemma>.tsv per word, read by import_collocations_from_tsv.py
+TSV_DIR = os.path.join(ROOT_DIR, "collocations_tsv")
+
+# ----------------------------
+# SETTINGS
+# ----------------------------
+WINDOW = 3                 # tokens on each side of the word counted as collocates
+MIN_FREQ = 5
+MIN_PMI = 0.0
+TOP_PER_WORD = 50          # the word page shows at most 50 collocations
+DIRECTION_SHARE = 0.8      # L / R only if at least this share of the pairs is on that side
+MAX_EXAMPLE_TOKENS = 20    # longest sentence used as an example
+
+CHUNK_TOKENS = 250_000     # corpus tokens encoded at a time
+PAIR_BUFFER = 5_000_000    # window pairs held in memory before they are spilled to disk
+PARTITIONS = 64            # spill files per spill; each is merged on its own
+
+TOKEN_RE = re.compile(r"[^\W\d_]+")
+
+# Pair key: head token id << (OTHER_BITS + 1) | other token id << 1 | side
+# (0 = other on the left, 1 = on the right)
+OTHER_BITS = 28
+OTHER_MASK = (1 << OTHER_BITS) - 1
+
+DIRECTIONS = np.array(["L", "R", "B"])
+
+
+def load_head_forms(cur):
+    """
+    Dictionary words as heads: (lemmas, {lowercase form: lemma index}).
+    A word is found as itself and as its forms in word_forms (if built);
+    multi-word entries are left out.
+    """
+    cur.execute("SELECT id, word FROM words ORDER BY id")
+    lemmas = []
+    index_by_id = {}
+    forms = {}
+    for row in cur.fetchall():
+        word = (row["word"] or "").strip()
+        if not word or " " in word:
+            continue
+        index_by_id[row["id"]] = len(lemmas)
+        forms.setdefault(word.lower(), len(lemmas))
+        lemmas.append(word)
+
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'word_forms'")
+    if cur.fetchone() is not None:
+        cur.execute("SELECT form, word_id FROM word_forms ORDER BY word_id")
+        for row in cur.fetchall():
+            lemma = index_by_id.get(row["word_id"])
+            if lemma is not None:
+                forms.setdefault(row["form"].lower(), lemma)
+
+    return lemmas, forms
+
+
+def read_chunks(corpus_path, chunk_tokens=CHUNK_TOKENS):
+    """
+    Yield (lines, sentences) of about chunk_tokens tokens from a tokenized
+    corpus: one sentence per line, tokens separated by whitespace.
+    """
+    with open(corpus_path, "r", encoding="utf-8", errors="replace") as f:
+        lines, sentences, size = [], [], 0
+        for line in f:
+            tokens = line.lower().split()
+            if not tokens:
+                continue
+            lines.append(line)
+            sentences.append(tokens)
+            size += len(tokens)
+            if size >= chunk_tokens:
+                yield lines, sentences
+                lines, sentences, size = [], [], 0
+        if sentences:
+            yield lines, sentences
+
+
+def encode_chunk(sentences, vocab):
+    """Token ids and sentence numbers of a chunk, as flat arrays."""
+    ids = np.fromiter((vocab[token] for tokens in sentences for token in tokens),
+                      dtype=np.int64)
+    lengths = np.fromiter(map(len, sentences), dtype=np.int64, count=len(sentences))
+    sentence_of = np.repeat(np.arange(len(sentences)), lengths)
+    return ids, sentence_of
+
+
+def window_pairs(ids, sentence_of, num_forms, window):
+    """
+    Yield (head positions, other positions, side) for every two tokens at
+    most `window` apart in one sentence where the first is a dictionary form
+    (ids below num_forms); side 0 = other on the left, 1 = on the right.
+    One offset and side at a time, to keep the temporary arrays small.
+    """
+    heads = np.flatnonzero(ids < num_forms)
+    for offset in range(1, window + 1):
+        for side, others in ((0, heads - offset), (1, heads + offset)):
+            ok = (others >= 0) & (others < len(ids))
+            h, o = heads[ok], others[ok]
+            same_sentence = sentence_of[h] == sentence_of[o]
+            yield h[same_sentence], o[same_sentence], side
+
+
+class PairCounter:
+    """
+    Counts pair keys in runs spilled to work_dir: every buffer_size keys are
+    counted (np.unique) and written as one file per partition. A pair's
+    partition depends only on its head word, so merge_partition() sees all
+    pairs of a word together, and only one partition is in memory at a time.
+    """
+
+    def __init__(self, work_dir, partition_of_head, partitions=PARTITIONS,
+                 buffer_size=PAIR_BUFFER):
+        self.work_dir = work_dir
+        self.partition_of_head = partition_of_head
+        self.partitions = partitions
+        self.buffer_size = buffer_size
+        self.pending = []
+        self.pending_size = 0
+        self.spills = 0
+
+    def run_path(self, partition, spill):
+        return os.path.join(self.work_dir, f"p{partition:03d}_{spill:05d}.npy")
+
+    def add(self, keys):
+        self.pending.append(keys)
+        self.pending_size += len(keys)
+        if self.pending_size >= self.buffer_size:
+            self.spill()
+
+    def spill(self):
+        if not self.pending_size:
+            return
+        keys, counts = np.unique(np.concatenate(self.pending), return_counts=True)
+        self.pending = []
+        self.pending_size = 0
+
+        parts = self.partition_of_head[keys >> (OTHER_BITS + 1)]
+        order = np.argsort(parts, kind="stable")
+        keys, counts, parts = keys[order], counts[order], parts[order]
+        bounds = np.searchsorted(parts, np.arange(self.partitions + 1))
+        for partition in range(self.partitions):
+            lo, hi = bounds[partition], bounds[partition + 1]
+            if lo < hi:
+                np.save(self.run_path(partition, self.spills),
+                        np.stack([keys[lo:hi], counts[lo:hi]]))
+        self.spills += 1
+
+    def merge_partition(self, partition):
+        """(keys, counts) of one partition, summed over all runs; removes the runs."""
+        paths = sorted(glob.glob(os.path.join(self.work_dir, f"p{partition:03d}_*.npy")))
+        if not paths:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        runs = [np.load(path) for path in paths]
+        keys, inverse = np.unique(np.concatenate([run[0] for run in runs]), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate([run[1] for run in runs]))
+        for path in paths:
+            os.remove(path)
+        return keys, counts.astype(np.int64)
+
+
+def select_collocations(keys, counts, stats, args):
+    """
+    Collocations of one partition's pairs: dict of arrays lemma, other,
+    direction (index into DIRECTIONS), head (token id of the most frequent
+    form, for surface_form), side (its side), freq and pmi.
+
+    freq counts both sides; pmi = log2(freq * N / (f(word) * f(other) * 2 * window)),
+    i.e. observed against expected co-occurrences within the window.
+    """
+    lemma_of, is_word, unigrams, lemma_counts, total_tokens = stats
+
+    head = keys >> (OTHER_BITS + 1)
+    other = (keys >> 1) & OTHER_MASK
+    side = keys & 1
+    lemma = lemma_of[head]
+
+    # Collocates are words (no punctuation or numbers), not forms of the head itself
+    keep = is_word[other] & (lemma_of[other] != lemma)
+    head, other, side, lemma, counts = head[keep], other[keep], side[keep], lemma[keep], counts[keep]
+    if not len(counts):
+        return None
+
+    groups, inverse = np.unique((lemma << OTHER_BITS) | other, return_inverse=True)
+    freq = np.bincount(inverse, weights=counts, minlength=len(groups)).astype(np.int64)
+    left = np.bincount(inverse, weights=counts * (side == 0), minlength=len(groups))
+
+    # Most frequent (form, side) of each group
+    order = np.lexsort((-counts, inverse))
+    starts = np.flatnonzero(np.r_[True, np.diff(inverse[order]) != 0])
+    best = order[starts]
+
+    g_lemma = groups >> OTHER_BITS
+    g_other = groups & OTHER_MASK
+    direction = np.where(left >= DIRECTION_SHARE * freq, 0,
+                         np.where(freq - left >= DIRECTION_SHARE * freq, 1, 2))
+    pmi = np.log2(freq * float(total_tokens)
+                  / (lemma_counts[g_lemma] * unigrams[g_other] * 2.0 * args.window))
+
+    selected = (freq >= args.min_freq) & (pmi >= args.min_pmi)
+
+    result = {
+        "lemma": g_lemma[selected],
+        "other": g_other[selected],
+        "direction": direction[selected],
+        "head": head[best][selected],
+        "side": side[best][selected],
+        "freq": freq[selected],
+        "pmi": pmi[selected],
+    }
+
+    # Keep the args.top most frequent per word
+    order = np.lexsort((-result["pmi"], -result["freq"], result["lemma"]))
+    result = {name: values[order] for name, values in result.items()}
+    starts = np.flatnonzero(np.r_[True, np.diff(result["lemma"]) != 0])
+    group_start = np.repeat(starts, np.diff(np.r_[starts, len(result["lemma"])]))
+    top = np.arange(len(result["lemma"])) - group_start < args.top
+    return {name: values[top] for name, values in result.items()}
+
+
+def find_examples(corpus_path, vocab, lemma_of, num_forms, selected, window,
+                  max_tokens=MAX_EXAMPLE_TOKENS):
+    """
+    {index into `selected` (sorted lemma << OTHER_BITS | other keys): the
+    first sentence of at most max_tokens tokens containing that pair}.
+    """
+    found = np.zeros(len(selected), dtype=bool)
+    examples = {}
+    if not len(selected):
+        return examples
+
+    for lines, sentences in read_chunks(corpus_path):
+        ids, sentence_of = encode_chunk(sentences, vocab)
+        lengths = np.fromiter(map(len, sentences), dtype=np.int64, count=len(sentences))
+
+        first_sentence = {}
+        for h, o, _ in window_pairs(ids, sentence_of, num_forms, window):
+            short = lengths[sentence_of[h]] <= max_tokens
+            h, o = h[short], o[short]
+
+            keys = (lemma_of[ids[h]] << OTHER_BITS) | ids[o]
+            positions = np.minimum(np.searchsorted(selected, keys), len(selected) - 1)
+            hit = (selected[positions] == keys) & ~found[positions]
+
+            # h is ascending, so the first hit of a pair is in its first sentence
+            new, first = np.unique(positions[hit], return_index=True)
+            for index, sentence in zip(new.tolist(), sentence_of[h[hit]][first].tolist()):
+                if sentence < first_sentence.get(index, len(lines)):
+                    first_sentence[index] = sentence
+
+        for index, sentence in first_sentence.items():
+            examples[index] = " ".join(lines[sentence].split())
+            found[index] = True
+        if found.all():
+            break
+
+    return examples
+
+
+def write_tsvs(out_dir, lemmas, vocab_list, collocations, examples):
+    """One <lemma>.tsv per word, most frequent collocations first. Returns the file count."""
+    os.makedirs(out_dir, exist_ok=True)
+    lemma_ids = collocations["lemma"]
+    starts = np.flatnonzero(np.r_[True, np.diff(lemma_ids) != 0])
+    ends = np.r_[starts[1:], len(lemma_ids)]
+
+    for start, end in zip(starts, ends):
+        lemma = lemmas[lemma_ids[start]]
+        path = os.path.join(out_dir, lemma.replace(os.sep, "_") + ".tsv")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+            writer.writerow(["word", "other_form", "surface_form", "direction",
+                             "freq", "pmi", "example_sentence"])
+            for i in range(start, end):
+                other = vocab_list[collocations["other"][i]]
+                head = vocab_list[collocations["head"][i]]
+                surface = f"{other} {head}" if collocations["side"][i] == 0 else f"{head} {other}"
+                writer.writerow([
+                    lemma,
+                    other,
+                    surface,
+                    DIRECTIONS[collocations["direction"][i]],
+                    int(collocations["freq"][i]),
+                    f"{collocations['pmi'][i]:.4f}",
+                    examples.get(collocations["key_index"][i], ""),
+                ])
+    return len(starts)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Count collocations of the dictionary words in a tokenized corpus "
+                    "(one sentence per line) and write them as TSVs for "
+                    "import_collocations_from_tsv.py.")
+    parser.add_argument("corpus", help="tokenized corpus file")
+    parser.add_argument("--out-dir", default=TSV_DIR,
+                        help="where to write <lemma>.tsv (default: collocations_tsv/)")
+    parser.add_argument("--window", type=int, default=WINDOW,
+                        help=f"tokens on each side counted as collocates (default: {WINDOW})")
+    parser.add_argument("--min-freq", type=int, default=MIN_FREQ,
+                        help=f"minimum co-occurrences (default: {MIN_FREQ})")
+    parser.add_argument("--min-pmi", type=float, default=MIN_PMI,
+                        help=f"minimum PMI (default: {MIN_PMI})")
+    parser.add_argument("--top", type=int, default=TOP_PER_WORD,
+                        help=f"collocations kept per word (default: {TOP_PER_WORD})")
+    parser.add_argument("--no-examples", action="store_true",
+                        help="skip the second pass that picks example sentences")
+    parser.add_argument("--pair-buffer", type=int, default=PAIR_BUFFER,
+                        help=f"pairs held in memory before spilling to disk (default: {PAIR_BUFFER})")
+    parser.add_argument("--partitions", type=int, default=PARTITIONS,
+                        help=f"spill partitions, merged one at a time (default: {PARTITIONS})")
+    parser.add_argument("--work-dir", default=None,
+                        help="directory for the spill files (default: system temp dir)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if not os.path.exists(args.corpus):
+        print(f"Corpus not found: {args.corpus}")
+        return
+    if not os.path.exists(DB_PATH):
+        print(f"DB not found: {DB_PATH}")
+        return
+
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    lemmas, forms = load_head_forms(conn.cursor())
+    conn.close()
+
+    # Token ids: the dictionary forms first (0 .. num_forms - 1), then every
+    # other token in order of appearance
+    vocab = defaultdict()
+    vocab.default_factory = vocab.__len__
+    for form in forms:
+        vocab[form]
+    num_forms = len(vocab)
+    lemma_of_form = np.fromiter(forms.values(), dtype=np.int64, count=num_forms)
+
+    work_dir = tempfile.mkdtemp(prefix="collocations_", dir=args.work_dir)
+    try:
+        # ---- Pass 1: unigram and window pair counts ----
+        started = time.perf_counter()
+        counter = PairCounter(work_dir, lemma_of_form % args.partitions,
+                              args.partitions, args.pair_buffer)
+        unigrams = np.zeros(num_forms, dtype=np.int64)
+        total_tokens = 0
+
+        for _, sentences in read_chunks(args.corpus):
+            ids, sentence_of = encode_chunk(sentences, vocab)
+            if len(vocab) > OTHER_MASK:
+                print(f"More than {OTHER_MASK} distinct tokens; raise OTHER_BITS.")
+                return
+
+            counts = np.bincount(ids, minlength=len(vocab))
+            counts[:len(unigrams)] += unigrams
+            unigrams = counts
+            total_tokens += len(ids)
+
+            for h, o, side in window_pairs(ids, sentence_of, num_forms, args.window):
+                counter.add((ids[h] << (OTHER_BITS + 1)) | (ids[o] << 1) | side)
+        counter.spill()
+
+        unigrams = np.pad(unigrams, (0, len(vocab) - len(unigrams)))
+        print(f"✓ Counted {total_tokens} tokens ({len(vocab)} distinct) "
+              f"in {time.perf_counter() - started:.1f}s, {counter.spills} spill(s)")
+
+        # ---- Merge the runs, one partition at a time ----
+        started = time.perf_counter()
+        vocab_list = list(vocab)
+        lemma_of = np.full(len(vocab), -1, dtype=np.int64)
+        lemma_of[:num_forms] = lemma_of_form
+        is_word = np.fromiter((TOKEN_RE.fullmatch(token) is not None for token in vocab_list),
+                              dtype=bool, count=len(vocab_list))
+        lemma_counts = np.bincount(lemma_of_form, weights=unigrams[:num_forms],
+                                   minlength=len(lemmas))
+        stats = (lemma_of, is_word, unigrams, lemma_counts, total_tokens)
+
+        parts = []
+        distinct_pairs = 0
+        for partition in range(args.partitions):
+            keys, counts = counter.merge_partition(partition)
+            distinct_pairs += len(keys)
+            selected = select_collocations(keys, counts, stats, args)
+            if selected is not None:
+                parts.append(selected)
+
+        if not parts:
+            print("No collocations found.")
+            return
+        collocations = {name: np.concatenate([part[name] for part in parts])
+                        for name in parts[0]}
+        print(f"✓ Merged {distinct_pairs} distinct pairs in {time.perf_counter() - started:.1f}s, "
+              f"{len(collocations['freq'])} collocations kept")
+
+        # ---- Pass 2: example sentences ----
+        pair_keys = (collocations["lemma"] << OTHER_BITS) | collocations["other"]
+        order = np.argsort(pair_keys)
+        collocations["key_index"] = np.empty(len(order), dtype=np.int64)
+        collocations["key_index"][order] = np.arange(len(order))
+
+        examples = {}
+        if not args.no_examples:
+            started = time.perf_counter()
+            examples = find_examples(args.corpus, vocab, lemma_of, num_forms,
+                                     pair_keys[order], args.window)
+            print(f"✓ Found examples for {len(examples)} collocations "
+                  f"in {time.perf_counter() - started:.1f}s")
+
+        files = write_tsvs(args.out_dir, lemmas, vocab_list, collocations, examples)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("Done.")
+    print(f"  Tokens in corpus:                      {total_tokens}")
+    print(f"  Collocations written:                  {len(collocations['freq'])}")
+    print(f"  Words with collocations (TSV files):   {files}")
+    print(f"  Output directory:                      {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,17 @@
 import os
 import sqlite3
 import csv
+import argparse
+import glob
+import hashlib
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from operator import itemgetter
 
 
 # ----------------------------
@@ -18,52 +29,231 @@ DB_PATH = os.path.join(ROOT_DIR, "finnish.db")
 TSV_DIR = os.path.join(ROOT_DIR, "collocations_tsv")
 
 
-def ensure_indexes(cur):
+def ensure_schema(cur):
     # Prevent duplicate examples per collocation
     cur.execute("""
         CREATE UNIQUE INDEX IF NOT EXISTS uq_examples_colloc_text
         ON corpus_examples(collocation_id, example_text)
     """)
 
+    # One row per imported file: how far the last run got. byte_offset is
+    # where the first row not yet committed starts; it is updated in the
+    # same transaction as the rows before it.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS import_runs (
+            file_path    TEXT PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            file_size    INTEGER NOT NULL,
+            byte_offset  INTEGER NOT NULL DEFAULT 0,
+            rows_done    INTEGER NOT NULL DEFAULT 0,
+            status       TEXT NOT NULL DEFAULT 'running'
+                         CHECK (status IN ('running', 'done', 'failed')),
+            error        TEXT,
+            updated_at   TEXT
+        )
+    """)
+
+
+# Rows per batch: the reader hands rows to the writer in batches of this
+# size, and each batch is written with executemany in one transaction
+BATCH_SIZE = 5000
+
+# Batches a reader may be ahead of the writer (per file)
+QUEUE_BATCHES = 4
 
-def get_word_id(cur, word_form):
-    cur.execute("SELECT id FROM words WHERE word = ?", (word_form,))
-    row = cur.fetchone()
-    return row["id"] if row else None
+# Collocations kept in memory between batches (see CollocationImporter)
+CACHED_COLLOCATIONS = 200_000
 
+# Columns read from a TSV, in the order normalize_row() takes them
+TSV_COLUMNS = ("word", "other_form", "surface_form", "direction", "freq", "pmi",
+               "example_sentence")
 
-def get_or_create_collocation(cur,
-                              word_id,
-                              other_word_id,
-                              other_form,
-                              surface_form,
-                              direction,
-                              freq,
-                              pmi):
+# word_collocations.direction CHECK constraint
+DIRECTIONS = ("L", "R", "B")
+
+# Largest INTEGER SQLite stores; a bigger freq fails the whole executemany
+MAX_FREQ = 2 ** 63 - 1
+
+
+def normalize_row(fields):
     """
-    Find or create a row in word_collocations for (word_id, other_form, direction).
-    Returns (collocation_id, created, updated_stats).
+    Raw values of TSV_COLUMNS (None for a missing column) as
+    (word_form, other_form, surface_form, direction, freq, pmi, example_sentence),
+    or None if the word or the other form is missing or the direction is
+    not one of DIRECTIONS. A row the writer cannot insert would fail its
+    whole batch, and the file would stop at that batch on every run.
     """
+    word, other, surface, direction, freq_str, pmi_str, example = fields
 
-    cur.execute("""
-        SELECT id, freq, pmi, surface_form, other_word_id
-        FROM word_collocations
-        WHERE word_id = ?
-          AND other_form = ?
-          AND direction = ?
-    """, (word_id, other_form, direction))
-    row = cur.fetchone()
-
-    if row:
-        colloc_id = row["id"]
-        old_freq = row["freq"]
-        old_pmi = row["pmi"]
-        old_surface = row["surface_form"] if row["surface_form"] is not None else ""
-        old_other_word_id = row["other_word_id"]
+    word_form = (word or "").strip()
+    other_form = (other or "").strip()
+    surface_form = (surface or "").strip()
+    direction = (direction or "B").strip().upper() or "B"
+    freq_str = (freq_str or "").strip()
+    pmi_str = (pmi_str or "").strip()
+    example_sentence = (example or "").strip()
+
+    if not word_form or not other_form or direction not in DIRECTIONS:
+        return None
+
+    # Parse numbers safely
+    try:
+        freq = int(freq_str) if freq_str else None
+    except ValueError:
+        freq = None
+    if freq is not None and abs(freq) > MAX_FREQ:
+        freq = None
+
+    try:
+        pmi = float(pmi_str) if pmi_str else None
+    except ValueError:
+        pmi = None
+
+    return word_form, other_form, surface_form, direction, freq, pmi, example_sentence
+
+
+class CollocationImporter:
+    """
+    Applies normalized rows (see normalize_row) to word_collocations and
+    corpus_examples.
+
+    word -> id is loaded once by load_maps(). The collocations of a head word
+    are loaded the first time a row for it comes in; once more than
+    cache_limit of them are held, a flush drops the head words the batch did
+    not use, so memory stays bounded however large the input is. Rows only
+    update those dicts and queue inserts / updates; flush() writes the queue
+    with executemany in a single transaction.
+    """
+
+    def __init__(self, conn, cache_limit=CACHED_COLLOCATIONS):
+        self.conn = conn
+        self.cur = conn.cursor()
+        self.cache_limit = cache_limit
+
+        self.word_ids = {}
+        # word_id -> {(other_form, direction): [id, freq, pmi, surface_form,
+        #                                       other_word_id, has_example]}
+        # (id is None until a new collocation has been flushed)
+        self.collocations = {}
+        self.cached = 0             # collocations held in self.collocations
+        self.used_heads = set()     # word_ids with rows since the last flush
+
+        self.new_collocations = []  # (word_id, other_form, direction, state), in row order
+        self.updated = {}           # id -> state of existing collocations to write back
+        self.new_examples = []      # (word_id, example_text, state, is_primary)
+
+        self.new_collocs = 0
+        self.updated_collocs = 0
+        self.inserted_examples = 0
+        self.skipped_no_word = 0
+        self.skipped_total = 0
+        self.committed_counts = self.counts()
+
+    COUNTERS = ("new_collocs", "updated_collocs", "inserted_examples",
+                "skipped_no_word", "skipped_total")
+
+    def counts(self):
+        return {name: getattr(self, name) for name in self.COUNTERS}
+
+    def load_maps(self):
+        self.word_ids = {}
+        self.collocations = {}
+        self.cached = 0
+
+        # Lowest id first, like the old per-row `SELECT id FROM words WHERE word = ?`
+        self.cur.execute("SELECT id, word FROM words ORDER BY id")
+        for row in self.cur:
+            self.word_ids.setdefault(row["word"], row["id"])
+
+    def head_collocations(self, word_id):
+        """The collocations of word_id, loaded from the database on first use."""
+        self.used_heads.add(word_id)
+        collocations = self.collocations.get(word_id)
+        if collocations is not None:
+            return collocations
+
+        collocations = {}
+        self.cur.execute("""
+            SELECT wc.id, wc.other_form, wc.direction, wc.freq, wc.pmi,
+                   wc.surface_form, wc.other_word_id,
+                   EXISTS (SELECT 1 FROM corpus_examples ce
+                           WHERE ce.collocation_id = wc.id) AS has_example
+            FROM word_collocations wc
+            WHERE wc.word_id = ?
+            ORDER BY wc.id
+        """, (word_id,))
+        for row in self.cur:
+            collocations.setdefault((row["other_form"], row["direction"]), [
+                row["id"], row["freq"], row["pmi"], row["surface_form"],
+                row["other_word_id"], bool(row["has_example"]),
+            ])
+
+        self.collocations[word_id] = collocations
+        self.cached += len(collocations)
+        return collocations
+
+    def add(self, normalized):
+        """Apply one row from normalize_row() (None counts as skipped)."""
+        if normalized is None:
+            self.skipped_total += 1
+            return
+
+        word_form, other_form, surface_form, direction, freq, pmi, example_sentence = normalized
+
+        # Look up main word_id
+        word_id = self.word_ids.get(word_form)
+        if word_id is None:
+            self.skipped_no_word += 1
+            self.skipped_total += 1
+            return
+
+        # Look up other_word_id (may be None if not in dictionary)
+        other_word_id = self.word_ids.get(other_form)
+
+        colloc = self.add_collocation(
+            word_id=word_id,
+            other_word_id=other_word_id,
+            other_form=other_form,
+            surface_form=surface_form,
+            direction=direction,
+            freq=freq,
+            pmi=pmi,
+        )
+
+        # IMPORTANT: this runs for every TSV row -> supports multiple examples
+        if example_sentence:
+            self.add_example(word_id, colloc, example_sentence)
+
+    def add_collocation(self,
+                        word_id,
+                        other_word_id,
+                        other_form,
+                        surface_form,
+                        direction,
+                        freq,
+                        pmi):
+        """
+        Find or create the collocation for (word_id, other_form, direction).
+        Returns its state list.
+        """
+        collocations = self.head_collocations(word_id)
+        colloc = collocations.get((other_form, direction))
+
+        if colloc is None:
+            colloc = [None, freq, pmi, surface_form, other_word_id, False]
+            collocations[(other_form, direction)] = colloc
+            self.cached += 1
+            self.new_collocations.append((word_id, other_form, direction, colloc))
+            self.new_collocs += 1
+            return colloc
+
+        colloc_id, old_freq, old_pmi, old_surface, old_other_word_id, _ = colloc
+        old_surface = old_surface if old_surface is not None else ""
 
         new_freq = old_freq
         new_pmi = old_pmi
         new_surface = old_surface
+        new_other_word_id = old_other_word_id
         changed = False
 
         # Option A: overwrite with latest when provided (predictable)
@@ -82,65 +272,538 @@ def get_or_create_collocation(cur,
 
         # other_word_id: fill it in later if previously NULL
         if other_word_id is not None and old_other_word_id is None:
-            cur.execute("""
-                UPDATE word_collocations
-                SET other_word_id = ?
-                WHERE id = ?
-            """, (other_word_id, colloc_id))
+            new_other_word_id = other_word_id
             changed = True
 
         if changed:
-            cur.execute("""
+            colloc[1:5] = [new_freq, new_pmi, new_surface, new_other_word_id]
+            # not yet flushed: the INSERT picks up the new values
+            if colloc_id is not None:
+                self.updated[colloc_id] = colloc
+            self.updated_collocs += 1
+
+        return colloc
+
+    def add_example(self, word_id, colloc, example_text):
+        """
+        Queue example_text for corpus_examples, linked to `colloc`.
+        Sets is_primary=1 only for the first example for that collocation.
+        """
+        example_text = (example_text or "").strip()
+        if not example_text:
+            return
+
+        is_primary = 0 if colloc[5] else 1
+        colloc[5] = True
+        self.new_examples.append((word_id, example_text, colloc, is_primary))
+
+    def pending(self):
+        return len(self.new_collocations) + len(self.updated) + len(self.new_examples)
+
+    def flush(self, checkpoint=None):
+        """
+        Write everything queued since the last flush in one transaction,
+        together with `checkpoint` ((file_path, byte_offset, rows_done) for
+        import_runs), if given.
+        """
+        if self.pending() or checkpoint:
+            self.write_pending(checkpoint)
+
+        if self.cached > self.cache_limit:
+            # Forget the head words this batch did not use
+            for word_id in list(self.collocations):
+                if word_id not in self.used_heads:
+                    self.cached -= len(self.collocations.pop(word_id))
+        self.used_heads = set()
+
+    def write_pending(self, checkpoint=None):
+        cur = self.cur
+
+        # The write lock is held from here on, so the ids handed out below
+        # cannot be taken by anyone else before the INSERT
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            cur.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM word_collocations")
+            next_id = cur.fetchone()[0]
+            for _, _, _, colloc in self.new_collocations:
+                colloc[0] = next_id
+                next_id += 1
+
+            cur.executemany("""
+                INSERT INTO word_collocations
+                    (id, word_id, other_word_id, other_form, direction, freq, pmi,
+                     surface_form, source, show_examples)
+                VALUES
+                    (?, ?, ?, ?, ?, ?, ?, ?, 'subtitles', 0)
+            """, [
+                (c[0], word_id, c[4], other_form, direction, c[1], c[2], c[3])
+                for word_id, other_form, direction, c in self.new_collocations
+            ])
+
+            cur.executemany("""
                 UPDATE word_collocations
-                SET freq = ?, pmi = ?, surface_form = ?
+                SET freq = ?, pmi = ?, surface_form = ?, other_word_id = ?
                 WHERE id = ?
-            """, (new_freq, new_pmi, new_surface, colloc_id))
+            """, [
+                (c[1], c[2], c[3], c[4], colloc_id)
+                for colloc_id, c in self.updated.items()
+            ])
+
+            # INSERT OR IGNORE + unique index for dedupe
+            cur.executemany("""
+                INSERT OR IGNORE INTO corpus_examples
+                    (word_id, meaning_id, example_text, example_translation_text,
+                     source, collocation_id, is_primary)
+                VALUES
+                    (?, NULL, ?, NULL, 'subtitles', ?, ?)
+            """, [
+                (word_id, example_text, colloc[0], is_primary)
+                for word_id, example_text, colloc, is_primary in self.new_examples
+            ])
+            inserted = cur.rowcount
+
+            if checkpoint:
+                file_path, byte_offset, rows_done = checkpoint
+                cur.execute("""
+                    UPDATE import_runs
+                    SET byte_offset = ?, rows_done = ?, updated_at = datetime('now')
+                    WHERE file_path = ?
+                """, (byte_offset, rows_done, file_path))
+
+            cur.execute("COMMIT")
+        except BaseException:
+            cur.execute("ROLLBACK")
+            raise
+
+        self.inserted_examples += inserted
+        self.committed_counts = self.counts()
+        self.new_collocations = []
+        self.updated = {}
+        self.new_examples = []
+
+    def discard(self):
+        """Drop everything queued since the last flush (after a failed one)."""
+        self.new_collocations = []
+        self.updated = {}
+        self.new_examples = []
+        for name, value in self.committed_counts.items():
+            setattr(self, name, value)
+        # The cached collocations already reflect the dropped rows (and ids
+        # that were never committed): reload them from the database
+        self.collocations = {}
+        self.cached = 0
+        self.used_heads = set()
+
+    def print_summary(self):
+        print(f"  New collocations inserted:             {self.new_collocs}")
+        print(f"  Existing collocations updated:         {self.updated_collocs}")
+        print(f"  Examples inserted into corpus_examples:{self.inserted_examples}")
+        print(f"  Skipped (main word missing in DB):     {self.skipped_no_word}")
+        print(f"  Skipped total (any reason):            {self.skipped_total}")
+
+
+# ----------------------------
+# READING
+# ----------------------------
+def read_tsv(tsv_path, start_offset=0):
+    """
+    Yield (normalize_row(), byte offset just past the row) for every row of
+    tsv_path, starting at start_offset (0, or an offset yielded before).
+    """
+    with open(tsv_path, "rb") as f:
+        position = 0
+
+        def lines():
+            nonlocal position
+            for line in f:
+                position += len(line)
+                yield line.decode("utf-8")
+
+        reader = csv.reader(lines(), delimiter="\t")
+        header = next(reader, None)
+        if header is None:
+            return
+
+        # Like csv.DictReader: the last column of a name wins, missing
+        # columns and missing trailing fields read as None
+        positions = {name: i for i, name in enumerate(header)}
+        missing = len(header)
+        columns = [positions.get(name, missing) for name in TSV_COLUMNS]
+        width = max(columns) + 1
+        pick = itemgetter(*columns)
+
+        if start_offset > position:
+            f.seek(start_offset)
+            position = start_offset
+
+        for fields in reader:
+            if not fields:
+                continue  # blank line
+            if len(fields) < width:
+                fields += [None] * (width - len(fields))
+            yield normalize_row(pick(fields)), position
+
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def put_message(batches, message, cancel=None):
+    """
+    Put message on `batches`, waiting while the queue is full. Returns False
+    without putting it once `cancel` (an Event) is set: the writer has
+    stopped and nobody will drain the queue any more.
+    """
+    while not (cancel is not None and cancel.is_set()):
+        try:
+            batches.put(message, timeout=1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def produce_batches(tsv_path, batches, batch_size=BATCH_SIZE, previous=None, cancel=None):
+    """
+    Reader stage, for tsv_path whose import_runs row is `previous` (a dict,
+    or None to import from the start). Puts on the queue `batches`:
+
+      ("skip", None) if the file is unchanged since a completed import, or
+      ("start", (content_hash, file_size, byte_offset, rows_done)), then
+      ("rows", (rows, byte offset after them)) per batch_size rows, then
+      ("done", seconds spent reading) or ("error", message).
+
+    An unchanged file that was not completed continues at its checkpoint;
+    a changed one starts over. Waits while the queue is full, and stops
+    without a word once `cancel` (an Event) is set.
+    """
+    seconds = 0.0
+    try:
+        started = time.perf_counter()
+        content_hash = file_hash(tsv_path)
+        seconds += time.perf_counter() - started
+
+        start_offset = rows_done = 0
+        if previous and previous["content_hash"] == content_hash:
+            if previous["status"] == "done":
+                put_message(batches, ("skip", None), cancel)
+                return
+            start_offset, rows_done = previous["byte_offset"], previous["rows_done"]
+
+        if not put_message(batches, ("start", (content_hash, os.path.getsize(tsv_path),
+                                               start_offset, rows_done)), cancel):
+            return
+
+        rows = read_tsv(tsv_path, start_offset)
+        while True:
+            started = time.perf_counter()
+            batch = list(islice(rows, batch_size))
+            seconds += time.perf_counter() - started
+            if not batch:
+                break
+            if not put_message(batches, ("rows", ([row for row, _ in batch], batch[-1][1])), cancel):
+                return
+    except Exception as e:
+        # Anything else would leave the writer waiting for "done" forever
+        put_message(batches, ("error", f"could not read file ({e})"), cancel)
+        return
+    put_message(batches, ("done", seconds), cancel)
+
+
+def next_message(batches, reader=None):
+    """Next message on `batches`; gives up if the reader (a Future) died without one."""
+    while True:
+        try:
+            return batches.get(timeout=1)
+        except queue.Empty:
+            if reader is not None and reader.done():
+                return "error", f"reader failed ({reader.exception()})"
+
+
+# ----------------------------
+# CHECKPOINTS
+# ----------------------------
+def import_run_key(tsv_path):
+    return os.path.realpath(tsv_path)
+
 
-        return colloc_id, False, changed
+def load_import_runs(cur):
+    """import_runs as {file_path: row dict}."""
+    cur.execute("SELECT * FROM import_runs")
+    return {row["file_path"]: dict(row) for row in cur.fetchall()}
 
-    # Insert new
+
+def start_import_run(cur, file_path, content_hash, file_size, byte_offset, rows_done):
     cur.execute("""
-        INSERT INTO word_collocations
-            (word_id, other_word_id, other_form, direction, freq, pmi,
-             surface_form, source, show_examples)
+        INSERT INTO import_runs
+            (file_path, content_hash, file_size, byte_offset, rows_done, status, updated_at)
         VALUES
-            (?, ?, ?, ?, ?, ?, ?, 'subtitles', 0)
-    """, (word_id, other_word_id, other_form, direction, freq, pmi, surface_form))
+            (?, ?, ?, ?, ?, 'running', datetime('now'))
+        ON CONFLICT(file_path) DO UPDATE SET
+            content_hash = excluded.content_hash,
+            file_size    = excluded.file_size,
+            byte_offset  = excluded.byte_offset,
+            rows_done    = excluded.rows_done,
+            status       = 'running',
+            error        = NULL,
+            updated_at   = excluded.updated_at
+    """, (file_path, content_hash, file_size, byte_offset, rows_done))
+
+
+def finish_import_run(cur, file_path, error=None):
+    cur.execute("""
+        UPDATE import_runs
+        SET status = ?, error = ?, updated_at = datetime('now')
+        WHERE file_path = ?
+    """, ("failed" if error else "done", error, file_path))
+
+
+def write_batches(importer, batches, tsv_path, reader=None):
+    """
+    Writer stage: apply the batches produce_batches() puts on `batches`,
+    committing each one together with its checkpoint in import_runs.
+
+    Returns a dict with "status" ("done", "skipped" or "failed"), "rows"
+    (rows applied in this run), "resumed_at" (rows done by earlier runs),
+    "read_seconds" and "error". After an error the rest of the file is
+    drained and ignored; batches committed before it stay, and the next run
+    continues after them.
+    """
+    file_path = import_run_key(tsv_path)
+    result = {"status": "done", "rows": 0, "resumed_at": 0, "read_seconds": 0.0, "error": None}
+    rows_done = 0
+
+    while True:
+        kind, value = next_message(batches, reader)
+
+        if kind == "skip":
+            result["status"] = "skipped"
+            return result
+
+        if kind == "start":
+            content_hash, file_size, byte_offset, rows_done = value
+            result["resumed_at"] = rows_done
+            start_import_run(importer.cur, file_path, content_hash, file_size,
+                             byte_offset, rows_done)
+            continue
+
+        if kind in ("done", "error"):
+            if kind == "done":
+                result["read_seconds"] = value
+            else:
+                result["error"] = result["error"] or value
+            if result["error"]:
+                result["status"] = "failed"
+            finish_import_run(importer.cur, file_path, result["error"])
+            return result
+
+        if result["error"]:
+            continue
+
+        rows, byte_offset = value
+        try:
+            for row in rows:
+                importer.add(row)
+            importer.flush(checkpoint=(file_path, byte_offset, rows_done + len(rows)))
+        except sqlite3.Error as e:
+            importer.discard()
+            result["error"] = f"database error, batch dropped ({e})"
+            continue
+        rows_done += len(rows)
+        result["rows"] += len(rows)
+
+
+def import_tsv(importer, tsv_path, batch_size=BATCH_SIZE, queue_size=QUEUE_BATCHES,
+               previous=None):
+    """
+    Import tsv_path (continuing from `previous`, its import_runs row), reading
+    it in a thread at most queue_size batches ahead of the writer. Returns
+    write_batches()'s result.
+    """
+    batches = queue.Queue(maxsize=queue_size)
+    cancel = threading.Event()
+    reader = threading.Thread(target=produce_batches,
+                              args=(tsv_path, batches, batch_size, previous, cancel),
+                              daemon=True)
+    reader.start()
+    try:
+        return write_batches(importer, batches, tsv_path)
+    finally:
+        # If the writer raised, the reader may be waiting on a full queue
+        cancel.set()
+        reader.join()
+
+
+def describe_result(name, result, seconds):
+    """One-line report for a file imported by write_batches()."""
+    if result["status"] == "skipped":
+        return f"= {name}: unchanged since its last import, skipped"
+
+    resumed = f", resumed after row {result['resumed_at']}" if result["resumed_at"] else ""
+    if result["status"] == "failed":
+        return (f"✗ {name}: {result['error']}; {result['rows']} rows committed "
+                f"before it{resumed} (the next run continues from there)")
+
+    rows = result["rows"]
+    rate = rows / seconds if seconds else 0
+    return (f"✓ {name}: {rows} rows in {seconds:.2f}s ({rate:.0f} rows/s), "
+            f"{result['read_seconds']:.2f}s of it reading{resumed}")
+
+
+def open_db():
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+
+    ensure_schema(conn.cursor())
+    conn.commit()
 
-    return cur.lastrowid, True, False
+    # Transactions are opened explicitly by CollocationImporter.flush()
+    conn.isolation_level = None
+    return conn
 
 
-def insert_corpus_example(cur, word_id, collocation_id, example_text):
+# ----------------------------
+# BULK MODE
+# ----------------------------
+def find_tsv_files(patterns, all_files=False):
     """
-    Insert example_text into corpus_examples linked to collocation_id.
-    Uses INSERT OR IGNORE + unique index for speed/dedupe.
-    Sets is_primary=1 only for the first example for that collocation.
+    TSV paths for the command line: every *.tsv in TSV_DIR with --all, plus
+    each pattern (a file or a glob; bare names are looked up in TSV_DIR).
     """
-    example_text = (example_text or "").strip()
-    if not example_text:
-        return False
+    if all_files:
+        patterns = [os.path.join(TSV_DIR, "*.tsv")] + list(patterns)
 
-    # Determine primary flag
-    cur.execute("""
-        SELECT COUNT(*)
-        FROM corpus_examples
-        WHERE collocation_id = ?
-    """, (collocation_id,))
-    has_any = cur.fetchone()[0] > 0
-    is_primary = 0 if has_any else 1
+    paths = set()
+    for pattern in patterns:
+        if not os.path.isabs(pattern) and not os.path.dirname(pattern):
+            pattern = os.path.join(TSV_DIR, pattern)
+        paths.update(path for path in glob.glob(pattern) if os.path.isfile(path))
+    return sorted(paths)
 
-    cur.execute("""
-        INSERT OR IGNORE INTO corpus_examples
-            (word_id, meaning_id, example_text, example_translation_text,
-             source, collocation_id, is_primary)
-        VALUES
-            (?, NULL, ?, NULL, 'subtitles', ?, ?)
-    """, (word_id, example_text, collocation_id, is_primary))
 
-    return cur.rowcount == 1
+def bulk_import(conn, tsv_paths, workers=None, batch_size=BATCH_SIZE,
+                queue_size=QUEUE_BATCHES, restart=False):
+    """
+    Import every file in tsv_paths, in the order given. Files are read in a
+    process pool, at most 2 * workers files at a time, each streaming its
+    batches through its own queue of queue_size batches; one importer on
+    conn writes them. So at most 2 * workers * queue_size * batch_size rows
+    are in memory, whatever the size of the files.
+
+    Every batch is committed on its own, with its checkpoint: files already
+    imported completely are skipped, interrupted ones continue where they
+    stopped (restart=True ignores import_runs). A file that fails only
+    loses its own uncommitted batch. Returns the names of the files that
+    failed.
+    """
+    importer = CollocationImporter(conn)
+    importer.load_maps()
+    import_runs = {} if restart else load_import_runs(importer.cur)
+
+    workers = workers or os.cpu_count() or 1
+    failed = []
+    skipped = 0
+    total_rows = 0
+    started = time.perf_counter()
+
+    with multiprocessing.Manager() as manager, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        remaining = iter(tsv_paths)
+        cancel = manager.Event()
+
+        def submit_next():
+            tsv_path = next(remaining, None)
+            if tsv_path is not None:
+                batches = manager.Queue(maxsize=queue_size)
+                previous = import_runs.get(import_run_key(tsv_path))
+                reader = pool.submit(produce_batches, tsv_path, batches, batch_size,
+                                     previous, cancel)
+                in_flight.append((tsv_path, batches, reader))
+
+        for _ in range(2 * workers):
+            submit_next()
+
+        try:
+            while in_flight:
+                tsv_path, batches, reader = in_flight.popleft()
+                name = os.path.basename(tsv_path)
+
+                file_started = time.perf_counter()
+                result = write_batches(importer, batches, tsv_path, reader)
+                file_seconds = time.perf_counter() - file_started
+                submit_next()
+
+                total_rows += result["rows"]
+                if result["status"] == "failed":
+                    failed.append(name)
+                elif result["status"] == "skipped":
+                    skipped += 1
+                print(describe_result(name, result, file_seconds))
+        except BaseException:
+            # The writer died (a bug, MemoryError, Ctrl+C, ...): nobody drains
+            # the queues any more, so stop the readers blocked on them and drop
+            # the files not started yet, or leaving the pool waits forever
+            cancel.set()
+            pool.shutdown(cancel_futures=True)
+            raise
+
+    elapsed = time.perf_counter() - started
+    rate = total_rows / elapsed if elapsed else 0
+    print("Done.")
+    print(f"  Files imported:                        {len(tsv_paths) - len(failed) - skipped}")
+    print(f"  Files unchanged (skipped):             {skipped}")
+    print(f"  Files failed:                          {len(failed)}")
+    print(f"  Rows read:                             {total_rows} "
+          f"in {elapsed:.2f}s ({rate:.0f} rows/s)")
+    importer.print_summary()
+    return failed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Import collocation TSVs into word_collocations / corpus_examples. "
+                    "Without file arguments, asks for a single lemma.")
+    parser.add_argument("patterns", nargs="*",
+                        help="TSV files or globs to import (bare names are looked up in TSV_DIR)")
+    parser.add_argument("--all", action="store_true",
+                        help="import every *.tsv in TSV_DIR")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="reader processes (default: number of CPUs)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"rows per batch / commit (default: {BATCH_SIZE})")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_BATCHES,
+                        help=f"batches read ahead per file (default: {QUEUE_BATCHES})")
+    parser.add_argument("--restart", action="store_true",
+                        help="import from the start, even files already imported (ignore import_runs)")
+    return parser.parse_args()
+
+
+def bulk_main(args):
+    if not os.path.exists(DB_PATH):
+        print(f"DB not found: {DB_PATH}")
+        return
 
+    tsv_paths = find_tsv_files(args.patterns, all_files=args.all)
+    if not tsv_paths:
+        print("No TSV files matched.")
+        return
 
-def main():
+    print(f"Importing collocations from {len(tsv_paths)} file(s)")
+
+    conn = open_db()
+    try:
+        bulk_import(conn, tsv_paths, workers=args.workers, batch_size=args.batch_size,
+                    queue_size=args.queue_size, restart=args.restart)
+    finally:
+        conn.close()
+
+
+def interactive_main(args):
     lemma = input("Enter lemma to import collocations for (e.g. 'hyvä'): ").strip()
     if not lemma:
         print("No lemma entered, aborting.")
@@ -149,94 +812,38 @@ def main():
     tsv_path = os.path.join(TSV_DIR, f"{lemma}.tsv")
     if not os.path.exists(tsv_path):
         print(f"TSV file not found: {tsv_path}")
-        print("Make sure the file exists (export it first with your collocation script).")
+        print("Make sure the file exists (export it first with extract_collocations.py).")
         return
 
     if not os.path.exists(DB_PATH):
         print(f"DB not found: {DB_PATH}")
         return
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-
-    ensure_indexes(cur)
+    conn = open_db()
 
     print(f"Importing collocations from: {tsv_path}")
 
-    new_collocs = 0
-    updated_collocs = 0
-    inserted_examples = 0
-    skipped_no_word = 0
-    skipped_total = 0
-
-    with open(tsv_path, "r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f, delimiter="\t")
-
-        for row in reader:
-            word_form = (row.get("word") or "").strip()
-            other_form = (row.get("other_form") or "").strip()
-            surface_form = (row.get("surface_form") or "").strip()
-            direction = (row.get("direction") or "B").strip().upper() or "B"
-            freq_str = (row.get("freq") or "").strip()
-            pmi_str = (row.get("pmi") or "").strip()
-            example_sentence = (row.get("example_sentence") or "").strip()
-
-            if not word_form or not other_form:
-                skipped_total += 1
-                continue
-
-            # Parse numbers safely
-            try:
-                freq = int(freq_str) if freq_str else None
-            except ValueError:
-                freq = None
-
-            try:
-                pmi = float(pmi_str) if pmi_str else None
-            except ValueError:
-                pmi = None
-
-            # Look up main word_id
-            word_id = get_word_id(cur, word_form)
-            if word_id is None:
-                skipped_no_word += 1
-                skipped_total += 1
-                continue
-
-            # Look up other_word_id (may be None if not in dictionary)
-            other_word_id = get_word_id(cur, other_form)
-
-            colloc_id, created, updated = get_or_create_collocation(
-                cur,
-                word_id=word_id,
-                other_word_id=other_word_id,
-                other_form=other_form,
-                surface_form=surface_form,
-                direction=direction,
-                freq=freq,
-                pmi=pmi,
-            )
-
-            if created:
-                new_collocs += 1
-            elif updated:
-                updated_collocs += 1
-
-            # IMPORTANT: this runs for every TSV row -> supports multiple examples
-            if example_sentence:
-                if insert_corpus_example(cur, word_id, colloc_id, example_sentence):
-                    inserted_examples += 1
+    importer = CollocationImporter(conn)
+    importer.load_maps()
+    previous = None if args.restart else load_import_runs(importer.cur).get(import_run_key(tsv_path))
+
+    started = time.perf_counter()
+    result = import_tsv(importer, tsv_path, batch_size=args.batch_size,
+                        queue_size=args.queue_size, previous=previous)
+    print(describe_result(os.path.basename(tsv_path), result, time.perf_counter() - started))
 
-    conn.commit()
     conn.close()
 
     print("Done.")
-    print(f"  New collocations inserted:             {new_collocs}")
-    print(f"  Existing collocations updated:         {updated_collocs}")
-    print(f"  Examples inserted into corpus_examples:{inserted_examples}")
-    print(f"  Skipped (main word missing in DB):     {skipped_no_word}")
-    print(f"  Skipped total (any reason):            {skipped_total}")
+    importer.print_summary()
+
+
+def main():
+    args = parse_args()
+    if args.all or args.patterns:
+        bulk_main(args)
+    else:
+        interactive_main(args)
 
 
 if __name__ == "__main__":